@@ -33,8 +33,24 @@ class Config(BaseConfig):
     CHROME_DRIVER_PATH = ''
     # нужно ли скачивать драйвер при каждом запуске тестов
     RELOAD_DRIVER = True
+    # сколько версий драйвера хранить в кэше (при 0 кэш не используется и драйвер скачивается каждый раз)
+    CHROME_DRIVER_CACHE_SIZE = 3
+    # папка кэша драйверов, если пустая строка, то используется chromedriver_cache в папке драйвера
+    CHROME_DRIVER_CACHE_PATH = ''
     # убивать драйвер после тестов (если выставить False, то браузер не будет закрыт)
     KILL_DRIVER = True
+    # максимальное число одновременно открытых сессий браузера (по одной на поток тестов)
+    DRIVER_POOL_SIZE = 1
+    # при fresh_session очищать cookie, storage, IndexedDB, service workers и лишние вкладки текущей сессии
+    # вместо перезапуска браузера (браузер перезапускается только если сессия не отвечает)
+    DRIVER_SOFT_RESET = False
+    # сколько запасных сессий браузера держать открытыми, чтобы fresh_session не ждал запуска хрома
+    DRIVER_WARM_SPARES = 0
+    # сколько секунд ждать освобождения сессии, если все заняты (0 - ждать бесконечно)
+    DRIVER_POOL_LEASE_TIMEOUT = 0
+    # ждать видимости элементов, скрытия лоадеров и загрузки опций select через MutationObserver в браузере
+    # (один запрос к драйверу) вместо периодического опроса
+    EVENT_DRIVEN_WAITS = False
     # меняент дефолт selenium по ожиданию загрузки страницы
     DRIVER_PAGE_LOAD_TIMEOUT = 20
 
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import time
+from logging import getLogger
+from pathlib import Path
+from shutil import rmtree
+from typing import Dict, Optional
+
+logger = getLogger()
+
+
+class DriverCache:
+    """
+    Кэш скачанных chromedriver на диске: для каждой версии хранится бинарник и его sha256.
+    Информация о версиях лежит в index.json, при превышении max_versions удаляются
+    версии, которые дольше всего не использовались
+    """
+    index_file_name: str = 'index.json'
+    driver_name: str = 'chromedriver'
+
+    def __init__(self, path: Path, max_versions: int):
+        """
+        :param path: директория кэша
+        :param max_versions: максимальное число хранимых версий
+        """
+        self.path = path
+        self.max_versions = max_versions
+        if not self.path.exists():
+            self.path.mkdir(parents=True)
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.joinpath(self.index_file_name)
+
+    def _read_index(self) -> Dict[str, Dict]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            return json.loads(self.index_path.read_text())
+        except ValueError:
+            logger.warning('Chrome driver cache index %s is broken. Cache will be rebuilt', self.index_path)
+            return {}
+
+    def _write_index(self, index: Dict[str, Dict]) -> None:
+        self._write_atomic(self.index_path, json.dumps(index, indent=2, sort_keys=True).encode('utf-8'))
+
+    @classmethod
+    def _write_atomic(cls, path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(str(tmp_path), str(path))
+
+    @classmethod
+    def checksum(cls, data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _version_path(self, version: str) -> Path:
+        return self.path.joinpath(version)
+
+    def get(self, version: str) -> Optional[Path]:
+        """
+        Возвращает путь до бинарника нужной версии, если он есть в кэше и не поврежден
+        :param version:
+        :return:
+        """
+        index = self._read_index()
+        item = index.get(version)
+        if not item:
+            return None
+        driver_path = Path(item['path'])
+        if not driver_path.exists() or self.checksum(driver_path.read_bytes()) != item['sha256']:
+            logger.warning('Cached chrome driver %s is missing or corrupted', version)
+            index.pop(version)
+            self._write_index(index)
+            return None
+
+        item['used_at'] = time.time()
+        self._write_index(index)
+        return driver_path
+
+    def put(self, version: str, data: bytes) -> Path:
+        """
+        Сохраняет бинарник версии в кэш и удаляет лишние старые версии
+        :param version:
+        :param data: содержимое бинарника
+        :return: путь до сохраненного бинарника
+        """
+        version_path = self._version_path(version)
+        if not version_path.exists():
+            version_path.mkdir(parents=True)
+        driver_path = version_path.joinpath(self.driver_name)
+        self._write_atomic(driver_path, data)
+        # set -rwxrwxr-x to file
+        driver_path.chmod(0o775)
+
+        index = self._read_index()
+        index[version] = {
+            'path': str(driver_path),
+            'sha256': self.checksum(data),
+            'used_at': time.time(),
+        }
+        self._evict(index)
+        self._write_index(index)
+        return driver_path
+
+    def _evict(self, index: Dict[str, Dict]) -> None:
+        if len(index) <= self.max_versions:
+            return
+        by_usage = sorted(index, key=lambda v: index[v]['used_at'], reverse=True)
+        for version in by_usage[self.max_versions:]:
+            logger.info('Remove chrome driver %s from cache', version)
+            index.pop(version)
+            rmtree(str(self._version_path(version)), ignore_errors=True)
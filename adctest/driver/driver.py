@@ -1,16 +1,23 @@
 import logging
+import threading
 from pathlib import Path
-from typing import Optional
+from types import SimpleNamespace
+from typing import Callable, Optional
 
 from adctest.config import config
 from adctest.driver.loader import ChromeDriverLoader
+from adctest.driver.pool import SessionPool
+from adctest.instrumentation import instrument_driver
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.remote_connection import LOGGER
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
+logger = logging.getLogger('e2e-test')
+
 
 def set_log_level_from_config():
     log_level = config.WEB_DRIVER_LOG_LEVEL
@@ -20,20 +27,42 @@ def set_log_level_from_config():
 
 class E2EDriver:
     downloads_dir: Optional[Path] = None
+    _pool: Optional[SessionPool] = None
+    """пул сессий браузера, создается при первом запросе драйвера"""
+    _lock = threading.RLock()
+    _local = threading.local()
+    """сессия, арендованная текущим потоком (при DRIVER_POOL_SIZE > 1)"""
+    _shared = SimpleNamespace(driver=None)
+    """сессия, общая для всех потоков (при DRIVER_POOL_SIZE = 1)"""
+    driver_factory: Optional[Callable[[], WebDriver]] = None
+    """если задана, то сессии создаются ей вместо запуска Chrome (например, FakeWebDriver для тестов без браузера)"""
 
     @classmethod
     def _get_selenium_service(cls) -> Service:
-        if not hasattr(cls, '__selenium_service'):
-            path = ChromeDriverLoader.driver_path
-            if not path:
-                raise AttributeError('Get empty driver path.')
-            service = Service(path)
-            service.start()
-            setattr(cls, '__selenium_service', service)
-        return getattr(cls, '__selenium_service')
+        with cls._lock:
+            if not hasattr(cls, '__selenium_service'):
+                path = ChromeDriverLoader.driver_path
+                if not path:
+                    raise AttributeError('Get empty driver path.')
+                service = Service(path)
+                service.start()
+                setattr(cls, '__selenium_service', service)
+            return getattr(cls, '__selenium_service')
+
+    @classmethod
+    def _get_pool(cls) -> SessionPool:
+        with cls._lock:
+            if cls._pool is None:
+                cls._pool = SessionPool(cls._create, size=config.DRIVER_POOL_SIZE,
+                                        spares=config.DRIVER_WARM_SPARES)
+            return cls._pool
 
     @classmethod
     def _create(cls) -> WebDriver:
+        if cls.driver_factory is not None:
+            driver = cls.driver_factory()
+            instrument_driver(driver)
+            return driver
         set_log_level_from_config()
         kwargs = {}
         serv = cls._get_selenium_service()
@@ -44,6 +73,7 @@ class E2EDriver:
         driver: WebDriver = webdriver.Remote(serv.service_url, desired_capabilities=caps, **kwargs)
         if config.DRIVER_PAGE_LOAD_TIMEOUT:
             driver.set_page_load_timeout(config.DRIVER_PAGE_LOAD_TIMEOUT)
+        instrument_driver(driver)
         return driver
 
     @classmethod
@@ -95,25 +125,96 @@ class E2EDriver:
             caps['goog:loggingPrefs'] = {'browser': 'ALL'}
         return caps
 
+    @classmethod
+    def _is_shared(cls) -> bool:
+        """
+        При пуле из одной сессии все потоки используют одну сессию, как и без пула.
+        Иначе второй поток ждал бы освобождения единственной сессии, которую никто не вернет
+        :return:
+        """
+        return config.DRIVER_POOL_SIZE <= 1
+
+    @classmethod
+    def _get_holder(cls):
+        return cls._shared if cls._is_shared() else cls._local
+
+    @classmethod
+    def _get_leased(cls) -> Optional[WebDriver]:
+        holder = cls._get_holder()
+        driver = getattr(holder, 'driver', None)
+        if driver is not None and not driver.session_id:
+            # сессия закрыта вызовом quit из другого потока
+            holder.driver = None
+            return None
+        return driver
+
     @classmethod
     def _destroy(cls) -> None:
-        driver = getattr(cls, '__cached_driver', None)
-        if driver and driver.session_id:
-            driver.quit()
-            driver.session_id = None
-            delattr(cls, '__cached_driver')
-            cls.downloads_dir = None
+        driver = cls._get_leased()
+        if driver is not None:
+            cls._get_holder().driver = None
+            # если есть запасные сессии, то старую закрываем в фоне, а новая берется из запаса сразу
+            cls._get_pool().discard(driver, wait=not config.DRIVER_WARM_SPARES)
+
+    @classmethod
+    def _soft_reset(cls) -> bool:
+        """
+        Очищает текущую сессию без перезапуска браузера
+        :return: False, если сессия не отвечает и ее надо пересоздать
+        """
+        driver = cls._get_leased()
+        if driver is None or not SessionPool.is_healthy(driver):
+            return False
+        try:
+            SessionPool.soft_reset(driver)
+        except WebDriverException as e:
+            logger.warning('Cannot soft reset browser session %s: %s', driver.session_id, e)
+            return False
+        return True
 
     @classmethod
     def get_driver(cls, fresh_session: bool = False) -> WebDriver:
-        if fresh_session:
+        """
+        Возвращает сессию, арендованную текущим потоком (при DRIVER_POOL_SIZE = 1 - общую для всех потоков).
+        Если ее нет, то берет сессию из пула
+        :param fresh_session: начать чистую сессию (при DRIVER_SOFT_RESET текущая сессия очищается,
+        иначе закрывается и создается новая)
+        :return:
+        """
+        if not cls._is_shared():
+            return cls._lease(fresh_session)
+        with cls._lock:
+            return cls._lease(fresh_session)
+
+    @classmethod
+    def _lease(cls, fresh_session: bool = False) -> WebDriver:
+        if fresh_session and not (config.DRIVER_SOFT_RESET and cls._soft_reset()):
             cls._destroy()
 
-        if not hasattr(cls, '__cached_driver'):
-            setattr(cls, '__cached_driver', cls._create())
+        driver = cls._get_leased()
+        if driver is None:
+            driver = cls._get_pool().lease(timeout=config.DRIVER_POOL_LEASE_TIMEOUT or None)
+            cls._get_holder().driver = driver
+        return driver
 
-        return getattr(cls, '__cached_driver')
+    @classmethod
+    def release(cls, reset: bool = True) -> None:
+        """
+        Возвращает сессию текущего потока в пул, чтобы ее мог взять другой поток (вызывать после теста)
+        :param reset: очистить cookie и storage сессии
+        :return:
+        """
+        driver = cls._get_leased()
+        if driver is not None:
+            cls._get_holder().driver = None
+            cls._get_pool().release(driver, reset=reset)
 
     @classmethod
     def quit(cls) -> None:
-        cls._destroy()
+        with cls._lock:
+            pool, cls._pool = cls._pool, None
+        cls._local.driver = None
+        cls._shared.driver = None
+        if pool is not None:
+            pool.close()
+        cls.downloads_dir = None
@@ -0,0 +1,473 @@
+"""
+Драйвер-заглушка для прогона слоя страниц без браузера (перф-тесты, бенчмарки, тесты в CI).
+DOM страницы - дерево lxml, построенное из html-фикстуры, команды selenium исполняются в процессе.
+Каждая команда считается (это число запросов к реальному драйверу) и может задерживаться на latency секунд,
+чтобы имитировать сетевую задержку.
+
+Подключается через E2EDriver.driver_factory:
+    E2EDriver.driver_factory = lambda: FakeWebDriver(pages={'/campaigns': html}, latency=0.005)
+"""
+import re
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from adctest.helpers import dom
+from adctest.helpers.locators import Locators, locator_to_xpath, has_class_condition
+from adctest.page_helpers.scripts import PAGE_READY_SCRIPT, PAGE_HTML_SCRIPT, CLEAR_STORAGE_SCRIPT, \
+    SOFT_RESET_SCRIPT, FIND_ELEMENTS_BATCH_SCRIPT, WAIT_CONDITION_SCRIPT, ANGULAR_STABLE_SCRIPT, READ_PROPERTIES_SCRIPT
+from lxml import etree, html
+from lxml.html import HtmlElement
+from selenium.common.exceptions import WebDriverException, NoSuchElementException, StaleElementReferenceException, \
+    NoSuchWindowException, InvalidSelectorException
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.file_detector import LocalFileDetector
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+BLANK_PAGE = '<html><head></head><body></body></html>'
+BLANK_URL = 'about:blank'
+KEYS_RANGE = re.compile('[\ue000-\uf8ff]')
+"""служебные символы selenium Keys (ENTER, TAB и т.д.), в значение поля они не попадают"""
+
+ScriptHandler = Callable[..., Any]
+ClickHandler = Callable[['FakeWebDriver', HtmlElement], None]
+
+
+class FakeWebElement(WebElement):
+    """
+    WebElement драйвера-заглушки
+    """
+    @property
+    def node(self) -> HtmlElement:
+        """
+        Элемент дерева lxml (доступ к нему не считается командой драйвера)
+        :return:
+        """
+        return self.parent.get_node(self.id)
+
+
+class FakeWebDriver(WebDriver):
+    """
+    Драйвер, исполняющий команды selenium над деревом lxml без браузера и сети.
+    Реализованы поиск элементов, атрибуты и текст, клики, ввод текста, cookie, вкладки
+    и скрипты, которые использует пакет (остальные скрипты подключаются через register_script)
+    """
+    _web_element_cls = FakeWebElement
+
+    # noinspection PyMissingConstructor
+    def __init__(self, pages: Optional[Dict[str, str]] = None, latency: float = 0.0):
+        """
+        WebDriver.__init__ не вызывается, т.к. он запускает сессию через command_executor
+        :param pages: html-фикстуры страниц по url (полному или только пути с query)
+        :param latency: задержка каждой команды в секундах
+        """
+        self.pages: Dict[str, str] = dict(pages or {})
+        self.latency = latency
+        self.commands: Counter = Counter()
+        """число выполненных команд по именам команд selenium"""
+        self.scripts: Counter = Counter()
+        """число выполненных скриптов по именам обработчиков"""
+        self.cookies: List[Dict] = []
+        self.local_storage: Dict[str, str] = {}
+        self.page_ready = True
+        """результат PAGE_READY_SCRIPT"""
+
+        self.session_id = 'fake-session'
+        self.capabilities = {'browserName': 'fake'}
+        self.w3c = False
+        self.command_executor = None
+        self.error_handler = ErrorHandler()
+        self.file_detector = LocalFileDetector()
+        self._is_remote = False
+        self._mobile = None
+        self._switch_to = SwitchTo(self)
+
+        self._handles: List[str] = ['window-1']
+        self._current_handle = self._handles[0]
+        self._handles_counter = 1
+        self._url = BLANK_URL
+        self._document: HtmlElement = html.document_fromstring(BLANK_PAGE)
+        self._nodes: Dict[str, HtmlElement] = {}
+        self._node_ids: Dict[HtmlElement, str] = {}
+        self._ids_counter = 0
+        self._script_handlers: List[Tuple[str, str, ScriptHandler]] = []
+        self._click_handlers: List[Tuple[etree.XPath, ClickHandler]] = []
+        self._register_default_scripts()
+
+    def __repr__(self):
+        return f'<{type(self).__name__} (url="{self._url}", commands={self.round_trips})>'
+
+    # ----------------------------------------------------------- публичный интерфейс для тестов
+
+    @property
+    def round_trips(self) -> int:
+        """
+        Общее число выполненных команд
+        :return:
+        """
+        return sum(self.commands.values())
+
+    def reset_counters(self) -> None:
+        self.commands.clear()
+        self.scripts.clear()
+
+    def add_page(self, url: str, page_html: str) -> None:
+        self.pages[url] = page_html
+
+    def load_html(self, page_html: str, url: str = BLANK_URL) -> None:
+        """
+        Подменяет текущую страницу без команды драйвера (все найденные ранее элементы становятся stale)
+        :param page_html:
+        :param url:
+        :return:
+        """
+        self._url = url
+        self._document = html.document_fromstring(page_html)
+        self._nodes.clear()
+        self._node_ids.clear()
+
+    @property
+    def document(self) -> HtmlElement:
+        return self._document
+
+    def get_node(self, element_id: str) -> HtmlElement:
+        """
+        Элемент дерева по id WebElement
+        :param element_id:
+        :return:
+        """
+        node = self._nodes.get(element_id)
+        if node is None or node.getroottree().getroot() is not self._document:
+            raise StaleElementReferenceException(f'Element {element_id} is not attached to the page document')
+        return node
+
+    def register_script(self, fragment: str, handler: ScriptHandler, name: Optional[str] = None) -> None:
+        """
+        Обработчик скриптов execute_script/execute_async_script, в тексте которых есть fragment.
+        Обработчик получает драйвер и аргументы скрипта (WebElement заменены на элементы lxml),
+        элементы lxml в результате заменяются на WebElement. Обработчики, добавленные позже, проверяются первыми
+        :param fragment: часть текста скрипта
+        :param handler:
+        :param name: имя для счетчика scripts (по умолчанию fragment)
+        :return:
+        """
+        self._script_handlers.insert(0, (fragment, name or fragment, handler))
+
+    def on_click(self, xpath: str, handler: ClickHandler) -> None:
+        """
+        Обработчик клика по элементам, подходящим под xpath (например, открыть выпадающий список,
+        переключить страницу таблицы)
+        :param xpath: xpath относительно документа
+        :param handler: получает драйвер и элемент lxml
+        :return:
+        """
+        self._click_handlers.append((Locators.compile(xpath), handler))
+
+    def open_window(self) -> str:
+        """
+        Открывает вкладку (как по ссылке с target=_blank), фокус остается на текущей
+        :return: handle новой вкладки
+        """
+        self._handles_counter += 1
+        handle = f'window-{self._handles_counter}'
+        self._handles.append(handle)
+        return handle
+
+    # ----------------------------------------------------------- исполнение команд
+
+    def start_client(self):
+        pass
+
+    def stop_client(self):
+        pass
+
+    def execute(self, driver_command: str, params: Optional[Dict] = None) -> Dict:
+        self.commands[driver_command] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        params = params or {}
+        handler = getattr(self, f'_cmd_{driver_command}', None)
+        if handler is None:
+            raise WebDriverException(f'{type(self).__name__} does not support command "{driver_command}"')
+        return {'status': 0, 'value': handler(params)}
+
+    def _element(self, params: Dict) -> HtmlElement:
+        return self.get_node(params['id'])
+
+    def _wrap(self, node: HtmlElement) -> FakeWebElement:
+        element_id = self._node_ids.get(node)
+        if element_id is None:
+            self._ids_counter += 1
+            element_id = f'fake-element-{self._ids_counter}'
+            self._node_ids[node] = element_id
+            self._nodes[element_id] = node
+        return self.create_web_element(element_id)
+
+    def _find(self, context: HtmlElement, params: Dict) -> List[HtmlElement]:
+        xpath = locator_to_xpath(params['using'], params['value'])
+        try:
+            found = Locators.evaluate(context, xpath)
+        except etree.XPathError as e:
+            raise InvalidSelectorException(f'Invalid xpath "{xpath}": {e}')
+        return [node for node in found if isinstance(node, HtmlElement)]
+
+    def _find_one(self, context: HtmlElement, params: Dict) -> FakeWebElement:
+        found = self._find(context, params)
+        if not found:
+            raise NoSuchElementException(f'Unable to locate element: {params["using"]}="{params["value"]}"')
+        return self._wrap(found[0])
+
+    def _cmd_get(self, params: Dict) -> None:
+        url = params['url']
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        for key in (url, path, parts.path):
+            if key in self.pages:
+                self.load_html(self.pages[key], url)
+                return
+        self.load_html(BLANK_PAGE, url)
+
+    def _cmd_refresh(self, params: Dict) -> None:
+        self._cmd_get({'url': self._url})
+
+    def _cmd_getCurrentUrl(self, params: Dict) -> str:
+        return self._url
+
+    def _cmd_getTitle(self, params: Dict) -> str:
+        titles = self._document.xpath('//title')
+        return titles[0].text_content().strip() if titles else ''
+
+    def _cmd_getPageSource(self, params: Dict) -> str:
+        return html.tostring(self._document, encoding='unicode')
+
+    def _cmd_findElement(self, params: Dict) -> FakeWebElement:
+        return self._find_one(self._document, params)
+
+    def _cmd_findElements(self, params: Dict) -> List[FakeWebElement]:
+        return [self._wrap(node) for node in self._find(self._document, params)]
+
+    def _cmd_findChildElement(self, params: Dict) -> FakeWebElement:
+        return self._find_one(self._element(params), params)
+
+    def _cmd_findChildElements(self, params: Dict) -> List[FakeWebElement]:
+        return [self._wrap(node) for node in self._find(self._element(params), params)]
+
+    def _cmd_getElementTagName(self, params: Dict) -> str:
+        return self._element(params).tag
+
+    def _cmd_getElementText(self, params: Dict) -> str:
+        node = self._element(params)
+        return dom.visible_text(node) if dom.is_displayed(node) else ''
+
+    def _cmd_getElementAttribute(self, params: Dict) -> Any:
+        return dom.read_property(self._element(params), params['name'])
+
+    def _cmd_getElementProperty(self, params: Dict) -> Any:
+        return dom.read_property(self._element(params), params['name'])
+
+    def _cmd_isElementDisplayed(self, params: Dict) -> bool:
+        return dom.is_displayed(self._element(params))
+
+    def _cmd_isElementEnabled(self, params: Dict) -> bool:
+        return dom.is_enabled(self._element(params))
+
+    def _cmd_isElementSelected(self, params: Dict) -> bool:
+        return dom.is_selected(self._element(params))
+
+    def _cmd_getElementLocation(self, params: Dict) -> Dict:
+        self._element(params)
+        return {'x': 0, 'y': 0}
+
+    def _cmd_getElementSize(self, params: Dict) -> Dict:
+        visible = dom.is_displayed(self._element(params))
+        return {'width': 100 if visible else 0, 'height': 20 if visible else 0}
+
+    def _cmd_getElementValueOfCssProperty(self, params: Dict) -> str:
+        style = self._element(params).attrib.get('style', '')
+        for declaration in style.split(';'):
+            name, _, value = declaration.partition(':')
+            if name.strip().lower() == params['propertyName']:
+                return value.strip()
+        return ''
+
+    def _cmd_clickElement(self, params: Dict) -> None:
+        node = self._element(params)
+        if not dom.is_displayed(node):
+            raise WebDriverException('element not interactable')
+        for xpath, handler in self._click_handlers:
+            if node in xpath(self._document):
+                handler(self, node)
+
+    def _cmd_sendKeysToElement(self, params: Dict) -> None:
+        node = self._element(params)
+        text = KEYS_RANGE.sub('', params.get('text') or ''.join(params.get('value', [])))
+        self.set_value(node, dom.read_property(node, 'value') + text)
+
+    def _cmd_clearElement(self, params: Dict) -> None:
+        self.set_value(self._element(params), '')
+
+    def _cmd_executeScript(self, params: Dict) -> Any:
+        return self._run_script(params['script'], params.get('args', []))
+
+    def _cmd_executeAsyncScript(self, params: Dict) -> Any:
+        return self._run_script(params['script'], params.get('args', []))
+
+    def _cmd_setScriptTimeout(self, params: Dict) -> None:
+        pass
+
+    def _cmd_setTimeouts(self, params: Dict) -> None:
+        pass
+
+    def _cmd_implicitlyWait(self, params: Dict) -> None:
+        pass
+
+    def _cmd_getLog(self, params: Dict) -> List:
+        return []
+
+    def _cmd_screenshot(self, params: Dict) -> str:
+        return ''
+
+    def _cmd_getCookies(self, params: Dict) -> List[Dict]:
+        return [dict(cookie) for cookie in self.cookies]
+
+    def _cmd_addCookie(self, params: Dict) -> None:
+        cookie = dict(params['cookie'])
+        self.cookies = [c for c in self.cookies if c['name'] != cookie['name']] + [cookie]
+
+    def _cmd_deleteCookie(self, params: Dict) -> None:
+        self.cookies = [c for c in self.cookies if c['name'] != params['name']]
+
+    def _cmd_deleteAllCookies(self, params: Dict) -> None:
+        self.cookies = []
+
+    def _cmd_getWindowHandles(self, params: Dict) -> List[str]:
+        return list(self._handles)
+
+    def _cmd_getCurrentWindowHandle(self, params: Dict) -> str:
+        return self._current_handle
+
+    def _cmd_switchToWindow(self, params: Dict) -> None:
+        handle = params.get('handle') or params.get('name')
+        if handle not in self._handles:
+            raise NoSuchWindowException(f'no such window: {handle}')
+        self._current_handle = handle
+
+    def _cmd_close(self, params: Dict) -> None:
+        self._handles.remove(self._current_handle)
+
+    def _cmd_quit(self, params: Dict) -> None:
+        self.session_id = None
+
+    # ----------------------------------------------------------- модель DOM
+
+    @classmethod
+    def set_value(cls, node: HtmlElement, value: str) -> None:
+        if node.tag == 'textarea':
+            node.text = value
+        else:
+            node.set('value', value)
+
+    # ----------------------------------------------------------- скрипты
+
+    def _register_default_scripts(self) -> None:
+        self.register_script('scrollIntoView', lambda driver, *args: None, name='scroll')
+        self.register_script('localStorage.removeItem', self._remove_storage_item, name='storage_remove')
+        self.register_script('localStorage.clear', self._clear_storage, name='storage_clear')
+        self.register_script(CLEAR_STORAGE_SCRIPT, self._clear_storage, name='clear_storage')
+        self.register_script(SOFT_RESET_SCRIPT, self._clear_storage, name='soft_reset')
+        self.register_script(PAGE_READY_SCRIPT, lambda driver: driver.page_ready, name='page_ready')
+        self.register_script(PAGE_HTML_SCRIPT, lambda driver: dom.read_property(driver.document, 'outerHTML'),
+                             name='page_html')
+        self.register_script(ANGULAR_STABLE_SCRIPT, lambda driver, timeout: {'ok': True, 'angular': False},
+                             name='angular_stable')
+        self.register_script(FIND_ELEMENTS_BATCH_SCRIPT, self._find_batch, name='find_batch')
+        self.register_script(WAIT_CONDITION_SCRIPT, self._wait_condition, name='wait_condition')
+        self.register_script(READ_PROPERTIES_SCRIPT, self._read_properties, name='read_properties')
+
+    def _run_script(self, script: str, args: List) -> Any:
+        for fragment, name, handler in self._script_handlers:
+            if fragment in script:
+                self.scripts[name] += 1
+                return self._to_elements(handler(self, *self._to_nodes(args)))
+        raise WebDriverException(f'{type(self).__name__} has no handler for script: {script.strip()[:100]}')
+
+    def _to_nodes(self, value: Any) -> Any:
+        if isinstance(value, WebElement):
+            return self.get_node(value.id)
+        if isinstance(value, (list, tuple)):
+            return [self._to_nodes(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self._to_nodes(v) for k, v in value.items()}
+        return value
+
+    def _to_elements(self, value: Any) -> Any:
+        if isinstance(value, HtmlElement):
+            return self._wrap(value)
+        if isinstance(value, (list, tuple)):
+            return [self._to_elements(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self._to_elements(v) for k, v in value.items()}
+        return value
+
+    @classmethod
+    def _clear_storage(cls, driver: 'FakeWebDriver', *args) -> bool:
+        driver.local_storage.clear()
+        return True
+
+    @classmethod
+    def _remove_storage_item(cls, driver: 'FakeWebDriver', key: str) -> None:
+        driver.local_storage.pop(key, None)
+
+    @classmethod
+    def _find_batch(cls, driver: 'FakeWebDriver', locators: List[List[str]]) -> List[List[HtmlElement]]:
+        found = []
+        for by, value in locators:
+            try:
+                found.append(driver._find(driver.document, {'using': by, 'value': value}))
+            except (InvalidSelectorException, etree.XPathError):
+                found.append([])
+        return found
+
+    @classmethod
+    def _read_properties(cls, driver: 'FakeWebDriver', targets: List, names: List[str], many: bool) -> List:
+        def read(node: HtmlElement) -> Dict:
+            values = {
+                'text': lambda: dom.visible_text(node) if dom.is_displayed(node) else '',
+                'displayed': lambda: dom.is_displayed(node),
+                'enabled': lambda: dom.is_enabled(node),
+                'selected': lambda: dom.is_selected(node),
+                'tag_name': lambda: node.tag,
+            }
+            return {name: values[name]() if name in values else dom.read_property(node, name) for name in names}
+
+        result = []
+        for target in targets:
+            if not isinstance(target, str):
+                result.append(read(target))
+                continue
+            found = [node for node in Locators.evaluate(driver.document, target) if isinstance(node, HtmlElement)]
+            if many:
+                result.append([read(node) for node in found])
+            else:
+                result.append(read(found[0]) if found else None)
+        return result
+
+    @classmethod
+    def _wait_condition(cls, driver: 'FakeWebDriver', kind: str, args: List, timeout: int) -> Dict:
+        """
+        Условие проверяется один раз: DOM заглушки меняется только командами, поэтому ждать изменений нечего
+        """
+        value = None
+        if kind == 'visible_one_of':
+            value = next((i for i, node in enumerate(args[0]) if dom.is_displayed(node)), None)
+        elif kind == 'class_absent':
+            nodes = driver.document.xpath(f'//*[{has_class_condition(args[0])}]')
+            value = None if any(dom.is_displayed(node) for node in nodes) else True
+        elif kind == 'options_loaded':
+            options = [node for node in Locators.evaluate(args[0], args[1]) if isinstance(node, HtmlElement)]
+            text = options[0].text_content().lower() if options else 'load'
+            value = None if 'load' in text or 'not found' in text else True
+        return {'ok': value is not None, 'value': value}
@@ -1,16 +1,24 @@
-import uuid
+import base64
+import hashlib
 import zipfile
+from io import BytesIO
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urljoin
 
 from logging import getLogger
 import requests
 from adctest.config import config
+from adctest.driver.cache import DriverCache
 from requests import Timeout, Response
+from requests.exceptions import ChunkedEncodingError
 
 logger = getLogger()
 
 DEFAULT_TIMEOUT = 20
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_RETRIES = 3
+CACHE_DIR_NAME = 'chromedriver_cache'
 
 
 class ChromeDriverLoaderException(Exception):
@@ -25,9 +33,20 @@ class ChromeDriverLoader:
     _path_to_store: Path = None
     path_to_download: Path = None
     driver_path: str = None
+    """
+    путь до бинарника, с которым запускаются тесты: при включенном кэше (CHROME_DRIVER_CACHE_SIZE > 0) - бинарник
+    версии в папке кэша, иначе (или если RELOAD_DRIVER выключен и драйвер уже есть) - <driver_path>/chromedriver
+    """
 
     @classmethod
     def download(cls, path_to_download: Path, driver_path: Path) -> None:
+        """
+        Готовит драйвер и записывает путь до него в ChromeDriverLoader.driver_path.
+        При включенном кэше скачанный бинарник записывается только в кэш, в папку driver_path не копируется
+        :param path_to_download:
+        :param driver_path: папка драйвера
+        :return:
+        """
         logger.info('Prepare tests stage.')
         cls.path_to_download = path_to_download
         cls._path_to_store = driver_path
@@ -37,12 +56,31 @@ class ChromeDriverLoader:
             cls.driver_path = str(cls.make_driver_full_path())
             return
 
-        logger.info(' Starting download chrome driver')
         version = cls._get_latest_version()
-        archive_path = cls._download(version)
-        cls.driver_path = cls._unzip(archive_path)
+        cache = cls._get_cache()
+        cached_path = cache.get(version) if cache else None
+        if cached_path:
+            logger.info('Prepare tests stage. Use cached chrome driver %s from %s', version, cached_path)
+            cls.driver_path = str(cached_path)
+            return
+
+        logger.info(' Starting download chrome driver')
+        archive = cls._download(version)
+        driver_data = cls._extract_driver(archive)
+        if cache:
+            cls.driver_path = str(cache.put(version, driver_data))
+        else:
+            cls.driver_path = cls._save_driver(driver_data)
         logger.info('Prepare tests stage. Chrome driver downloaded and saved in %s', cls.driver_path)
 
+    @classmethod
+    def _get_cache(cls) -> Optional[DriverCache]:
+        if config.CHROME_DRIVER_CACHE_SIZE <= 0:
+            return None
+        path = Path(config.CHROME_DRIVER_CACHE_PATH) if config.CHROME_DRIVER_CACHE_PATH else \
+            cls._path_to_store.joinpath(CACHE_DIR_NAME)
+        return DriverCache(path, max_versions=config.CHROME_DRIVER_CACHE_SIZE)
+
     @classmethod
     def make_driver_full_path(cls) -> Path:
         return cls._path_to_store.joinpath(cls.driver_name)
@@ -74,31 +112,107 @@ class ChromeDriverLoader:
         return version
 
     @classmethod
-    def _download(cls, version: str) -> Path:
+    def _download(cls, version: str) -> bytes:
         file_relative_path = str(Path(version).joinpath(config.CHROME_DRIVER_FILE_NAME))
         download_url = urljoin(config.CHROME_DRIVER_URL, file_relative_path)
-        res = cls._get(download_url)
-        return cls._save_zip_to_tmp(res.content)
+        return cls._stream(download_url)
+
+    @classmethod
+    def _stream(cls, url: str) -> bytes:
+        """
+        Скачивает файл по частям. Если соединение оборвалось, то докачивает недостающую часть
+        через заголовок Range. Если сервер проигнорировал Range (ответ 200) или вернул не ту часть
+        (Content-Range не с того байта), то файл скачивается заново. Если сервер отдал md5 в x-goog-hash,
+        то проверяет контрольную сумму
+        :param url:
+        :return: содержимое файла
+        """
+        buffer = BytesIO()
+        expected_md5 = None
+        for attempt in range(1, DOWNLOAD_RETRIES + 1):
+            headers = {'Range': f'bytes={buffer.tell()}-'} if buffer.tell() else {}
+            try:
+                with requests.get(url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT) as res:
+                    if res.status_code == 200:
+                        # сервер не поддерживает Range, качаем заново
+                        buffer.seek(0)
+                        buffer.truncate()
+                    elif res.status_code != 206:
+                        raise ChromeDriverLoaderException(f'Cannot download chromedriver. Url: {url}. '
+                                                          f'Status_code: {res.status_code}')
+                    elif cls._get_range_start(res) != buffer.tell():
+                        logger.warning('Chrome driver server returned unexpected range "%s" for offset %s. '
+                                       'Download will be restarted', res.headers.get('Content-Range'), buffer.tell())
+                        buffer.seek(0)
+                        buffer.truncate()
+                        continue
+                    expected_md5 = cls._get_md5_from_headers(res) or expected_md5
+                    for chunk in res.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        buffer.write(chunk)
+                break
+            except (requests.exceptions.ConnectionError, ChunkedEncodingError) as e:
+                logger.warning('Chrome driver download interrupted on %s bytes (attempt %s): %s',
+                               buffer.tell(), attempt, e)
+            except Timeout:
+                raise ChromeDriverLoaderException(f'Cannot download chromedriver from {url}. Timeout error.')
+        else:
+            raise ChromeDriverLoaderException(f'Cannot download chromedriver from {url}. '
+                                              f'Connection was interrupted {DOWNLOAD_RETRIES} times.')
+
+        data = buffer.getvalue()
+        if expected_md5 and hashlib.md5(data).digest() != expected_md5:
+            raise ChromeDriverLoaderException(f'Chromedriver downloaded from {url} has wrong checksum.')
+        return data
 
     @classmethod
-    def _save_zip_to_tmp(cls, data: bytes) -> Path:
-        file_name = '.'.join([str(uuid.uuid4()), 'zip'])
-        path_to_write = cls.path_to_download.joinpath(file_name)
-        path_to_write.write_bytes(data)
-        return path_to_write
+    def _get_range_start(cls, res: Response) -> Optional[int]:
+        """
+        Извлекает первый байт из заголовка вида "Content-Range: bytes 100-199/200"
+        :param res:
+        :return: None, если заголовка нет или он невалидный
+        """
+        unit, _, byte_range = res.headers.get('Content-Range', '').partition(' ')
+        start = byte_range.partition('-')[0]
+        if unit != 'bytes' or not start.isdigit():
+            return None
+        return int(start)
 
     @classmethod
-    def _unzip(cls, archive_path: Path) -> str:
-        archive = zipfile.ZipFile(file=archive_path)
+    def _get_md5_from_headers(cls, res: Response) -> Optional[bytes]:
+        """
+        Извлекает md5 из заголовка вида "x-goog-hash: crc32c=n03x6A==, md5=Ojk9c3dhfxgoKVVHYwFbHQ=="
+        :param res:
+        :return:
+        """
+        for item in res.headers.get('x-goog-hash', '').split(','):
+            name, _, value = item.strip().partition('=')
+            if name == 'md5' and value:
+                return base64.b64decode(value)
+        return None
+
+    @classmethod
+    def _extract_driver(cls, archive: bytes) -> bytes:
+        """
+        Извлекает бинарник драйвера из архива в памяти
+        :param archive: содержимое zip-архива
+        :return:
+        """
+        try:
+            with zipfile.ZipFile(BytesIO(archive)) as zip_file:
+                return zip_file.read(cls.driver_name)
+        except KeyError:
+            raise ChromeDriverLoaderException(f'Driver archive downloaded. '
+                                              f'But file "{cls.driver_name}" not found in it.')
+        except zipfile.BadZipFile:
+            raise ChromeDriverLoaderException('Driver archive downloaded. But it is not a zip file.')
+
+    @classmethod
+    def _save_driver(cls, data: bytes) -> str:
         driver_file_path = cls.make_driver_full_path()
         if driver_file_path.exists():
             logger.info('Remove previouse driver at: %s', driver_file_path)
             driver_file_path.unlink()
-        archive.extract(cls.driver_name, path=str(cls._path_to_store))
-        archive.close()
-        if not driver_file_path.exists():
-            raise ChromeDriverLoaderException(f'Driver archive downloaded. '
-                                              f'But file "{cls.driver_name}" not found in it.')
+        driver_file_path.write_bytes(data)
         # set -rwxrwxr-x to file
         driver_file_path.chmod(0o775)
         return str(driver_file_path)
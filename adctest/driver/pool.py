@@ -0,0 +1,247 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Set
+
+from adctest.helpers.exceptions import DriverPoolException
+from adctest.page_helpers.scripts import CLEAR_STORAGE_SCRIPT, SOFT_RESET_SCRIPT
+from adctest.page_helpers.session import focus_on_first_opened_tab, delete_cookies, delete_local_storage
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger('e2e-test')
+
+BLANK_PAGE_URL = 'about:blank'
+
+
+class SessionPool:
+    """
+    Пул сессий браузера. Сессия берется в аренду (lease) и возвращается (release) после теста,
+    при возврате очищаются cookie и storage, а сам браузер не перезапускается.
+    Одновременно открыто не больше size сессий, если все заняты, то lease ждет освобождения.
+    Дополнительно пул может держать spares "теплых" сессий, которые создаются в фоновом потоке,
+    пока идут тесты, и отдаются вместо создания новой сессии
+    """
+
+    def __init__(self, factory: Callable[[], WebDriver], size: int = 1, spares: int = 0):
+        """
+        :param factory: функция, создающая новую сессию
+        :param size: максимальное число сессий
+        :param spares: число заранее созданных запасных сессий
+        """
+        if size < 1:
+            raise DriverPoolException(f'Pool size must be positive, got {size}')
+        self._factory = factory
+        self.size = size
+        self.spares = spares
+        self._idle: Deque[WebDriver] = deque()
+        self._leased: Set[WebDriver] = set()
+        self._spares: Deque[WebDriver] = deque()
+        self._creating = 0
+        self._warming = 0
+        self._closed = False
+        self._background: List[threading.Thread] = []
+        self._condition = threading.Condition()
+
+    @property
+    def created(self) -> int:
+        return len(self._idle) + len(self._leased) + self._creating
+
+    def lease(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Возвращает свободную живую сессию или создает новую, если пул не заполнен
+        :param timeout: сколько ждать освобождения сессии (None - ждать бесконечно)
+        :return:
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            while not self._idle and self.created >= self.size:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise DriverPoolException(f'All {self.size} browser sessions are busy')
+                self._condition.wait(remaining)
+            if self._idle:
+                driver = self._idle.popleft()
+                self._leased.add(driver)
+            elif self._spares:
+                driver = self._spares.popleft()
+                self._leased.add(driver)
+            else:
+                # место в пуле занимаем сразу, а сессию создаем вне блокировки
+                driver = None
+                self._creating += 1
+
+        self._warm_up()
+        if driver is not None:
+            if self.is_healthy(driver):
+                return driver
+            logger.warning('Browser session %s is not alive. Create new one', driver.session_id)
+            with self._condition:
+                self._leased.discard(driver)
+                self._creating += 1
+            self._quit(driver)
+
+        new_driver = None
+        try:
+            new_driver = self._factory()
+        finally:
+            with self._condition:
+                self._creating -= 1
+                if new_driver is not None:
+                    self._leased.add(new_driver)
+                else:
+                    self._condition.notify()
+        return new_driver
+
+    def release(self, driver: WebDriver, reset: bool = True) -> None:
+        """
+        Возвращает сессию в пул
+        :param driver:
+        :param reset: очистить cookie и storage перед возвратом
+        :return:
+        """
+        if reset:
+            try:
+                self.reset(driver)
+            except WebDriverException as e:
+                logger.warning('Cannot reset browser session %s: %s. Session will be closed', driver.session_id, e)
+                self.discard(driver)
+                return
+        with self._condition:
+            if driver not in self._leased:
+                return
+            self._leased.remove(driver)
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def discard(self, driver: WebDriver, wait: bool = True) -> None:
+        """
+        Закрывает сессию и освобождает ее место в пуле
+        :param driver:
+        :param wait: если False, то сессия закрывается в фоновом потоке
+        :return:
+        """
+        self._forget(driver)
+        if wait:
+            self._quit(driver)
+        else:
+            self._run_in_background(self._quit, driver)
+
+    def close(self) -> None:
+        """
+        Закрывает все сессии пула
+        :return:
+        """
+        with self._condition:
+            self._closed = True
+            drivers = [*self._idle, *self._leased, *self._spares]
+            self._idle.clear()
+            self._leased.clear()
+            self._spares.clear()
+            self._condition.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+        # дожидаемся фоновых потоков, чтобы не оставить открытых браузеров
+        for thread in list(self._background):
+            thread.join()
+
+    def _warm_up(self) -> None:
+        """
+        Запускает фоновое создание недостающих запасных сессий
+        :return:
+        """
+        with self._condition:
+            if self._closed:
+                return
+            need = self.spares - len(self._spares) - self._warming
+            self._warming += max(need, 0)
+        for _ in range(need):
+            self._run_in_background(self._create_spare)
+
+    def _create_spare(self) -> None:
+        driver = None
+        try:
+            driver = self._factory()
+        except Exception as e:
+            logger.warning('Cannot create spare browser session: %s', e)
+        finally:
+            with self._condition:
+                self._warming -= 1
+                closed = self._closed
+                if driver is not None and not closed:
+                    self._spares.append(driver)
+                    self._condition.notify()
+        if driver is not None and closed:
+            self._quit(driver)
+
+    def _run_in_background(self, target: Callable, *args) -> None:
+        def run():
+            try:
+                target(*args)
+            finally:
+                with self._condition:
+                    self._background.remove(thread)
+
+        thread = threading.Thread(target=run, daemon=True)
+        with self._condition:
+            self._background.append(thread)
+        thread.start()
+
+    def _forget(self, driver: WebDriver) -> None:
+        with self._condition:
+            self._leased.discard(driver)
+            if driver in self._idle:
+                self._idle.remove(driver)
+            self._condition.notify()
+
+    @classmethod
+    def reset(cls, driver: WebDriver) -> None:
+        """
+        Очищает cookie, localStorage и sessionStorage текущего домена сессии
+        :param driver:
+        :return:
+        """
+        driver.delete_all_cookies()
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+
+    @classmethod
+    def soft_reset(cls, driver: WebDriver) -> None:
+        """
+        Приводит сессию к состоянию, близкому к только что запущенному браузеру, без его перезапуска:
+        закрывает лишние вкладки, удаляет cookie, localStorage, sessionStorage, IndexedDB,
+        service workers и Cache Storage текущего домена, после чего открывает пустую страницу
+        :param driver:
+        :return:
+        """
+        focus_on_first_opened_tab(driver)
+        delete_cookies(driver)
+        delete_local_storage(driver)
+        # остальное хранилище, которое не очищают хелперы страницы
+        driver.execute_async_script(SOFT_RESET_SCRIPT)
+        driver.get(BLANK_PAGE_URL)
+
+    @classmethod
+    def is_healthy(cls, driver: WebDriver) -> bool:
+        """
+        Проверяет, что сессия открыта и браузер отвечает
+        :param driver:
+        :return:
+        """
+        if not driver.session_id:
+            return False
+        try:
+            driver.current_url
+        except WebDriverException:
+            return False
+        return True
+
+    @classmethod
+    def _quit(cls, driver: WebDriver) -> None:
+        if not driver.session_id:
+            return
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logger.warning('Cannot quit browser session %s: %s', driver.session_id, e)
+        driver.session_id = None
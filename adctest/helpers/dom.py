@@ -0,0 +1,81 @@
+"""
+Состояние элемента дерева lxml так, как его вернули бы команды WebElement (видимость, текст, get_attribute).
+Все вычисляется только по разметке: стили из css-файлов и свойства DOM, которых нет в атрибутах, не учитываются.
+Используется драйвером-заглушкой FakeWebDriver и снимком страницы PageSnapshot
+"""
+from html import escape as html_escape
+from typing import AbstractSet, Optional
+
+from adctest.page_helpers.scripts import BOOLEAN_ATTRIBUTES
+from lxml import html
+from lxml.html import HtmlElement
+
+HIDDEN_TAGS = frozenset(['head', 'script', 'style', 'template', 'noscript', 'title', 'meta', 'link'])
+"""тэги, содержимое которых никогда не отображается"""
+
+
+def is_displayed(node: HtmlElement, hidden_css_classes: AbstractSet[str] = frozenset()) -> bool:
+    """
+    Видимость по разметке: элемент и его предки не скрыты атрибутом hidden, inline-стилем display: none /
+    visibility: hidden, css-классами hidden_css_classes и не являются служебными тэгами (head, script и т.д.)
+    :param node:
+    :param hidden_css_classes: css-классы, которые скрывают элемент (например, ng-hide)
+    :return:
+    """
+    for el in (node, *node.iterancestors()):
+        if el.tag in HIDDEN_TAGS or 'hidden' in el.attrib:
+            return False
+        style = el.get('style', '').replace(' ', '').lower()
+        if 'display:none' in style or 'visibility:hidden' in style:
+            return False
+        if hidden_css_classes and not hidden_css_classes.isdisjoint(el.classes):
+            return False
+    return True
+
+
+def visible_text(node: HtmlElement) -> str:
+    """
+    Текст элемента с схлопнутыми пробелами (без учета видимости)
+    :param node:
+    :return:
+    """
+    return ' '.join(node.text_content().split())
+
+
+def is_enabled(node: HtmlElement) -> bool:
+    return 'disabled' not in node.attrib
+
+
+def is_selected(node: HtmlElement) -> bool:
+    return 'checked' in node.attrib or 'selected' in node.attrib
+
+
+def read_property(node: HtmlElement, name: str) -> Optional[str]:
+    """
+    Значение атрибута или свойства элемента, как его вернет get_attribute.
+    value, checked и selected берутся из атрибутов, т.е. это состояние поля на момент получения разметки
+    :param node:
+    :param name:
+    :return:
+    """
+    if name == 'outerHTML':
+        return html.tostring(node, encoding='unicode', with_tail=False)
+    if name == 'innerHTML':
+        children = ''.join(html.tostring(child, encoding='unicode') for child in node)
+        return ''.join([html_escape(node.text or '', quote=False), children])
+    if name == 'textContent':
+        return node.text_content()
+    if name == 'innerText':
+        return visible_text(node)
+    if name == 'value':
+        if node.tag == 'textarea':
+            return node.text or ''
+        if node.tag == 'select':
+            selected = node.xpath('.//option[@selected]') or node.xpath('.//option')
+            return selected[0].get('value', selected[0].text_content()) if selected else ''
+        return node.get('value', '')
+    if name.lower() in BOOLEAN_ATTRIBUTES:
+        return 'true' if name.lower() in node.attrib else None
+    if name == 'className':
+        name = 'class'
+    return node.get(name)
@@ -76,3 +76,7 @@ class CKEditorException(E2EBaseException):
 
 class InputMaskException(E2EBaseException):
     pass
+
+
+class DriverPoolException(E2EBaseException):
+    pass
@@ -0,0 +1,184 @@
+"""
+Локаторы: реестр строк локаторов и скомпилированных xpath, перевод локаторов selenium в xpath
+для поиска элементов на стороне python (lxml) - в снимках страницы, парсерах компонентов и в драйвере-заглушке
+"""
+import re
+import sys
+from functools import lru_cache
+from typing import List
+
+from lxml import etree
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+LOCATORS_CACHE_SIZE = 4096
+"""максимальное число закэшированных строк локаторов и скомпилированных xpath"""
+
+
+class Locators:
+    """
+    Реестр локаторов. Строки локаторов, собранные из шаблона и параметров (номера строк таблицы, имена атрибутов),
+    кэшируются и интернируются, а xpath для поиска через lxml компилируются в etree.XPath один раз.
+    Кэши ограничены LOCATORS_CACHE_SIZE (LRU), т.к. параметры (например, искомый текст) могут быть любыми
+    """
+    @classmethod
+    @lru_cache(maxsize=LOCATORS_CACHE_SIZE)
+    def format(cls, template: str, *params) -> str:
+        """
+        Локатор из шаблона str.format и параметров
+        :param template: например, '{}[{}]'
+        :param params: параметры шаблона (должны быть хэшируемыми)
+        :return:
+        """
+        return sys.intern(template.format(*params))
+
+    @classmethod
+    @lru_cache(maxsize=LOCATORS_CACHE_SIZE)
+    def compile(cls, xpath: str) -> etree.XPath:
+        """
+        Скомпилированный xpath (для вычисления на стороне python)
+        :param xpath:
+        :return:
+        """
+        return etree.XPath(xpath)
+
+    @classmethod
+    def xpath(cls, template: str, *params) -> etree.XPath:
+        return cls.compile(cls.format(template, *params))
+
+    @classmethod
+    def evaluate(cls, context: etree.ElementBase, xpath: str) -> List:
+        """
+        Вычисляет xpath относительно элемента lxml
+        :param context:
+        :param xpath:
+        :return:
+        """
+        return cls.compile(xpath)(context)
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        cls.format.cache_clear()
+        cls.compile.cache_clear()
+        locator_to_xpath.cache_clear()
+
+
+def xpath_literal(value: str) -> str:
+    """
+    Строковый литерал xpath (в xpath 1.0 нет экранирования кавычек)
+    :param value:
+    :return:
+    """
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split('"')
+    return 'concat({})'.format(', \'"\', '.join(f'"{part}"' for part in parts))
+
+
+def has_class_condition(css_class: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), {xpath_literal(f" {css_class} ")})'
+
+
+_CSS_GROUP_SEPARATOR = re.compile(r',(?![^\[]*\])')
+_CSS_TOKEN = re.compile(r'\s*(?P<child>>)\s*|(?P<space>\s+)|(?P<compound>(?:\[[^\]]*\]|[^\s>\[])+)')
+_CSS_COMPOUND = re.compile(r'(?P<tag>^(?:[\w-]+|\*))|#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)'
+                           r'|\[(?P<attr>[\w-]+)(?:(?P<op>[~*^$]?=)'
+                           r'(?:"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\'|(?P<raw>[^\]]*)))?\]')
+
+
+def _css_compound_to_xpath(compound: str) -> str:
+    tag = '*'
+    conditions = []
+    position = 0
+    for match in _CSS_COMPOUND.finditer(compound):
+        if match.start() != position:
+            break
+        position = match.end()
+        if match.group('tag'):
+            tag = match.group('tag')
+        elif match.group('id'):
+            conditions.append(f'@id={xpath_literal(match.group("id"))}')
+        elif match.group('cls'):
+            conditions.append(has_class_condition(match.group('cls')))
+        else:
+            attr, op = match.group('attr'), match.group('op')
+            value = next((v for v in match.group('dq', 'sq', 'raw') if v is not None), '')
+            literal = xpath_literal(value)
+            if not op:
+                conditions.append(f'@{attr}')
+            elif op == '=':
+                conditions.append(f'@{attr}={literal}')
+            elif op == '*=':
+                conditions.append(f'contains(@{attr}, {literal})')
+            elif op == '^=':
+                conditions.append(f'starts-with(@{attr}, {literal})')
+            elif op == '$=':
+                conditions.append(f'substring(@{attr}, string-length(@{attr}) - {len(value) - 1})={literal}')
+            else:
+                words = f'concat(" ", normalize-space(@{attr}), " ")'
+                conditions.append(f'contains({words}, {xpath_literal(f" {value} ")})')
+    if position != len(compound):
+        raise InvalidSelectorException(f'Unsupported css selector part: "{compound}"')
+    return tag + ''.join(f'[{c}]' for c in conditions)
+
+
+def css_to_xpath(selector: str) -> str:
+    """
+    Переводит css-селектор в xpath относительно текущего элемента (descendant-or-self::).
+    Если установлен cssselect, то используется он, иначе поддерживаются простые селекторы: тэг, #id, .class,
+    [attr], [attr=value] (и операторы ~= *= ^= $=), комбинаторы потомка и ребенка (>), группы через запятую
+    :param selector:
+    :return:
+    """
+    if CSSSelector is not None:
+        return CSSSelector(selector, translator='html').path
+    paths = []
+    for group in _CSS_GROUP_SEPARATOR.split(selector):
+        parts = ['descendant-or-self::']
+        axis = ''
+        for match in _CSS_TOKEN.finditer(group.strip()):
+            if match.group('child'):
+                axis = '/'
+            elif match.group('space'):
+                axis = axis or '//'
+            else:
+                parts.extend([axis, _css_compound_to_xpath(match.group('compound'))])
+                axis = ''
+        if len(parts) == 1:
+            raise InvalidSelectorException(f'Empty css selector: "{selector}"')
+        paths.append(''.join(parts))
+    return ' | '.join(paths)
+
+
+@lru_cache(maxsize=LOCATORS_CACHE_SIZE)
+def locator_to_xpath(by: str, value: str) -> str:
+    """
+    xpath, эквивалентный локатору selenium
+    :param by: одно из значений By
+    :param value:
+    :return:
+    """
+    if by == By.XPATH:
+        return value
+    if by == By.CSS_SELECTOR:
+        return css_to_xpath(value)
+    if by == By.ID:
+        return f'.//*[@id={xpath_literal(value)}]'
+    if by == By.NAME:
+        return f'.//*[@name={xpath_literal(value)}]'
+    if by == By.CLASS_NAME:
+        return f'.//*[{has_class_condition(value)}]'
+    if by == By.TAG_NAME:
+        return f'.//{value}'
+    if by == By.LINK_TEXT:
+        return f'.//a[normalize-space()={xpath_literal(value)}]'
+    if by == By.PARTIAL_LINK_TEXT:
+        return f'.//a[contains(normalize-space(), {xpath_literal(value)})]'
+    raise InvalidSelectorException(f'Unsupported locator strategy: "{by}"')
@@ -0,0 +1,2 @@
+from adctest.instrumentation.sinks import Sink, MemorySink
+from adctest.instrumentation.recorder import OperationRecord, Recorder, recorder, instrument, instrument_driver
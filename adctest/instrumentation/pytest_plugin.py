@@ -0,0 +1,65 @@
+"""
+pytest-плагин для профилирования page objects. Подключается явно:
+    pytest -p adctest.instrumentation.pytest_plugin --adctest-profile
+    pytest -p adctest.instrumentation.pytest_plugin --adctest-profile-json ops.json --adctest-profile-trace trace.json
+"""
+import pytest
+
+from adctest.instrumentation import MemorySink, recorder
+
+_sink = MemorySink()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('adctest-profile')
+    group.addoption('--adctest-profile', action='store_true', default=False,
+                    help='записывать длительность операций page objects и число запросов к драйверу')
+    group.addoption('--adctest-profile-top', type=int, default=5,
+                    help='сколько самых долгих операций выводить для каждого теста')
+    group.addoption('--adctest-profile-json', default=None, help='файл для выгрузки всех операций в json')
+    group.addoption('--adctest-profile-trace', default=None,
+                    help='файл для выгрузки операций в формате Chrome trace (chrome://tracing)')
+
+
+def _is_enabled(config) -> bool:
+    return bool(config.getoption('--adctest-profile') or config.getoption('--adctest-profile-json')
+                or config.getoption('--adctest-profile-trace'))
+
+
+def pytest_configure(config):
+    if _is_enabled(config):
+        _sink.clear()
+        recorder.enable(_sink)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    recorder.context = item.nodeid
+    yield
+    recorder.context = None
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _is_enabled(config):
+        return
+    top = config.getoption('--adctest-profile-top')
+    terminalreporter.section('adctest slowest operations')
+    for context, records in _sink.by_context().items():
+        terminalreporter.write_line(context or '<outside tests>')
+        for record in MemorySink.top(records, top):
+            terminalreporter.write_line(
+                f'    {record.duration:8.3f}s  {record.commands:5d} commands  {record.retries:3d} retries  '
+                f'{record.name}'
+            )
+
+
+def pytest_unconfigure(config):
+    if not _is_enabled(config):
+        return
+    json_path = config.getoption('--adctest-profile-json')
+    if json_path:
+        _sink.dump_json(json_path)
+    trace_path = config.getoption('--adctest-profile-trace')
+    if trace_path:
+        _sink.dump_chrome_trace(trace_path)
+    recorder.disable()
@@ -0,0 +1,146 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+from adctest.instrumentation.sinks import Sink
+
+
+@dataclass
+class OperationRecord:
+    name: str
+    """имя операции (обычно qualname функции)"""
+    start: float
+    """время начала (time.perf_counter), в секундах"""
+    duration: float = 0
+    """длительность в секундах"""
+    commands: int = 0
+    """число запросов к драйверу за время операции (включая вложенные операции)"""
+    retries: int = 0
+    """число повторов из-за StaleElementReferenceException (включая вложенные операции)"""
+    depth: int = 0
+    """уровень вложенности операции"""
+    thread_id: int = 0
+    context: Optional[str] = None
+    """в рамках чего выполнялась операция (например, id теста)"""
+    command_names: Dict[str, int] = field(default_factory=dict)
+    """число запросов к драйверу по именам команд"""
+
+
+class Recorder:
+    """
+    Собирает длительность операций, число запросов к драйверу и повторов и передает записи в sinks.
+    По умолчанию выключен, и тогда обертки операций сводятся к одной проверке флага
+    """
+    enabled: bool = False
+    context: Optional[str] = None
+    """текущий контекст, проставляется в записи (например, pytest-плагином - id теста)"""
+
+    def __init__(self):
+        self.sinks: List[Sink] = []
+        self._local = threading.local()
+
+    def enable(self, *sinks: Sink) -> None:
+        self.sinks.extend(sinks)
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+
+    @property
+    def _stack(self) -> List[OperationRecord]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def operation(self, name: str):
+        """
+        Замеряет операцию. Вложенные операции записываются отдельно, но их запросы к драйверу
+        и повторы учитываются и в родительских
+        :param name:
+        :return:
+        """
+        if not self.enabled:
+            yield None
+            return
+        stack = self._stack
+        record = OperationRecord(name=name, start=time.perf_counter(), depth=len(stack),
+                                 thread_id=threading.get_ident(), context=self.context)
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - record.start
+            stack.pop()
+            for sink in self.sinks:
+                sink.record(record)
+
+    def count_command(self, command: str) -> None:
+        """
+        Учитывает запрос к драйверу во всех текущих операциях потока
+        :param command: имя команды selenium
+        :return:
+        """
+        if not self.enabled:
+            return
+        for record in self._stack:
+            record.commands += 1
+            record.command_names[command] = record.command_names.get(command, 0) + 1
+
+    def count_retry(self) -> None:
+        if not self.enabled:
+            return
+        for record in self._stack:
+            record.retries += 1
+
+
+recorder = Recorder()
+"""общий для всего процесса рекордер"""
+
+
+def instrument(name: Optional[str] = None) -> Callable:
+    """
+    Декоратор, записывающий каждый вызов функции как операцию recorder
+    :param name: имя операции (по умолчанию qualname функции)
+    :return:
+    """
+    def decorator(function: Callable) -> Callable:
+        operation_name = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return function(*args, **kwargs)
+            with recorder.operation(operation_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_driver(driver) -> None:
+    """
+    Подменяет execute у инстанса драйвера, чтобы каждый запрос к нему (включая запросы WebElement)
+    учитывался в текущих операциях recorder
+    :param driver: инстанс WebDriver
+    :return:
+    """
+    if getattr(driver, '_e2e_instrumented', False):
+        return
+    execute = driver.execute
+
+    @wraps(execute)
+    def counted_execute(driver_command, params=None):
+        recorder.count_command(driver_command)
+        return execute(driver_command, params)
+
+    driver.execute = counted_execute
+    driver._e2e_instrumented = True
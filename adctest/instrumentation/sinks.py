@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from adctest.instrumentation.recorder import OperationRecord
+
+
+class Sink:
+    """
+    Приемник записей recorder. Для своего приемника достаточно переопределить record
+    """
+
+    def record(self, record: 'OperationRecord') -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySink(Sink):
+    """
+    Хранит записи в памяти и умеет выгружать их в json или в формате Chrome trace (chrome://tracing, Perfetto)
+    """
+
+    def __init__(self):
+        self.records: List['OperationRecord'] = []
+        self._lock = threading.Lock()
+
+    def record(self, record: 'OperationRecord') -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records = []
+
+    def by_context(self) -> Dict[str, List['OperationRecord']]:
+        res = defaultdict(list)
+        for record in self.records:
+            res[record.context].append(record)
+        return res
+
+    @classmethod
+    def top(cls, records: List['OperationRecord'], count: int) -> List['OperationRecord']:
+        """
+        Самые долгие операции верхнего уровня (вложенные уже учтены в длительности родителя)
+        :param records:
+        :param count:
+        :return:
+        """
+        return sorted((r for r in records if r.depth == 0), key=lambda r: r.duration, reverse=True)[:count]
+
+    def dump_json(self, path: Path) -> None:
+        data = [
+            {
+                'name': r.name,
+                'context': r.context,
+                'start': r.start,
+                'duration': r.duration,
+                'commands': r.commands,
+                'command_names': r.command_names,
+                'retries': r.retries,
+                'depth': r.depth,
+                'thread_id': r.thread_id,
+            }
+            for r in self.records
+        ]
+        Path(path).write_text(json.dumps(data, indent=2))
+
+    def dump_chrome_trace(self, path: Path) -> None:
+        pid = os.getpid()
+        events = [
+            {
+                'name': r.name,
+                'cat': r.context or 'adctest',
+                'ph': 'X',
+                'ts': r.start * 1e6,
+                'dur': r.duration * 1e6,
+                'pid': pid,
+                'tid': r.thread_id,
+                'args': {'commands': r.commands, 'retries': r.retries},
+            }
+            for r in self.records
+        ]
+        Path(path).write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
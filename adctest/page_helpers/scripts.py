@@ -1,5 +1,27 @@
+import json
+
 PAGE_READY_SCRIPT = "if ('e2eReady' in window && window.e2eReady === true){return true;}else{return false;}"
 
+# html документа для снимка страницы. Состояние полей формы (value, checked, selected) хранится в свойствах DOM,
+# а не в атрибутах, поэтому оно переносится в атрибуты копии документа (сама страница не меняется)
+PAGE_HTML_SCRIPT = """
+var root = document.documentElement, clone = root.cloneNode(true), selector = 'input, textarea, option';
+var fields = root.querySelectorAll(selector), copies = clone.querySelectorAll(selector);
+for (var i = 0; i < fields.length; i++) {
+    var field = fields[i], copy = copies[i];
+    if (field.tagName === 'OPTION') {
+        if (field.selected) { copy.setAttribute('selected', ''); } else { copy.removeAttribute('selected'); }
+    } else if (field.type === 'checkbox' || field.type === 'radio') {
+        if (field.checked) { copy.setAttribute('checked', ''); } else { copy.removeAttribute('checked'); }
+    } else if (field.tagName === 'TEXTAREA') {
+        copy.textContent = field.value;
+    } else if (field.type !== 'file') {
+        copy.setAttribute('value', field.value);
+    }
+}
+return clone.outerHTML;
+"""
+
 SCROLL_TEMPLATE_SCRIPT = """
 arguments[0].scrollIntoView({{block: "{block}", inline: "{inline}"}})
 """
@@ -16,3 +38,238 @@ class check_js_condition_is_true:
             return True
         else:
             return False
+
+
+CLEAR_STORAGE_SCRIPT = """
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+} catch (e) {}
+"""
+
+# асинхронный скрипт (execute_async_script): последний аргумент - callback.
+# Очищает то, что не покрывают хелперы из page_helpers.session:
+# sessionStorage, IndexedDB, service workers и Cache Storage
+SOFT_RESET_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var tasks = [];
+try {
+    window.sessionStorage.clear();
+} catch (e) {}
+if (window.indexedDB && indexedDB.databases) {
+    tasks.push(indexedDB.databases().then(function (dbs) {
+        return Promise.all(dbs.map(function (db) {
+            return new Promise(function (resolve) {
+                var request = indexedDB.deleteDatabase(db.name);
+                request.onsuccess = request.onerror = request.onblocked = resolve;
+            });
+        }));
+    }));
+}
+if (navigator.serviceWorker) {
+    tasks.push(navigator.serviceWorker.getRegistrations().then(function (registrations) {
+        return Promise.all(registrations.map(function (r) { return r.unregister(); }));
+    }));
+}
+if (window.caches) {
+    tasks.push(caches.keys().then(function (keys) {
+        return Promise.all(keys.map(function (key) { return caches.delete(key); }));
+    }));
+}
+Promise.all(tasks.map(function (t) { return t.catch(function () {}); })).then(function () { done(true); });
+"""
+
+# arguments[0] - список пар [тип локатора, значение], возвращает список найденных элементов для каждой пары
+FIND_ELEMENTS_BATCH_SCRIPT = """
+return arguments[0].map(function (locator) {
+    var found = [];
+    try {
+        if (locator[0] === 'xpath') {
+            var snapshot = document.evaluate(locator[1], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                found.push(snapshot.snapshotItem(i));
+            }
+        } else {
+            found = Array.prototype.slice.call(document.querySelectorAll(locator[1]));
+        }
+    } catch (e) {
+        return [];
+    }
+    return found.filter(function (node) { return node.nodeType === Node.ELEMENT_NODE; });
+});
+"""
+
+# асинхронный скрипт (execute_async_script): ждет выполнения условия arguments[0] с параметрами arguments[1]
+# не дольше arguments[2] мс. Условие проверяется сразу, затем на каждое изменение DOM (MutationObserver)
+# и дополнительно раз в 100 мс (видимость может меняться без изменений DOM, например, через css-анимацию)
+WAIT_CONDITION_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var kind = arguments[0], args = arguments[1], timeout = arguments[2];
+
+function isVisible(el) {
+    if (!el || !el.isConnected) { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') { return false; }
+    return el.getClientRects().length > 0;
+}
+
+var conditions = {
+    visible_one_of: function (elements) {
+        for (var i = 0; i < elements.length; i++) {
+            if (isVisible(elements[i])) { return i; }
+        }
+        return null;
+    },
+    class_absent: function (className) {
+        var elements = document.getElementsByClassName(className);
+        for (var i = 0; i < elements.length; i++) {
+            if (isVisible(elements[i])) { return null; }
+        }
+        return true;
+    },
+    options_loaded: function (container, xpath) {
+        var option = document.evaluate(xpath, container, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+            .singleNodeValue;
+        if (!option) { return null; }
+        var text = (option.textContent || '').toLowerCase();
+        if (text.indexOf('load') !== -1 || text.indexOf('not found') !== -1) { return null; }
+        return true;
+    }
+};
+
+function check() {
+    try {
+        return conditions[kind].apply(null, args);
+    } catch (e) {
+        return null;
+    }
+}
+
+var result = check();
+if (result !== null) {
+    done({ok: true, value: result});
+    return;
+}
+
+var finished = false, observer, interval, timer;
+function finish(ok, value) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done({ok: ok, value: value});
+}
+function onChange() {
+    var value = check();
+    if (value !== null) { finish(true, value); }
+}
+observer = new MutationObserver(onChange);
+observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+interval = setInterval(onChange, 100);
+timer = setTimeout(function () { finish(false, null); }, timeout);
+"""
+
+# асинхронный скрипт: ждет, пока все ангуляр-приложения страницы станут стабильными (нет незавершенных
+# задач зоны и http-запросов), не дольше arguments[0] мс
+ANGULAR_STABLE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var timeout = arguments[0];
+if (!window.getAllAngularTestabilities) {
+    done({ok: false, angular: false});
+    return;
+}
+var testabilities = window.getAllAngularTestabilities();
+var pending = testabilities.length;
+if (!pending) {
+    done({ok: true, angular: true});
+    return;
+}
+var finished = false;
+var timer = setTimeout(function () {
+    finished = true;
+    done({ok: false, angular: true});
+}, timeout);
+
+function waitStable(testability) {
+    testability.whenStable(function () {
+        if (finished) { return; }
+        if (testability.getPendingRequestCount && testability.getPendingRequestCount() > 0) {
+            setTimeout(function () { waitStable(testability); }, 10);
+            return;
+        }
+        pending -= 1;
+        if (pending === 0) {
+            finished = true;
+            clearTimeout(timer);
+            done({ok: true, angular: true});
+        }
+    });
+}
+testabilities.forEach(waitStable);
+"""
+
+BOOLEAN_ATTRIBUTES = (
+    'allowfullscreen', 'async', 'autofocus', 'autoplay', 'checked', 'compact', 'complete', 'controls', 'declare',
+    'default', 'defaultchecked', 'defaultselected', 'defer', 'disabled', 'ended', 'formnovalidate', 'hidden',
+    'indeterminate', 'iscontenteditable', 'ismap', 'itemscope', 'loop', 'multiple', 'muted', 'nohref', 'noresize',
+    'noshade', 'novalidate', 'nowrap', 'open', 'paused', 'pubdate', 'readonly', 'required', 'reversed', 'scoped',
+    'seamless', 'seeking', 'selected', 'truespeed', 'willvalidate',
+)
+"""булевы атрибуты, для которых get_attribute selenium возвращает 'true' или None"""
+
+# arguments[0] - список элементов или xpath (тогда элемент ищется в документе), arguments[1] - имена свойств,
+# arguments[2] - для xpath вернуть свойства всех найденных элементов, а не первого.
+# Свойства: text, displayed, enabled, selected, tag_name, остальные имена читаются как в get_attribute selenium:
+# для булевых атрибутов - 'true' или null, иначе свойство DOM (а если его нет - атрибут), приведенное к строке
+READ_PROPERTIES_SCRIPT = """
+var targets = arguments[0], names = arguments[1], many = arguments[2];
+var BOOLEAN_ATTRIBUTES = """ + json.dumps(BOOLEAN_ATTRIBUTES) + """;
+var PROPERTY_ALIASES = {'class': 'className', 'readonly': 'readOnly'};
+
+function isVisible(el) {
+    if (!el.isConnected) { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') { return false; }
+    return el.getClientRects().length > 0;
+}
+
+function readOne(el, name) {
+    switch (name) {
+        case 'text': return isVisible(el) ? (el.innerText || '').trim() : '';
+        case 'displayed': return isVisible(el);
+        case 'enabled': return !el.disabled;
+        case 'selected': return !!(el.checked || el.selected);
+        case 'tag_name': return el.tagName.toLowerCase();
+    }
+    var lowerName = name.toLowerCase(), property = PROPERTY_ALIASES[lowerName] || name;
+    if (BOOLEAN_ATTRIBUTES.indexOf(lowerName) !== -1) {
+        return (el.hasAttribute(name) || !!el[property]) ? 'true' : null;
+    }
+    var value = el[property];
+    if (value === undefined || value === null || typeof value === 'object' || typeof value === 'function') {
+        value = el.getAttribute(name);
+    }
+    return value === undefined || value === null ? null : String(value);
+}
+
+function read(el) {
+    var result = {};
+    names.forEach(function (name) { result[name] = readOne(el, name); });
+    return result;
+}
+
+function find(xpath) {
+    var snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var found = [];
+    for (var i = 0; i < snapshot.snapshotLength; i++) { found.push(snapshot.snapshotItem(i)); }
+    return found;
+}
+
+return targets.map(function (target) {
+    if (typeof target !== 'string') { return read(target); }
+    var found = find(target);
+    if (many) { return found.map(read); }
+    return found.length ? read(found[0]) : null;
+});
+"""
@@ -0,0 +1,64 @@
+"""
+Очистка состояния сессии браузера: вкладки, cookie и localStorage.
+Используется методами страницы (AbstractBasePage) и мягким сбросом сессии в пуле (SessionPool.soft_reset)
+"""
+import re
+from typing import Dict, List, Optional, Set
+
+from selenium.common.exceptions import NoSuchCookieException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def close_tabs(driver: WebDriver, tabs: List[str]) -> None:
+    for handle in tabs:
+        driver.switch_to.window(handle)
+        driver.close()
+
+
+def focus_on_first_opened_tab(driver: WebDriver) -> bool:
+    """
+    Закрывает все вкладки, кроме первой, и переводит на нее фокус драйвера
+    :param driver:
+    :return: True, если были закрыты вкладки
+    """
+    all_tabs: List = list(driver.window_handles)
+    if len(all_tabs) <= 1:
+        return False
+    tab_to_focus = all_tabs.pop(0)
+    close_tabs(driver, all_tabs)
+    driver.switch_to.window(tab_to_focus)
+    return True
+
+
+def delete_cookies(driver: WebDriver, filter_value: Optional[str] = None, cookie_key: str = 'name') -> None:
+    """
+    Clear cookies in current browser session
+    :param driver:
+    :param filter_value: clear all browser cookies for current domain if it not passed. Value support regex
+    :param cookie_key: key of cookie to clear. Name of cookie by default
+    :return:
+    """
+    if filter_value is None:
+        driver.delete_all_cookies()
+    else:
+        cookies: Set[Dict] = driver.get_cookies()
+        for item in cookies:
+            try:
+                cookie_value = item[cookie_key]
+            except KeyError:
+                raise NoSuchCookieException(f'Not found cookie by (value, key) = ({filter_value}, {cookie_key})')
+            if re.search(filter_value, cookie_value, flags=re.IGNORECASE):
+                driver.delete_cookie(name=item['name'])
+
+
+def delete_local_storage(driver: WebDriver, key: Optional[str] = None) -> None:
+    """
+    Clear local storage in current browser session
+    :param driver:
+    :param key: clear all browser local storage if it not passed. Value support regex
+    :return:
+    """
+    if key:
+        driver.execute_script("window.localStorage.removeItem(arguments[0]);", key)
+    else:
+        driver.execute_script("window.localStorage.clear();")
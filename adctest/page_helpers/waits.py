@@ -0,0 +1,114 @@
+"""
+Ожидания на стороне браузера: условие проверяется в странице при каждом изменении DOM (MutationObserver),
+а результат возвращается за один запрос к драйверу вместо периодического опроса.
+Включаются флагом конфига EVENT_DRIVEN_WAITS
+"""
+import logging
+from typing import Any, List, Optional
+
+from adctest.config import config
+from adctest.helpers.locators import locator_to_xpath
+from adctest.instrumentation import instrument
+from adctest.page_helpers.scripts import WAIT_CONDITION_SCRIPT, ANGULAR_STABLE_SCRIPT
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+logger = logging.getLogger('e2e-test')
+
+SCRIPT_TIMEOUT_MARGIN = 5
+"""запас (в секундах) таймаута асинхронного скрипта в драйвере относительно таймаута ожидания"""
+
+
+class WaitKind:
+    visible_one_of = 'visible_one_of'
+    class_absent = 'class_absent'
+    options_loaded = 'options_loaded'
+
+
+def _set_script_timeout(driver: WebDriver, timeout: float) -> None:
+    """
+    Драйвер прерывает асинхронный скрипт по своему таймауту, поэтому он должен быть больше таймаута ожидания.
+    Таймаут выставляется только если текущего не хватает, чтобы не делать лишний запрос на каждое ожидание
+    :param driver:
+    :param timeout:
+    :return:
+    """
+    required = timeout + SCRIPT_TIMEOUT_MARGIN
+    if getattr(driver, '_e2e_script_timeout', 0) < required:
+        driver.set_script_timeout(required)
+        driver._e2e_script_timeout = required
+
+
+@instrument()
+def wait_for(driver: WebDriver, kind: str, args: List, timeout: Optional[float] = None) -> Any:
+    """
+    Ждет выполнения условия kind в браузере
+    :param driver:
+    :param kind: одно из значений WaitKind
+    :param args: аргументы условия (элементы передаются как WebElement)
+    :param timeout: максимальное время ожидания в секундах
+    :return: значение, которое вернуло условие
+    """
+    timeout = timeout or config.WEB_DRIVER_WAIT
+    _set_script_timeout(driver, timeout)
+    result = driver.execute_async_script(WAIT_CONDITION_SCRIPT, kind, args, int(timeout * 1000))
+    if not result or not result.get('ok'):
+        raise TimeoutException(f'Condition "{kind}" was not met in {timeout} seconds')
+    return result.get('value')
+
+
+def wait_visibility_one_of(driver: WebDriver, elements: List[WebElement],
+                           timeout: Optional[float] = None) -> WebElement:
+    """
+    Ждет, пока один из элементов станет видимым, и возвращает его
+    :param driver:
+    :param elements:
+    :param timeout:
+    :return:
+    """
+    index = wait_for(driver, WaitKind.visible_one_of, [elements], timeout)
+    return elements[index]
+
+
+def wait_css_class_absent(driver: WebDriver, css_class: str, timeout: Optional[float] = None) -> None:
+    """
+    Ждет, пока на странице не останется видимых элементов с css-классом (например, лоадеров)
+    :param driver:
+    :param css_class:
+    :param timeout:
+    :return:
+    """
+    wait_for(driver, WaitKind.class_absent, [css_class], timeout)
+
+
+def wait_options_loaded(driver: WebDriver, container: WebElement, by: str, value: str,
+                        timeout: Optional[float] = None) -> None:
+    """
+    Ждет, пока в выпадающем списке появятся опции, отличные от "loading"/"not found"
+    :param driver:
+    :param container:
+    :param by: тип локатора опций (ищутся относительно container, как в container.find_elements)
+    :param value: значение локатора опций
+    :param timeout:
+    :return:
+    """
+    wait_for(driver, WaitKind.options_loaded, [container, locator_to_xpath(by, value)], timeout)
+
+
+@instrument()
+def wait_angular_stable(driver: WebDriver, timeout: Optional[float] = None) -> bool:
+    """
+    Ждет, пока ангуляр-приложение станет стабильным (Testability.whenStable и нет незавершенных http-запросов)
+    :param driver:
+    :param timeout: максимальное время ожидания в секундах
+    :return: False, если на странице нет ангуляра (getAllAngularTestabilities) и ждать нечего
+    """
+    timeout = timeout or config.WEB_DRIVER_WAIT
+    _set_script_timeout(driver, timeout)
+    result = driver.execute_async_script(ANGULAR_STABLE_SCRIPT, int(timeout * 1000)) or {}
+    if not result.get('angular'):
+        return False
+    if not result.get('ok'):
+        raise TimeoutException(f'Angular application is not stable after {timeout} seconds')
+    return True
@@ -1,5 +1,7 @@
-from adctest.pages.base_attributes import ElementDescriptor, WebElementProxy, ListOfElementDescriptor
+from adctest.pages.base_attributes import ElementDescriptor, WebElementProxy, ListOfElementDescriptor, \
+    read_elements
 from adctest.pages.base_navigation import BaseNavigation, BaseNavigationMeta
 # noinspection PyUnresolvedReferences
 from adctest.pages.base import By, PageConfig, BasePage, BasePageMeta
+from adctest.pages.snapshot import PageSnapshot, SnapshotElement
 from adctest.pages.base_landing import BaseLandingPage
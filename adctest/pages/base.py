@@ -1,15 +1,20 @@
 from abc import ABCMeta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import urljoin
 from dataclasses import dataclass
 
 from adctest.config import config
-from adctest.page_helpers.scripts import PAGE_READY_SCRIPT, check_js_condition_is_true
+from adctest.page_helpers.waits import wait_css_class_absent, wait_angular_stable
+from adctest.page_helpers.scripts import PAGE_READY_SCRIPT, FIND_ELEMENTS_BATCH_SCRIPT, PAGE_HTML_SCRIPT, \
+    check_js_condition_is_true
 from adctest.helpers.exceptions import BasePageException, PageNotOpened
+from adctest.instrumentation import instrument
 from adctest.helpers.utils import get_parents_classes_attrs, get_base_url, add_url_params, get_id_from_url, \
     split_url_and_params
+from adctest.pages import ElementDescriptor, WebElementProxy
 from adctest.pages.base_abstract import AbstractBasePage
 from adctest.pages.base_navigation import BaseNavigation
+from adctest.pages.snapshot import PageSnapshot
 from adctest.pages.uicomponents import Toast, ConfirmDialog
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
@@ -17,6 +22,16 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 
 
+CSS_LOCATORS_TEMPLATES = {
+    By.CSS_SELECTOR: '{}',
+    By.ID: '[id="{}"]',
+    By.NAME: '[name="{}"]',
+    By.CLASS_NAME: '.{}',
+    By.TAG_NAME: '{}',
+}
+"""шаблоны для перевода локаторов selenium в css-селекторы (так же их переводит сам selenium)"""
+
+
 @dataclass
 class PageConfig:
     base_url: str
@@ -37,6 +52,11 @@ class PageConfig:
     """
     has_page_ready_script: bool = False
     """нужно ли проверять e2eReady атрибут после загрузки страницы селениумом, кстанавливается мета-классом"""
+    use_angular_testability: bool = False
+    """
+    ждать стабильности ангуляр-приложения (Testability.whenStable) вместо опроса лоадеров.
+    Если на странице нет ангуляра, то используются обычные ожидания
+    """
 
 
 class BasePageMeta(ABCMeta):
@@ -158,32 +178,132 @@ class BasePage(AbstractBasePage):
                 return
         raise PageNotOpened(f'Get attr of {type(self).__name__}, but current url: {self.opened_url}')
 
+    @instrument()
     def wait_page_loaded(self) -> None:
+        if self.page_conf.use_angular_testability:
+            try:
+                wait_angular_stable(self.driver)
+            except TimeoutException:
+                raise BasePageException('Angular testability did not become stable on the current page.')
         try:
             if self.page_conf.has_page_ready_script:
                 self.wait.until(check_js_condition_is_true(PAGE_READY_SCRIPT))
         except TimeoutException:
             raise BasePageException('Check that "e2eReady" attribute set by frontend on the current page.')
 
+    @instrument()
+    def wait_loaders_hidden(self) -> None:
+        if self.page_conf.use_angular_testability and wait_angular_stable(self.driver):
+            return
+        super().wait_loaders_hidden()
+
+    @instrument()
     def wait_loader_not_visible(self) -> None:
         if self.page_conf.page_loader_css_class:
-            self.wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, self.page_conf.page_loader_css_class)))
+            self._wait_css_class_not_visible(self.page_conf.page_loader_css_class)
 
+    @instrument()
     def wait_tableloader_not_visible(self) -> None:
         if self.page_conf.table_loader_css_class:
-            self.wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, self.page_conf.table_loader_css_class)))
+            self._wait_css_class_not_visible(self.page_conf.table_loader_css_class)
 
+    def _wait_css_class_not_visible(self, css_class: str) -> None:
+        if config.EVENT_DRIVEN_WAITS:
+            wait_css_class_absent(self.driver, css_class)
+        else:
+            self.wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, css_class)))
+
+    @instrument()
     def wait_dialog_is_visible(self) -> None:
         attr_name = 'role'
         attr_value = 'dialog'
         search_pattern = (By.XPATH, f'//*[@{attr_name}="{attr_value}"]')
         self.wait.until(EC.visibility_of_element_located(search_pattern))
 
+    @instrument()
     def wait_modal_is_visible(self):
         if self.page_conf.modal_visible_css_class:
             locator = (By.XPATH, f'//*[@class="{self.page_conf.modal_visible_css_class}"]')
             self.wait.until(EC.visibility_of_element_located(locator))
 
+    @instrument()
+    def prefetch(self, *names: str) -> None:
+        """
+        Ищет элементы нескольких дескрипторов страницы за один запрос к браузеру и кладет их в кэш страницы,
+        чтобы последующие обращения к этим атрибутам не делали отдельный find_element.
+        Элементы, которые не удалось найти (или с локаторами по тексту ссылки), в кэш не попадают
+        и будут искаться как обычно при обращении
+        :param names: имена атрибутов-дескрипторов, если не переданы, то загружаются все дескрипторы страницы
+        :return:
+        """
+        self.check_opened()
+        descriptors = []
+        locators = []
+        for name, descriptor in self._get_descriptors_to_prefetch(names):
+            locator = self._make_batch_locator(descriptor)
+            if locator:
+                descriptors.append((name, descriptor))
+                locators.append(locator)
+        if not locators:
+            return
+
+        found: List[List[WebElement]] = self.driver.execute_script(FIND_ELEMENTS_BATCH_SCRIPT, locators)
+        for (name, descriptor), elements in zip(descriptors, found):
+            if not elements:
+                continue
+            proxies = [
+                WebElementProxy(page=self, by=descriptor.search_by, value=descriptor.value,
+                                target_object=element, attr_name=name)
+                for element in (elements if descriptor.many else elements[:1])
+            ]
+            self._cached_attrs[name] = proxies if descriptor.many else proxies[0]
+
+    @instrument()
+    def snapshot(self) -> PageSnapshot:
+        """
+        Снимок страницы для проверок без запросов к браузеру: html документа забирается одним запросом,
+        а дескрипторы страницы (ElementDescriptor, ListOfElementDescriptor) ищутся в нем через lxml.
+        Снимок не обновляется, после действий на странице нужно сделать новый
+        :return:
+        """
+        self.check_opened()
+        page_html = self.driver.execute_script(PAGE_HTML_SCRIPT)
+        return PageSnapshot(self, page_html)
+
+    def _get_descriptors_to_prefetch(self, names: Tuple[str, ...]) -> List[Tuple[str, ElementDescriptor]]:
+        """
+        Возвращает пары (имя, дескриптор), элементы которых еще не закешированы
+        :param names:
+        :return:
+        """
+        all_descriptors = {}
+        for klass in reversed(type(self).__mro__):
+            all_descriptors.update(
+                (name, value) for name, value in klass.__dict__.items() if isinstance(value, ElementDescriptor)
+            )
+        # дескрипторы, созданные ListOfElementDescriptor, хранятся в самом объекте страницы
+        all_descriptors.update(
+            (name, value) for name, value in self.__dict__.items() if isinstance(value, ElementDescriptor)
+        )
+
+        if names:
+            unknown = [name for name in names if name not in all_descriptors]
+            if unknown:
+                raise BasePageException(f'{type(self).__name__} has no element descriptors: {unknown}')
+        else:
+            names = all_descriptors.keys()
+
+        return [(name, all_descriptors[name]) for name in names if self._cached_attrs.get(name) is None]
+
+    @classmethod
+    def _make_batch_locator(cls, descriptor: ElementDescriptor) -> Optional[List[str]]:
+        if descriptor.search_by == By.XPATH:
+            return [By.XPATH, descriptor.value]
+        template = CSS_LOCATORS_TEMPLATES.get(descriptor.search_by)
+        if template is None:
+            return None
+        return [By.CSS_SELECTOR, template.format(descriptor.value)]
+
     def find_element_by_data_e2e(self, value: str):
         """
         Публичный интерфейс для поиска элемента по атрибуту data-e2e.
@@ -203,6 +323,7 @@ class BasePage(AbstractBasePage):
         self.check_opened()
         return get_id_from_url(self.opened_url)
 
+    @instrument()
     def wait_and_get_toast(self) -> Toast:
         """
         Дожидается открытия toast на странице и возвращается его
@@ -3,20 +3,22 @@
 которые будут вызываться в WebElementProxy, ElementDescriptor и прочих классах,
 описывающих объекты, размещеные на странице
 """
-import re
 import time
 from abc import ABCMeta, abstractmethod
 from enum import Enum
-from typing import List, Dict, Union, Optional, Set
+from typing import List, Dict, Union, Optional
 
 from adctest.config import config
 from adctest.driver.driver import E2EDriver
 from adctest.page_helpers.scripts import SCROLL_TEMPLATE_SCRIPT
+from adctest.page_helpers.session import close_tabs, focus_on_first_opened_tab, delete_cookies, delete_local_storage
+from adctest.page_helpers.waits import wait_visibility_one_of
 from adctest.helpers.exceptions import BasePageException
 from adctest.helpers.utils import get_param_from_url
+from adctest.instrumentation import instrument
 from adctest.pages import WebElementProxy, ElementDescriptor
 from adctest.pages.uicomponents import Table
-from selenium.common.exceptions import ElementNotVisibleException, NoSuchElementException, NoSuchCookieException
+from selenium.common.exceptions import ElementNotVisibleException, NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
@@ -48,6 +50,7 @@ class AbstractBasePage(metaclass=ABCMeta):
     def open(self, *args, **kwargs):
         ...
 
+    @instrument()
     def _open(self, url: str):
         # очищаем закешированные элементы при каждом обновлении страницы
         self._cached_attrs = {}
@@ -91,14 +94,13 @@ class AbstractBasePage(metaclass=ABCMeta):
     def wait_tableloader_not_visible(self):
         ...
 
+    @instrument()
     def wait_loaders_hidden(self):
         self.wait_loader_not_visible()
         self.wait_tableloader_not_visible()
 
     def _close_tabs(self, tabs: List[str]):
-        for handle in tabs:
-            self.driver.switch_to.window(handle)
-            self.driver.close()
+        close_tabs(self.driver, tabs)
 
     def focus_on_last_opened_tab(self):
         """
@@ -121,12 +123,8 @@ class AbstractBasePage(metaclass=ABCMeta):
         кроме первой
         :return:
         """
-        if len(self.driver.window_handles) > 1:
+        if focus_on_first_opened_tab(self.driver):
             self._cached_attrs = {}
-            all_tabs: List = self.driver.window_handles
-            tab_to_focus = all_tabs.pop(0)
-            self._close_tabs(all_tabs)
-            self.driver.switch_to.window(tab_to_focus)
 
     @property
     def wait(self) -> WebDriverWait:
@@ -236,6 +234,7 @@ class AbstractBasePage(metaclass=ABCMeta):
         self.driver.execute_script(script, element)
 
     @classmethod
+    @instrument()
     def wait_visibility_one_of_elements(cls, elements: List[Union[WebElementProxy, WebElement]],
                                         timeout: Optional[int] = None,
                                         ticks: Optional[float] = 0.5) -> Union[WebElementProxy, WebElement]:
@@ -249,6 +248,12 @@ class AbstractBasePage(metaclass=ABCMeta):
         if not elements:
             raise NoSuchElementException('Nothing to wait. At least one element must be passed')
         timeout = timeout or config.WEB_DRIVER_WAIT
+        if config.EVENT_DRIVEN_WAITS:
+            try:
+                return wait_visibility_one_of(elements[0].parent, elements, timeout)
+            except TimeoutException:
+                raise ElementNotVisibleException('Could not wait for the visibility of any of transmitted elements')
+
         run_time = timeout
 
         while run_time > 0:
@@ -266,17 +271,7 @@ class AbstractBasePage(metaclass=ABCMeta):
         :param cookie_key: key of cookie to clear. Name of cookie by default
         :return:
         """
-        if filter_value is None:
-            self.driver.delete_all_cookies()
-        else:
-            cookies: Set[Dict] = self.driver.get_cookies()
-            for item in cookies:
-                try:
-                    cookie_value = item[cookie_key]
-                except KeyError:
-                    raise NoSuchCookieException(f'Not found cookie by (value, key) = ({filter_value}, {cookie_key})')
-                if re.search(filter_value, cookie_value, flags=re.IGNORECASE):
-                    self.driver.delete_cookie(name=item['name'])
+        delete_cookies(self.driver, filter_value=filter_value, cookie_key=cookie_key)
 
     def delete_local_storage(self, key: Optional[str] = None) -> None:
         """
@@ -284,11 +279,9 @@ class AbstractBasePage(metaclass=ABCMeta):
         :param key: clear all browser local storage if it not passed. Value support regex
         :return:
         """
-        if key:
-            self.driver.execute_script("window.localStorage.removeItem(arguments[0]);", key)
-        else:
-            self.driver.execute_script("window.localStorage.clear();")
+        delete_local_storage(self.driver, key=key)
 
+    @instrument()
     def wait_accessibility_of(self, element_descriptor: Union[ElementDescriptor, WebElementProxy, Table],
                               timeout: int = None, frequency: float = 0.2) -> None:
         """
@@ -2,12 +2,16 @@
 В данном модуле при обращении к атрибутам объектов page можно использовать только методы и атрибуты,
 описанные в AbstractBasePage
 """
-from functools import wraps
+from functools import lru_cache, wraps
 from inspect import ismethod
-from typing import Tuple, List, Set
+from types import MethodType
+from typing import Tuple, List, Dict, Callable, Any, Iterable, Sequence, Union
 
 from adctest.config import config
 from adctest.helpers.exceptions import BasePageException
+from adctest.helpers.locators import Locators
+from adctest.instrumentation import recorder, instrument
+from adctest.page_helpers.scripts import READ_PROPERTIES_SCRIPT
 from selenium.common.exceptions import StaleElementReferenceException, WebDriverException, NoSuchElementException
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
@@ -42,6 +46,8 @@ class WebElementProxy(WebElement):
     """текстовое представление для повторного поиска элемента (необходимо в некоторых методах WebElement)"""
     attr_name: str = None
     """имя атрибута в page, с которым связан этот объект (проставляется только, если объект получен через дескриптор)"""
+    _bound_wrappers: Dict[str, Callable] = None
+    """обертки методов, привязанные к этому объекту (создаются при первом обращении к методу)"""
 
     # noinspection PyMissingConstructor
     def __init__(self, page, by, value, target_object, attr_name=None):
@@ -52,26 +58,35 @@ class WebElementProxy(WebElement):
         object.__setattr__(self, '_obj', target_object)
         object.__setattr__(self, 'locator', (by, value))
         object.__setattr__(self, 'attr_name', attr_name)
+        object.__setattr__(self, '_bound_wrappers', {})
 
     def __getattribute__(self, name: str):
-        if proxy_has_attr(name):
+        # обертка метода создается один раз, дальше берется из словаря без повторного поиска атрибута
+        bound_wrappers = object.__getattribute__(self, '_bound_wrappers')
+        wrapper = bound_wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+
+        own = name in PROXY_ATTRIBUTES
+        if own:
             attr = object.__getattribute__(self, name)
         else:
-            attr = getattr(self._obj, name)
+            attr = getattr(object.__getattribute__(self, '_obj'), name)
 
         if ismethod(attr) and not name.startswith('__'):
-            decorator = catch_not_attach_to_session(self)
-            return decorator(attr)
+            wrapper = MethodType(get_retry_wrapper(name, own, attr.__func__), self)
+            bound_wrappers[name] = wrapper
+            return wrapper
         return attr
 
     def __setattr__(self, name, value):
-        if proxy_has_attr(name):
+        if name in PROXY_ATTRIBUTES:
             object.__setattr__(self, name, value)
             return
         setattr(self._obj, name, value)
 
     def __delattr__(self, name):
-        if proxy_has_attr(name):
+        if name in PROXY_ATTRIBUTES:
             object.__delattr__(self, name)
             return
         return delattr(self._obj, name)
@@ -107,6 +122,17 @@ class WebElementProxy(WebElement):
         self.click(focus_on_opened_tab=focus_on_opened_tab)
         self.page.wait_loaders_hidden()
 
+    def read(self, *props: str) -> Dict[str, Any]:
+        """
+        Читает несколько свойств элемента за один запрос к браузеру (вместо отдельной команды на каждое свойство).
+        Кроме атрибутов и свойств DOM (читаются как в get_attribute: значения - строки, для булевых атрибутов
+        вроде disabled и checked - 'true' или None) поддерживаются text, displayed, enabled, selected и tag_name
+        пример: title.read('text', 'displayed', 'class')
+        :param props: имена свойств
+        :return: словарь {имя свойства: значение}
+        """
+        return read_properties(self.parent, [self._obj], props)[0]
+
     @property
     def page_wait(self):
         """
@@ -132,59 +158,113 @@ class WebElementProxy(WebElement):
             self.page._cached_attrs[self.attr_name] = self
 
 
-def get_subclass_attributes() -> Set[str]:
+PROXY_ATTRIBUTES = frozenset(WebElementProxy.__dict__)
+"""имена атрибутов только прокси-класса WebElementProxy"""
+
+
+@instrument()
+def read_properties(driver, targets: Sequence[Union[WebElement, str]], props: Sequence[str],
+                    many: bool = False) -> List:
     """
-    Небольшой хэлпер, который возвращает имена атрибутов только прокси-класса WebElementProxy
-    :return:
+    Читает свойства нескольких элементов одним execute_script
+    :param driver:
+    :param targets: элементы или xpath, по которым элементы ищутся в браузере в том же запросе
+    :param props: имена свойств (см. WebElementProxy.read)
+    :param many: для xpath читать все найденные элементы, а не только первый
+    :return: для каждого из targets словарь свойств (для xpath - None, если элемент не найден,
+    при many - список словарей)
     """
-    if hasattr(get_subclass_attributes, '__cached_attrs'):
-        return get_subclass_attributes.__cached_attrs
+    if not props:
+        raise BasePageException('At least one property name must be passed')
+    return driver.execute_script(READ_PROPERTIES_SCRIPT, list(targets), list(props), many)
 
-    bases = WebElementProxy.__bases__
-    if len(bases) > 1:
-        raise NotImplemented('It works only with one parent classes')
-    attrs = set(WebElementProxy.__dict__.keys())
-    setattr(get_subclass_attributes, '__cached_attrs', attrs)
-    return attrs
 
-
-def proxy_has_attr(name: str) -> bool:
+def read_elements(elements: List[WebElementProxy], *props: str) -> List[Dict[str, Any]]:
+    """
+    Списочный вариант WebElementProxy.read (например, для дескриптора с many=True): свойства всех элементов
+    читаются за один запрос к браузеру.
+    Если какой-то элемент пропал из сессии, то элементы ищутся заново по локатору и чтение повторяется
+    :param elements:
+    :param props: имена свойств (см. WebElementProxy.read)
+    :return: словари свойств в порядке элементов
     """
-    Аналог hasattrs для WebElementProxy, реализовано вне класса, чтобы не зацикливаться
-    в методе __getattribute__
-    :param name:
+    if not elements:
+        return []
+    driver = elements[0].parent
+    try:
+        return read_properties(driver, [element._obj for element in elements], props)
+    except StaleElementReferenceException:
+        recorder.count_retry()
+        _reload_elements(elements)
+        return read_properties(driver, [element._obj for element in elements], props)
+
+
+def _reload_elements(elements: List[WebElementProxy]) -> None:
+    """
+    Перегружает WebElement в прокси-объектах. Элементы одного локатора (many=True) ищутся одним запросом
+    и заменяются по порядку, остальные перегружаются по одному
+    :param elements:
     :return:
     """
-    if name in get_subclass_attributes():
-        return True
-    return False
-
-
-def catch_not_attach_to_session(current_obj: WebElementProxy):
+    locators = {element.locator for element in elements}
+    if len(elements) == 1 or len(locators) > 1:
+        for element in elements:
+            WebElementProxy._reload_target_object(element)
+        return
+
+    page = elements[0].page
+    attr_name = elements[0].attr_name
+    found = page._find_elements(*elements[0].locator)
+    if len(found) != len(elements):
+        raise StaleElementReferenceException(f'Elements found by {elements[0].locator} changed: '
+                                             f'expected {len(elements)}, found {len(found)}')
+    for element, obj in zip(elements, found):
+        object.__setattr__(element, '_obj', obj)
+    if attr_name and attr_name not in page._cached_attrs:
+        page._cached_attrs[attr_name] = elements
+
+
+@lru_cache(maxsize=None)
+def get_retry_wrapper(name: str, own: bool, method: Callable) -> Callable:
     """
-    декоратор, позволяющий перегрузить инстанс WebElement, если он пропал из сессии брузера.
+    Возвращает функцию, позволяющую перегрузить инстанс WebElement, если он пропал из сессии брузера.
     инстанс WebElement хранится в прокси-объекте WebElementProxy, таким образом мы перегружаем
     только объект селениума, при этом инстанс WebElementProxy остается тот же, что позволяет
-    не пересоздавать заново объекты BasePage
-    :param current_obj:
+    не пересоздавать заново объекты BasePage.
+    Функция одна на каждое имя метода, а метод ищется в момент вызова, поэтому повторный вызов
+    после перезагрузки идет уже в новый объект WebElement
+    :param name: имя метода
+    :param own: метод объявлен в самом WebElementProxy
+    :param method: функция метода класса (из нее берутся имя и докстринг обертки)
     :return:
     """
-    def decorator(function):
-        @wraps(function)
-        def wrapper(*args, **kwargs):
-            try:
-                return function(*args, **kwargs)
-            except StaleElementReferenceException:
-                current_obj._reload_target_object()
-                return function(*args, **kwargs)
-            except NoSuchElementException:
-                raise
-            except WebDriverException as ex:
-                raise WebElementProxyException(str(ex), current_obj.attr_name or 'Object didnt attach to Page')
-
-        return wrapper
-
-    return decorator
+    def resolve(proxy: WebElementProxy):
+        if own:
+            return object.__getattribute__(proxy, name)
+        return getattr(object.__getattribute__(proxy, '_obj'), name)
+
+    def call(proxy: WebElementProxy, *args, **kwargs):
+        try:
+            return resolve(proxy)(*args, **kwargs)
+        except StaleElementReferenceException:
+            recorder.count_retry()
+            WebElementProxy._reload_target_object(proxy)
+            return resolve(proxy)(*args, **kwargs)
+        except NoSuchElementException:
+            raise
+        except WebDriverException as ex:
+            raise WebElementProxyException(str(ex), proxy.attr_name or 'Object didnt attach to Page')
+
+    operation_name = f'WebElementProxy.{name}'
+
+    @wraps(method)
+    def wrapper(proxy: WebElementProxy, *args, **kwargs):
+        if not recorder.enabled:
+            return call(proxy, *args, **kwargs)
+        with recorder.operation(operation_name):
+            return call(proxy, *args, **kwargs)
+
+    return wrapper
 
 
 class ElementDescriptor:
@@ -240,6 +320,7 @@ class ElementDescriptor:
             return object.__getattribute__(self, item)
         raise AttributeError
 
+    @instrument()
     def _search_element(self, page):
         if self.many:
             elements = page._find_elements(self.search_by, self.value)
@@ -288,6 +369,8 @@ class ListOfElementDescriptor:
     page = None
     # пока поддерживает поиск только по xpath
     search_by: str = 'xpath'
+    _name_template: str = None
+    """шаблон полного значения атрибута, в который подставляются номера элементов"""
 
     def __init__(self, base_name_parts: List[str], many: bool = False, tag_attr_name: str = DATA_E2E_ATTRIBUTE_NAME,
                  context=None):
@@ -301,6 +384,8 @@ class ListOfElementDescriptor:
         if not isinstance(base_name_parts, list):
             raise BasePageException('base_name_parts must be list of string')
         self.base_name_parts = [name.strip('_') for name in base_name_parts]
+        self._name_template = '_'.join(f"{part.replace('{', '{{').replace('}', '}}')}_{{}}"
+                                       for part in self.base_name_parts)
         self.many = many
         self.tag_attr_name = tag_attr_name
         self.page = context
@@ -349,7 +434,7 @@ class ListOfElementDescriptor:
         return descriptor
 
     def _print_search_value(self, attr_name: str) -> str:
-        return f'//*[@{self.tag_attr_name}="{attr_name}"]'
+        return Locators.format('//*[@{}="{}"]', self.tag_attr_name, attr_name)
 
     def _make_attr_name(self, args):
         params = list(map(str, args))
@@ -357,11 +442,23 @@ class ListOfElementDescriptor:
             raise BasePageException(f'You pass to get method only {len(params)} params '
                                     f'but required {len(self.base_name_parts)}')
 
-        indexed_names = []
-        for val in zip(self.base_name_parts, params):
-            indexed_names.append('_'.join(val))
+        return Locators.format(self._name_template, *params)
 
-        return '_'.join(indexed_names)
+    def read(self, numbers: Iterable, *props: str) -> List:
+        """
+        Читает свойства элементов с номерами numbers за один запрос к браузеру (элементы ищутся в том же запросе)
+        пример: rows.read(range(1, 11), 'text', 'displayed')
+        :param numbers: номера элементов (для нескольких base_name_parts - кортежи номеров)
+        :param props: имена свойств (см. WebElementProxy.read)
+        :return: для каждого номера словарь свойств или None, если элемента нет на странице
+        (при many=True - список словарей всех найденных элементов)
+        """
+        self.page.check_opened()
+        xpaths = []
+        for number in numbers:
+            attr_name = self._make_attr_name(number if isinstance(number, tuple) else (number,))
+            xpaths.append(self._print_search_value(attr_name))
+        return read_properties(self.page.driver, xpaths, props, many=self.many)
 
     def __get__(self, page, objtype=None):
         self.page = page
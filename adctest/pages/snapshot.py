@@ -0,0 +1,184 @@
+"""
+Снимок страницы: html документа забирается из браузера одним запросом, дальше локаторы дескрипторов страницы
+разрешаются локально через lxml. Подходит для проверок состояния страницы после действия
+(тексты, атрибуты, количество элементов), когда взаимодействовать с элементами не нужно
+"""
+from typing import Any, Dict, FrozenSet, List, Optional, Union
+
+from adctest.helpers import dom
+from adctest.helpers.exceptions import BasePageException
+from adctest.helpers.locators import Locators, locator_to_xpath
+from adctest.pages.base_attributes import ElementDescriptor, ListOfElementDescriptor
+from lxml import etree, html
+from lxml.html import HtmlElement
+from selenium.common.exceptions import NoSuchElementException, InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+
+class SnapshotElement:
+    """
+    Элемент снимка страницы, повторяет читающую часть интерфейса WebElement.
+    Видимость определяется по разметке (атрибут hidden, inline-стили, css-классы из PageSnapshot.hidden_css_classes),
+    стили из css-файлов не учитываются.
+    get_attribute читает атрибуты сериализованного html. Состояние полей формы (value, checked, selected) браузер
+    в атрибуты не записывает, поэтому при снимке оно копируется из свойств DOM в атрибуты копии документа
+    (см. PAGE_HTML_SCRIPT) и соответствует моменту снимка. Остальные свойства DOM, которые приложение меняет
+    без изменения атрибутов, в снимке не видны
+    """
+    node: HtmlElement = None
+    """элемент дерева lxml"""
+
+    def __init__(self, snapshot: 'PageSnapshot', node: HtmlElement):
+        self.snapshot = snapshot
+        self.node = node
+
+    def __repr__(self):
+        return f'<SnapshotElement {self.tag_name} {dict(self.node.attrib)}>'
+
+    @property
+    def tag_name(self) -> str:
+        return self.node.tag
+
+    @property
+    def text(self) -> str:
+        """
+        Видимый текст элемента (как и у WebElement, для скрытого элемента - пустая строка)
+        :return:
+        """
+        if not self.is_displayed():
+            return ''
+        return dom.visible_text(self.node)
+
+    @property
+    def text_content(self) -> str:
+        """
+        Текст элемента без учета видимости
+        :return:
+        """
+        return self.node.text_content()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return dom.read_property(self.node, name)
+
+    def is_displayed(self) -> bool:
+        return dom.is_displayed(self.node, self.snapshot.hidden_css_classes)
+
+    def is_enabled(self) -> bool:
+        return dom.is_enabled(self.node)
+
+    def is_selected(self) -> bool:
+        return dom.is_selected(self.node)
+
+    def read(self, *props: str) -> Dict[str, Any]:
+        """
+        То же, что WebElementProxy.read, но без запроса к браузеру
+        :param props: имена свойств
+        :return:
+        """
+        special = {
+            'text': lambda: self.text,
+            'displayed': self.is_displayed,
+            'enabled': self.is_enabled,
+            'selected': self.is_selected,
+            'tag_name': lambda: self.tag_name,
+        }
+        return {name: special[name]() if name in special else self.get_attribute(name) for name in props}
+
+    def find_element(self, by: str = By.ID, value: str = None) -> 'SnapshotElement':
+        return self.snapshot._find_one(self.node, by, value)
+
+    def find_elements(self, by: str = By.ID, value: str = None) -> List['SnapshotElement']:
+        return self.snapshot._find_all(self.node, by, value)
+
+
+class SnapshotList:
+    """
+    ListOfElementDescriptor в снимке страницы
+    """
+    def __init__(self, snapshot: 'PageSnapshot', descriptor: ListOfElementDescriptor):
+        self.snapshot = snapshot
+        self.descriptor = descriptor
+
+    def get(self, *numbers) -> Union[SnapshotElement, List[SnapshotElement]]:
+        xpath = self.descriptor._print_search_value(self.descriptor._make_attr_name(numbers))
+        if self.descriptor.many:
+            return self.snapshot._find_all(self.snapshot.root, By.XPATH, xpath)
+        return self.snapshot._find_one(self.snapshot.root, By.XPATH, xpath)
+
+    def __getitem__(self, item: int) -> Union[SnapshotElement, List[SnapshotElement]]:
+        if not isinstance(item, int):
+            raise BasePageException('ListOfElementDescriptor support only number access to attributes')
+        return self.get(item)
+
+
+class PageSnapshot:
+    """
+    Неизменяемый снимок страницы. Атрибуты-дескрипторы страницы доступны под теми же именами:
+    snapshot = page.snapshot()
+    assert snapshot.title.text == 'Campaigns'
+    assert len(snapshot.rows) == 10
+    ElementDescriptor возвращает SnapshotElement (при many=True - список, в т.ч. пустой),
+    ListOfElementDescriptor - SnapshotList с тем же интерфейсом get(*numbers)
+    """
+    hidden_css_classes: FrozenSet[str] = frozenset(['ng-hide', 'd-none'])
+    """css-классы, которые скрывают элемент (учитываются в is_displayed и text)"""
+
+    def __init__(self, page, page_html: str):
+        """
+        :param page: страница, дескрипторы которой разрешаются в снимке
+        :param page_html: outerHTML документа
+        """
+        self.page = page
+        self.root: HtmlElement = html.document_fromstring(page_html)
+
+    def __repr__(self):
+        return f'<PageSnapshot {type(self.page).__name__}>'
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        descriptor = self._get_descriptor(name)
+        if isinstance(descriptor, ListOfElementDescriptor):
+            return SnapshotList(self, descriptor)
+        if descriptor.many:
+            return self._find_all(self.root, descriptor.search_by, descriptor.value)
+        return self._find_one(self.root, descriptor.search_by, descriptor.value)
+
+    def _get_descriptor(self, name: str) -> Union[ElementDescriptor, ListOfElementDescriptor]:
+        # дескрипторы, созданные ListOfElementDescriptor, хранятся в самом объекте страницы
+        descriptor = self.page.__dict__.get(name)
+        if descriptor is None:
+            for klass in type(self.page).__mro__:
+                if name in klass.__dict__:
+                    descriptor = klass.__dict__[name]
+                    break
+        if not isinstance(descriptor, (ElementDescriptor, ListOfElementDescriptor)):
+            raise AttributeError(f'{type(self.page).__name__} has no element descriptor "{name}"')
+        return descriptor
+
+    def _xpath(self, context: HtmlElement, by: str, value: str) -> List[HtmlElement]:
+        xpath = locator_to_xpath(by, value)
+        try:
+            found = Locators.evaluate(context, xpath)
+        except etree.XPathError as e:
+            raise InvalidSelectorException(f'Invalid xpath "{xpath}": {e}')
+        return [node for node in found if isinstance(node, HtmlElement)]
+
+    def _find_one(self, context: HtmlElement, by: str, value: str) -> SnapshotElement:
+        found = self._xpath(context, by, value)
+        if not found:
+            raise NoSuchElementException(f'Element not found in page snapshot by {by} value: "{value}"')
+        return SnapshotElement(self, found[0])
+
+    def _find_all(self, context: HtmlElement, by: str, value: str) -> List[SnapshotElement]:
+        return [SnapshotElement(self, node) for node in self._xpath(context, by, value)]
+
+    def find_element(self, by: str = By.ID, value: str = None) -> SnapshotElement:
+        return self._find_one(self.root, by, value)
+
+    def find_elements(self, by: str = By.ID, value: str = None) -> List[SnapshotElement]:
+        return self._find_all(self.root, by, value)
+
+    def count(self, by: str = By.ID, value: str = None) -> int:
+        return len(self._xpath(self.root, by, value))
+
@@ -0,0 +1,181 @@
+"""
+Типизированные колонки таблиц на numpy (опциональная зависимость: pip install adctest[numpy]).
+Значения ячеек конвертируются один раз, а проверки (сортировка, сумма, фильтрация строк)
+выполняются над массивами целиком
+"""
+import math
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from adctest.helpers.exceptions import BaseTableException
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NULL_VALUES = ('', '-', '—', 'N/A')
+"""значения ячеек, которые считаются пустыми"""
+
+
+def _require_numpy():
+    if np is None:
+        raise BaseTableException('numpy is required for typed columns: pip install adctest[numpy]')
+
+
+class ColumnConverter:
+    """
+    Базовый конвертер значений ячеек колонки в элементы массива numpy
+    """
+    dtype = object
+    """тип массива numpy"""
+    null_values: Tuple[str, ...] = NULL_VALUES
+
+    @property
+    def null(self) -> Any:
+        """значение для пустых ячеек"""
+        return None
+
+    def convert(self, value: str) -> Any:
+        return value
+
+    def __call__(self, value: Optional[str]) -> Any:
+        if value is None:
+            return self.null
+        value = value.strip()
+        if value in self.null_values:
+            return self.null
+        try:
+            return self.convert(value)
+        except ValueError:
+            raise BaseTableException(f'Cannot convert cell value "{value}" by {type(self).__name__}')
+
+    def to_array(self, values: Iterable[Optional[str]]) -> 'np.ndarray':
+        _require_numpy()
+        return np.array([self(value) for value in values], dtype=self.dtype)
+
+
+class TextColumn(ColumnConverter):
+    """Текст без преобразований, пустые ячейки - None"""
+
+
+class NumberColumn(ColumnConverter):
+    """
+    Числа с разделителями разрядов (1 234,5, 1.234,5 или 1,234.5), пустые ячейки - nan
+    """
+    dtype = 'float64'
+
+    def __init__(self, decimal_separator: str = '.', thousands_separators: str = ' \xa0\u202f,.\'',
+                 strip_chars: str = '%$€₽'):
+        """
+        :param decimal_separator: разделитель дробной части
+        :param thousands_separators: символы-разделители разрядов (разделитель дробной части из них исключается,
+        т.е. по умолчанию при decimal_separator=',' точка считается разделителем разрядов, и наоборот)
+        :param strip_chars: символы, которые удаляются из значения (проценты, валюты)
+        """
+        self.decimal_separator = decimal_separator
+        removed = (thousands_separators + strip_chars).replace(decimal_separator, '')
+        self._table = str.maketrans({char: None for char in removed})
+
+    @property
+    def null(self) -> float:
+        return math.nan
+
+    def convert(self, value: str) -> float:
+        value = value.translate(self._table)
+        if self.decimal_separator != '.':
+            value = value.replace(self.decimal_separator, '.')
+        return float(value)
+
+
+class DateColumn(ColumnConverter):
+    """
+    Даты/время в формате fmt (strptime), пустые ячейки - NaT
+    """
+    dtype = 'datetime64[s]'
+
+    def __init__(self, fmt: str = '%d.%m.%Y'):
+        self.fmt = fmt
+
+    @property
+    def null(self) -> Any:
+        return np.datetime64('NaT')
+
+    def convert(self, value: str) -> datetime:
+        return datetime.strptime(value, self.fmt)
+
+
+class TypedColumns:
+    """
+    Колонки таблицы в виде массивов numpy одинаковой длины (по числу строк).
+    Ключами являются объекты Column таблицы
+    """
+
+    def __init__(self, columns: Dict[Hashable, 'np.ndarray'], footer: Optional[Dict[Hashable, Any]] = None):
+        """
+        :param columns: колонка -> массив значений
+        :param footer: колонка -> сконвертированное значение из строки tfoot
+        """
+        _require_numpy()
+        self.columns = columns
+        self.footer = footer or {}
+
+    def __getitem__(self, column: Hashable) -> 'np.ndarray':
+        try:
+            return self.columns[column]
+        except KeyError:
+            raise BaseTableException(f'{column} was not extracted to typed columns')
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @classmethod
+    def _not_null(cls, values: 'np.ndarray') -> 'np.ndarray':
+        if values.dtype.kind == 'f':
+            return values[~np.isnan(values)]
+        if values.dtype.kind == 'M':
+            return values[~np.isnat(values)]
+        return values[values != None]  # noqa: E711 (поэлементное сравнение numpy)
+
+    def is_sorted(self, column: Hashable, descending: bool = False, strict: bool = False) -> bool:
+        """
+        Проверяет, что непустые значения колонки отсортированы
+        :param column:
+        :param descending: по убыванию
+        :param strict: соседние значения не могут быть равны
+        :return:
+        """
+        values = self._not_null(self[column])
+        if descending:
+            values = values[::-1]
+        left, right = values[:-1], values[1:]
+        return bool(np.all(left < right) if strict else np.all(left <= right))
+
+    def sum(self, column: Hashable) -> float:
+        """
+        Сумма непустых значений числовой колонки
+        :param column:
+        :return:
+        """
+        return float(np.nansum(self[column]))
+
+    def sum_equals_footer(self, column: Hashable, abs_tol: float = 0.01) -> bool:
+        """
+        Проверяет, что сумма значений колонки совпадает со значением в строке итогов (tfoot)
+        :param column:
+        :param abs_tol: допустимая погрешность (значения в таблице обычно округлены)
+        :return:
+        """
+        if column not in self.footer:
+            raise BaseTableException(f'Footer value for {column} not found')
+        return math.isclose(self.sum(column), self.footer[column], abs_tol=abs_tol)
+
+    def rows_matching(self, predicate: Callable[['TypedColumns'], 'np.ndarray']) -> 'np.ndarray':
+        """
+        Возвращает номера строк (нумерация с 1), для которых выполняется условие.
+        Пример: columns.rows_matching(lambda c: c[table.amount] > 100)
+        :param predicate: функция, возвращающая булев массив по колонкам
+        :return:
+        """
+        mask = np.asarray(predicate(self), dtype=bool)
+        return np.flatnonzero(mask) + 1
@@ -1,6 +1,7 @@
 from collections import defaultdict
-from typing import Set, List, Optional
+from typing import Set, List, Optional, Tuple, Union
 
+from adctest.helpers.locators import Locators, has_class_condition
 from lxml import html
 from lxml.html import HtmlElement
 
@@ -85,6 +86,56 @@ def parse_table_cell(row: str) -> Optional[str]:
     return cell.text.strip() if cell.text else None
 
 
+def _parse_rows(obj: HtmlElement, xpath: str) -> List[List[Optional[str]]]:
+    res = []
+    for row in Locators.evaluate(obj, xpath):
+        # как и в parse_table_row, берутся все ячейки строки (в т.ч. th заголовка строки),
+        # чтобы индексы колонок совпадали с индексами заголовков
+        res.append([cell.text.strip() if cell.text else None for cell in row.iterchildren('td', 'th')])
+    return res
+
+
+def parse_table_body(table: str) -> List[List[Optional[str]]]:
+    """
+    Парсит таблицу целиком (outerHTML) и возвращает значения ячеек (td и th) всех строк,
+    в которых есть ячейки td (строки заголовка только с th и строки tfoot не попадают)
+    :param table:
+    :return:
+    """
+    return parse_table_body_and_footer(table)[0]
+
+
+def parse_table_body_and_footer(table: Union[str, HtmlElement]) -> Tuple[List[List[Optional[str]]],
+                                                                         List[List[Optional[str]]]]:
+    """
+    Парсит таблицу целиком (outerHTML) и возвращает отдельно значения строк тела и строк tfoot
+    :param table: outerHTML таблицы или уже распарсенный элемент
+    :return: (строки тела, строки tfoot)
+    """
+    obj: HtmlElement = get_html_from_string(table) if isinstance(table, str) else table
+    return _parse_rows(obj, './/tr[td][not(ancestor::tfoot)]'), _parse_rows(obj, './/tfoot//tr[td]')
+
+
+def parse_paginator(table: Union[str, HtmlElement], next_css_class: str, page_css_class: str,
+                    active_css_class: str, disabled_css_class: str) -> Tuple[bool, Optional[str]]:
+    """
+    Парсит пагинатор таблицы
+    :param table: outerHTML таблицы или уже распарсенный элемент
+    :param next_css_class: css-класс кнопки следующей страницы
+    :param page_css_class: css-класс кнопки с номером страницы
+    :param active_css_class: css-класс текущей страницы
+    :param disabled_css_class: css-класс неактивной кнопки
+    :return: (есть ли следующая страница, видимый номер текущей страницы)
+    """
+    obj: HtmlElement = get_html_from_string(table) if isinstance(table, str) else table
+    next_buttons = Locators.xpath('.//*[{}]', has_class_condition(next_css_class))(obj)
+    has_next = bool(next_buttons) and disabled_css_class not in next_buttons[0].get('class', '').split()
+    active = Locators.xpath('.//*[{} and {}]', has_class_condition(page_css_class),
+                            has_class_condition(active_css_class))(obj)
+    active_page = format_tag_text(active[0].text_content()) if active else None
+    return has_next, active_page
+
+
 def format_xpath_from_parent(xpath: str):
     """
     Возвращает xpath, относительно родителя
@@ -1,10 +1,14 @@
 import time
 from typing import List, Union
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
+from adctest.config import config
 from adctest.helpers.exceptions import BaseSelectException, UnexpectedTagError, NoSuchElementError
+from adctest.instrumentation import instrument
+from adctest.page_helpers.waits import wait_options_loaded
 from adctest.pages import WebElementProxy
 
 
@@ -22,6 +26,7 @@ class Select:
     _option_class = 'ng-option'
     _tag_name = 'ng-select'
     _text_area_locator = (By.TAG_NAME, 'input')
+    _options_loading_timeout = 1
 
     def __init__(self, element: WebElementProxy):
         """
@@ -61,10 +66,19 @@ class Select:
 
         return options
 
+    @instrument()
     def wait_options_loading(self, by: str, value: str) -> List:
+        if config.EVENT_DRIVEN_WAITS:
+            try:
+                wait_options_loaded(self.container.parent, self.container, by, value,
+                                    timeout=self._options_loading_timeout)
+            except TimeoutException:
+                pass
+            return self.container.find_elements(by, value)
+
         options = self.container.find_elements(by, value)
         option_text = str(options[0].text if options else 'load').lower()
-        timeout = 1
+        timeout = self._options_loading_timeout
         while ('load' in option_text or 'not found' in option_text) and timeout > 0:
             time.sleep(0.1)
             timeout -= 0.1
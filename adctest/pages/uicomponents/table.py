@@ -1,11 +1,15 @@
 from enum import Enum
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Tuple, Iterator
 
 from adctest.config import config
 from adctest.helpers.exceptions import BaseTableException, TableElementNotFound, TableRowNotFound, \
     TableColumnNotFound
+from adctest.helpers.locators import Locators, has_class_condition
+from adctest.instrumentation import instrument
 from adctest.pages import WebElementProxy
-from adctest.pages.uicomponents.helpers.parsers import parse_table_thead, parse_table_row, parse_table_cell
+from adctest.pages.uicomponents.helpers.columns import TypedColumns, ColumnConverter
+from adctest.pages.uicomponents.helpers.parsers import parse_table_thead, parse_table_row, parse_table_cell, \
+    parse_table_body_and_footer, parse_paginator, get_html_from_string
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
@@ -66,12 +70,12 @@ class Column:
 
     @classmethod
     def _compile_xpath_by_visible_name(cls, name: str):
-        return f'//{cls.head_tag_name}[contains(text(),"{name}")]'
+        return Locators.format('//{}[contains(text(),"{}")]', cls.head_tag_name, name)
 
     def _compile_xpath_by_attribute_name(self, name: str, value: str):
         if not (value and name):
             raise BaseTableException('attr_name and attr_value must be pass if search_type is attribute_name')
-        return f'//{self.head_tag_name}[@{name}="{value}"]'
+        return Locators.format('//{}[@{}="{}"]', self.head_tag_name, name, value)
 
     def __repr__(self):
         return f'Column({self.relative_xpath})'
@@ -208,6 +212,11 @@ class Table(metaclass=TableMeta):
     r_xpath_rows = '//tr'
     r_xpath_cells = '/td'
 
+    paginator_next_css_class = 'ui-paginator-next'
+    paginator_page_css_class = 'ui-paginator-page'
+    paginator_active_css_class = 'ui-state-active'
+    paginator_disabled_css_class = 'ui-state-disabled'
+
     @classmethod
     def r_xpath_row(cls, index: int):
         """
@@ -215,7 +224,7 @@ class Table(metaclass=TableMeta):
         :param index:
         :return:
         """
-        return f'{cls.r_xpath_rows}[{index}]'
+        return Locators.format('{}[{}]', cls.r_xpath_rows, index)
 
     @classmethod
     def r_xpath_column(cls, index: int):
@@ -224,7 +233,7 @@ class Table(metaclass=TableMeta):
         :param index:
         :return:
         """
-        return f'{cls.r_xpath_rows}{cls.r_xpath_cells}[{index}]'
+        return Locators.format('{}{}[{}]', cls.r_xpath_rows, cls.r_xpath_cells, index)
 
     @classmethod
     def r_xpath_cell(cls, row_index: int, column_index: int):
@@ -234,24 +243,25 @@ class Table(metaclass=TableMeta):
         :param column_index:
         :return:
         """
-        return f'{cls.r_xpath_row(row_index)}{cls.r_xpath_cells}[{column_index}]'
+        return Locators.format('{}{}[{}]', cls.r_xpath_row(row_index), cls.r_xpath_cells, column_index)
 
     @classmethod
     def r_xpath_column_cells_contains_text(cls, column_index: int, text: str):
-        return f'{cls.r_xpath_rows}{cls.r_xpath_cells}[contains(text(),"{text}") and {column_index}]'
+        return Locators.format('{}{}[contains(text(),"{}") and {}]', cls.r_xpath_rows, cls.r_xpath_cells, text,
+                               column_index)
 
     @classmethod
     def get_body_row_xpath(cls, index: int):
-        return ''.join([cls.r_xpath_body, cls.r_xpath_row(index)])
+        return Locators.format('{}{}', cls.r_xpath_body, cls.r_xpath_row(index))
 
     @classmethod
     def get_header_xpath(cls, index: int):
-        return ''.join([cls.r_xpath_header, cls.r_xpath_row(index)])
+        return Locators.format('{}{}', cls.r_xpath_header, cls.r_xpath_row(index))
 
     @classmethod
     def get_body_cell_row_xpath(cls, row_index: int, column_index: int):
-        paths = [cls.r_xpath_body, cls.r_xpath_row(row_index), cls.r_xpath_cell(row_index, column_index)]
-        return ''.join(paths)
+        return Locators.format('{}{}{}', cls.r_xpath_body, cls.r_xpath_row(row_index),
+                               cls.r_xpath_cell(row_index, column_index))
 
     def __repr__(self):
         return f'Table({self._tag_name}, {self.value})'
@@ -301,6 +311,7 @@ class Table(metaclass=TableMeta):
             return getattr(self.page, item)
         raise BaseTableException(f'{self.__class__.__name__} not initialized from Page object')
 
+    @instrument()
     def _search_table(self, page):
         table = page._find_element(self.search_by, self.value)
         return WebElementProxy(
@@ -311,6 +322,7 @@ class Table(metaclass=TableMeta):
             attr_name=self.__attr_name,
         )
 
+    @instrument()
     def _parse_header(self):
         head_html = self._table.find_element_by_xpath(f'.{self.r_xpath_header}').get_attribute('innerHTML')
         self.columns_indexes = parse_table_thead(head_html, self._head_tag_text_key, self._head_search_attrs)
@@ -340,6 +352,7 @@ class Table(metaclass=TableMeta):
         )
         return self.get_item_by_xpath(xpath)
 
+    @instrument()
     def _find_column_cells_by_visible_text(self, column: Column, text: str) -> List[WebElementProxy]:
         """
         находит все элементы колонки, которые соответсвуют переданному тексту
@@ -351,6 +364,7 @@ class Table(metaclass=TableMeta):
         xpath = self.r_xpath_column_cells_contains_text(col_index, text)
         return self.get_items_by_xpath(xpath)
 
+    @instrument()
     def get_header_values(self, index: int = 1) -> List:
         """
         Возвращет значения колонок заголовка таблицы
@@ -359,6 +373,7 @@ class Table(metaclass=TableMeta):
         """
         return self._get_row_values_by_index(index, for_header=True)
 
+    @instrument()
     def get_row_values_by_index(self, index: int) -> List:
         """
         Возвращет значение строки таблицы по ей индексу (нумерация с 1, заголовок не включается)
@@ -375,6 +390,7 @@ class Table(metaclass=TableMeta):
             raise TableRowNotFound(f'Row with index {index} not found in table')
         return parse_table_row(row_html)
 
+    @instrument()
     def get_column_values_by_index(self, index: int) -> List:
         """
         Возвращает значения колонки по её индексу
@@ -401,30 +417,129 @@ class Table(metaclass=TableMeta):
         col_index = self.get_column_index(column)
         return self.get_column_values_by_index(col_index)
 
+    @instrument()
+    def snapshot(self) -> 'TableSnapshot':
+        """
+        Загружает содержимое таблицы одним запросом (outerHTML) и возвращает его снимок,
+        по которому значения колонок, строк и поиск текста вычисляются локально без обращений к браузеру.
+        Снимок не обновляется сам, после изменения таблицы на странице нужно сделать новый
+        :return:
+        """
+        return self._load_page()[0]
+
+    def _load_page(self) -> Tuple['TableSnapshot', bool, Optional[str]]:
+        """
+        Загружает outerHTML таблицы и парсит строки и пагинатор
+        :return: (снимок, есть ли следующая страница, номер текущей страницы)
+        """
+        obj = get_html_from_string(self._table.get_attribute('outerHTML'))
+        rows, footer = parse_table_body_and_footer(obj)
+        has_next, active_page = parse_paginator(
+            obj,
+            next_css_class=self.paginator_next_css_class,
+            page_css_class=self.paginator_page_css_class,
+            active_css_class=self.paginator_active_css_class,
+            disabled_css_class=self.paginator_disabled_css_class,
+        )
+        return TableSnapshot(self, rows, footer), has_next, active_page
+
+    @instrument()
+    def _click_next_page(self) -> None:
+        self.get_item_by_xpath(f'//*[{has_class_condition(self.paginator_next_css_class)}]').click()
+
+    @instrument()
+    def _wait_page_changed(self, previous: 'TableSnapshot',
+                           previous_page: Optional[str]) -> Tuple['TableSnapshot', bool, Optional[str]]:
+        """
+        Дожидается загрузки следующей страницы таблицы после клика по пагинатору.
+        Смена страницы определяется по номеру активной страницы, а если его нет в пагинаторе - по строкам таблицы
+        :param previous: снимок страницы до клика
+        :param previous_page: номер страницы до клика
+        :return:
+        """
+        self.page.wait_tableloader_not_visible()
+
+        def load_changed(_):
+            page = self._load_page()
+            if previous_page is not None:
+                changed = page[2] != previous_page
+            else:
+                changed = page[0].rows != previous.rows
+            return page if changed else False
+
+        return self.page.wait.until(load_changed)
+
+    def iter_pages(self, max_pages: Optional[int] = None, prefetch: bool = True) -> Iterator['TableSnapshot']:
+        """
+        Проходит по страницам таблицы через пагинатор, начиная с текущей, и возвращает снимок каждой страницы.
+        При prefetch переход на следующую страницу запускается до того, как текущая отдана на обработку,
+        поэтому браузер грузит её, пока обрабатываются строки текущей. Из-за этого при досрочной остановке
+        таблица может остаться на странице, следующей за последней обработанной
+        :param max_pages: максимальное число страниц (None - все)
+        :param prefetch: переходить на следующую страницу заранее
+        :return:
+        """
+        snapshot, has_next, active_page = self._load_page()
+        number = 1
+        while True:
+            has_next = has_next and (max_pages is None or number < max_pages)
+            if has_next and prefetch:
+                self._click_next_page()
+            yield snapshot
+            if not has_next:
+                return
+            if not prefetch:
+                self._click_next_page()
+            snapshot, has_next, active_page = self._wait_page_changed(snapshot, active_page)
+            number += 1
+
+    def iter_rows(self, max_pages: Optional[int] = None, prefetch: bool = True) -> Iterator[List]:
+        """
+        Лениво возвращает значения строк таблицы со всех страниц пагинатора (см. iter_pages).
+        Для досрочной остановки достаточно прервать цикл
+        :param max_pages: максимальное число страниц (None - все)
+        :param prefetch: переходить на следующую страницу заранее
+        :return:
+        """
+        for snapshot in self.iter_pages(max_pages=max_pages, prefetch=prefetch):
+            yield from snapshot.rows
+
+    @instrument()
+    def get_typed_columns(self, spec: Dict[Column, ColumnConverter]) -> TypedColumns:
+        """
+        Загружает таблицу одним запросом и возвращает нужные колонки в виде типизированных массивов numpy
+        (для проверок сортировки, сумм и т.п. на больших таблицах). Требует установленный numpy
+        :param spec: колонка -> конвертер значений (NumberColumn, DateColumn, TextColumn)
+        :return:
+        """
+        return self.snapshot().to_typed_columns(spec)
+
     def init_columns(self):
         for item in self._columns.values():
             item._set_parent(self)
 
+    @instrument()
     def get_item_by_xpath(self, xpath: str) -> WebElementProxy:
         """
         находит первый элемент таблицы по xpath (он должен быть относительно тэга таблицы)
         :param xpath:
         :return:
         """
-        xpath = ''.join([self.value, xpath])
+        xpath = Locators.format('{}{}', self.value, xpath)
         try:
             el = self._table.find_element_by_xpath(xpath)
         except NoSuchElementException:
             raise TableElementNotFound(f'Element not found by {By.XPATH} value: "{xpath}"')
         return self._wrap_proxy(el, By.XPATH, xpath)
 
+    @instrument()
     def get_items_by_xpath(self, xpath: str) -> List[WebElementProxy]:
         """
         находит все подходящие элементы таблицы по xpath (он должен быть относительно тэга таблицы)
         :param xpath:
         :return:
         """
-        xpath = ''.join([self.value, xpath])
+        xpath = Locators.format('{}{}', self.value, xpath)
         try:
             elements = self._table.find_elements_by_xpath(xpath)
         except NoSuchElementException:
@@ -445,3 +560,114 @@ class Table(metaclass=TableMeta):
             by=by,
             value=value,
         )
+
+
+class TableSnapshot:
+    """
+    Снимок строк таблицы (без заголовка). Индексы колонок берутся из columns_indexes таблицы,
+    нумерация строк и колонок, как и в Table, идет с 1
+    """
+    table: Table = None
+    """таблица, из которой сделан снимок"""
+    rows: List[List[Optional[str]]] = None
+    """значения ячеек по строкам"""
+    footer: List[List[Optional[str]]] = None
+    """значения ячеек строк tfoot"""
+
+    def __init__(self, table: Table, rows: List[List[Optional[str]]],
+                 footer: Optional[List[List[Optional[str]]]] = None):
+        self.table = table
+        self.rows = rows
+        self.footer = footer or []
+
+    def __repr__(self):
+        return f'TableSnapshot({self.table}, rows={len(self.rows)})'
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def get_column_values_by_index(self, index: int) -> List:
+        """
+        Возвращает значения колонки по её индексу
+        :param index:
+        :return:
+        """
+        if index > self.table.real_column_count:
+            raise TableColumnNotFound(f'Column with index {index} not exists in table')
+        return [row[index - 1] for row in self.rows if len(row) >= index]
+
+    def get_column_values(self, column: Column) -> List:
+        """
+        Возвращает все значения колонки
+        :param column:
+        :return:
+        """
+        return self.get_column_values_by_index(self.table.get_column_index(column))
+
+    def get_row_values_by_index(self, index: int) -> List:
+        """
+        Возвращет значение строки таблицы по ей индексу
+        :param index:
+        :return:
+        """
+        if index < 1 or index > len(self.rows):
+            raise TableRowNotFound(f'Row with index {index} not found in table')
+        return self.rows[index - 1]
+
+    def get_cell(self, row_index: int, column: Column) -> Optional[str]:
+        """
+        Возвращает значение ячейки колонки в строке row_index
+        :param row_index:
+        :param column:
+        :return:
+        """
+        row = self.get_row_values_by_index(row_index)
+        col_index = self.table.get_column_index(column)
+        if col_index > len(row):
+            raise TableElementNotFound(f'Cell {col_index} not found in row {row_index}')
+        return row[col_index - 1]
+
+    def find_rows(self, column: Column, text: str) -> List[int]:
+        """
+        Возвращает индексы строк, в которых ячейка колонки содержит text
+        :param column:
+        :param text:
+        :return:
+        """
+        col_index = self.table.get_column_index(column)
+        return [
+            number for number, row in enumerate(self.rows, start=1)
+            if len(row) >= col_index and row[col_index - 1] is not None and text in row[col_index - 1]
+        ]
+
+    def search(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Ищет text во всех ячейках таблицы
+        :param text:
+        :return: список пар (индекс строки, индекс колонки)
+        """
+        return [
+            (row_number, col_number)
+            for row_number, row in enumerate(self.rows, start=1)
+            for col_number, value in enumerate(row, start=1)
+            if value is not None and text in value
+        ]
+
+    def to_typed_columns(self, spec: Dict[Column, ColumnConverter]) -> TypedColumns:
+        """
+        Преобразует колонки снимка в типизированные массивы numpy
+        :param spec: колонка -> конвертер значений
+        :return:
+        """
+        columns = {}
+        footer = {}
+        for column, converter in spec.items():
+            col_index = self.table.get_column_index(column)
+            values = [row[col_index - 1] if len(row) >= col_index else None for row in self.rows]
+            columns[column] = converter.to_array(values)
+            if self.footer and len(self.footer[0]) >= col_index:
+                footer[column] = converter(self.footer[0][col_index - 1])
+        return TypedColumns(columns, footer)
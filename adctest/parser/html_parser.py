@@ -1,20 +1,26 @@
 import logging
 import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from copy import deepcopy
+from functools import partial
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple
 
 from adctest.config import config
 from adctest.parser.const import (
+    MANIFEST_FILE_NAME,
     PAGE_PATH_NAME,
     NAV_PAGE_PATH_NAME,
     RAW_PAGE_CLASS_POSTFIX,
     RAW_PAGE_PATH_NAME,
 )
 from adctest.parser.exceptions import ParserException
+from adctest.parser.manifest import PagesManifest
+from adctest.parser.writer import PagesWriter
 from adctest.pages import PageConfig, BasePage, BasePageMeta, BaseNavigation, BaseNavigationMeta, ElementDescriptor, \
     WebElementProxy
-from adctest.parser.utils import Utils, RelativeImportPath, LineRange
+from adctest.parser.utils import Utils, RelativeImportPath, LineRange, TagsIndex
 from lxml.etree import XMLSyntaxError
 from selenium.webdriver.common.by import By
 
@@ -74,6 +80,8 @@ NAV_CLASS_OBJ_REPR = """\
 XPATH_BY_CSS = r"""'//*[contains(@class, "{class_name}")]'"""
 XPATH_BY_TAG_ATTR = r"""'//*[@{attr_name}="{attr_value}"]'"""
 
+RUNTIME_PATHS_ATTRS = ('backend_path', 'project_path', 'e2e_path', 'pages_path', 'raw_pages_path', )
+
 
 class PageHelper:
     """
@@ -124,6 +132,8 @@ class AngularFormatParser:
 
     app_name: str = None
     """имя ангулярного приложения (имя поддиректории в js), устанавливается в классе наследнике"""
+    page_conf_name: str = ''
+    """значение, которое записывается в page_conf "сырых" классов страниц, устанавливается в классе наследнике"""
 
     root_path: Path = None
     """относительный путь до корня js-приложения, устанавливается в классах наследниках"""
@@ -153,6 +163,13 @@ class AngularFormatParser:
     navigation_classes_import_list: List[Tuple[str, Path]] = []
     """классы и полные пути общих для всех страниц классов навигации"""
 
+    use_manifest: bool = True
+    """пропускать html-исходники, которые не менялись с прошлого запуска parse() (см. PagesManifest)"""
+    _manifest: Optional[PagesManifest] = None
+    """манифест текущего запуска parse(), None - если страницы генерируются вне parse()"""
+    _writer: Optional[PagesWriter] = None
+    """накопитель записываемых файлов, существует только внутри batch_writes()"""
+
     @classmethod
     def _set_project_paths(cls) -> None:
         if not cls.root_path:
@@ -173,16 +190,112 @@ class AngularFormatParser:
         Utils.create_module_dir(module_path=cls.raw_pages_path)
 
     @classmethod
-    def parse(cls) -> None:
+    def parse(cls, force: bool = False) -> None:
         """
         Вызов метода выполняет все необходимые действия по парсингу.
         в классе-наследнике необходимо реализовать методы create_navigation_components и custom_parse
+        :param force: перегенерировать все страницы, даже если их исходники не менялись
         :return:
         """
         cls._set_project_paths()
         cls._set_pages_paths()
-        cls.create_navigation_components()
-        cls.custom_parse()
+        cls._load_manifest(force=force)
+        try:
+            with cls.batch_writes():
+                cls.create_navigation_components()
+                cls.custom_parse()
+        except BaseException:
+            # манифест сохраняется только после успешной записи всех файлов
+            cls._manifest = None
+            raise
+        cls._save_manifest()
+
+    @classmethod
+    @contextmanager
+    def batch_writes(cls):
+        """
+        Внутри контекста сгенерированные модули и импорты в __init__.py накапливаются в памяти
+        и записываются по одному разу на выходе. Вложенные вызовы используют внешний контекст.
+        Если генерация завершилась исключением, ничего не записывается, чтобы на диске не остался
+        частично сгенерированный пакет, который не соответствует манифесту
+        :return:
+        """
+        if cls._writer is not None:
+            yield cls._writer
+            return
+
+        cls._writer = PagesWriter()
+        try:
+            yield cls._writer
+        except BaseException:
+            cls._writer = None
+            raise
+        writer, cls._writer = cls._writer, None
+        writer.flush()
+
+    @classmethod
+    def _load_manifest(cls, force: bool = False) -> None:
+        if not cls.use_manifest:
+            cls._manifest = None
+            return
+        path = cls.raw_pages_path.joinpath(MANIFEST_FILE_NAME)
+        cls._manifest = PagesManifest(path) if force else PagesManifest.load(path)
+
+    @classmethod
+    def _save_manifest(cls) -> None:
+        if cls._manifest is not None:
+            cls._manifest.remove_unvisited()
+            cls._manifest.save()
+            cls._manifest = None
+
+    @classmethod
+    def _get_settings_hash(cls, custom_css_patterns: Optional[List[str]] = None,
+                           custom_patterns_by_attr: Optional[List[str]] = None, page_url: str = "",
+                           file_name_prefix: Optional[str] = None, search_range: Optional[LineRange] = None,
+                           raw_page_custom_attr: Optional[List[str]] = None) -> str:
+        """
+        Хэш всего, что кроме содержимого html влияет на сгенерированные модули
+        (параметры те же, что у create_page и _create_navigation)
+        :return:
+        """
+        settings = {
+            'custom_css_patterns': custom_css_patterns,
+            'custom_patterns_by_attr': custom_patterns_by_attr,
+            'page_url': page_url,
+            'file_name_prefix': file_name_prefix or '',
+            'search_range': search_range,
+            'raw_page_custom_attr': raw_page_custom_attr,
+            'base_attrs_search_patterns': cls.base_attrs_search_patterns,
+            'page_conf_name': cls.page_conf_name,
+            'app_name': cls.app_name,
+            'e2e_path': cls.e2e_path,
+            'templates': [RAW_PAGE_CLASS_REPR, RAW_NAV_CLASS_REPR, PAGE_CLASS_REPR, ATTRIBUTE_REPR],
+        }
+        return PagesManifest.hash_settings(settings)
+
+    @classmethod
+    def _get_unchanged_entry(cls, path_to_html: Path, settings_hash: str) -> Optional[Dict]:
+        """
+        Возвращает запись манифеста, если модули исходника можно не перегенерировать
+        :param path_to_html:
+        :param settings_hash:
+        :return:
+        """
+        if cls._manifest is None:
+            return None
+        entry = cls._manifest.get_unchanged(path_to_html, settings_hash)
+        if entry:
+            logger.info('File %s has not changed since last parsing. Skip it', path_to_html)
+        return entry
+
+    @classmethod
+    def _update_manifest(cls, path_to_html: Path, settings_hash: str, obj: PageHelper) -> None:
+        if cls._manifest is None:
+            return
+        init_file_path = obj.path_to_write_page.parent.joinpath('__init__.py')
+        cls._manifest.update(path_to_html, settings_hash,
+                             outputs=[obj.path_to_write_raw_page, obj.path_to_write_page],
+                             class_name=obj.class_name, init_file_path=str(init_file_path))
 
     @classmethod
     def get_path_to_store(cls) -> Path:
@@ -263,14 +376,34 @@ class AngularFormatParser:
                                    raw_page_custom_attr=raw_page_custom_attr, )
 
     @classmethod
-    def parse_pages(cls, pages_routes: Dict[str, str]) -> None:
+    def parse_pages(cls, pages_routes: Dict[str, str], workers: Optional[int] = None) -> None:
         """
         Позволяет распарсить все html-страницы, лежащие в директории components_relative_path и её поддиректориях
         :param pages_routes: дикт вида {<относительный_путь_до_страницы>: <относительный_url_страницы>}
+        :param workers: число процессов для парсинга html. Если не передано (или 1), то страницы парсятся
+        последовательно в текущем процессе. Запись файлов всегда выполняется в текущем процессе в том же порядке,
+        поэтому результат не отличается от последовательного парсинга
         :return:
         """
+        pages = cls._collect_pages(pages_routes)
+        with cls.batch_writes():
+            if workers and workers > 1:
+                cls._create_pages_in_pool(pages, workers)
+                return
+
+            for page in pages:
+                cls.create_page(page['path_to_html'], page_url=page['page_url'],
+                                file_name_prefix=page['file_name_prefix'])
+
+    @classmethod
+    def _collect_pages(cls, pages_routes: Dict[str, str]) -> List[Dict]:
+        """
+        Собирает html-страницы из директории components_relative_path в порядке их обработки
+        :param pages_routes: дикт вида {<относительный_путь_до_страницы>: <относительный_url_страницы>}
+        :return: список параметров для create_page
+        """
         components_path: Path = cls.project_path.joinpath(cls.components_relative_path)
-        added_names = set()
+        pages = []
 
         for path in components_path.iterdir():
             if path.is_dir():
@@ -281,8 +414,50 @@ class AngularFormatParser:
                     name_prefix = ''
                     if p.parent != path and has_same_names:
                         name_prefix = p.relative_to(path).parent.name.split('-')[-1]
-                    cls.create_page(p, page_url=pages_routes.get(p.stem, ''), file_name_prefix=name_prefix)
-                    added_names.add(p.name)
+                    pages.append({
+                        'path_to_html': p,
+                        'page_url': pages_routes.get(p.stem, ''),
+                        'file_name_prefix': name_prefix,
+                    })
+        return pages
+
+    @classmethod
+    def _create_pages_in_pool(cls, pages: List[Dict], workers: int) -> None:
+        """
+        Парсит страницы в пуле процессов (чтение файла, построение дерева lxml и поиск атрибутов),
+        а запись модулей и импортов в __init__.py выполняет в текущем процессе в исходном порядке страниц
+        :param pages: список параметров страниц из _collect_pages
+        :param workers: число процессов
+        :return:
+        """
+        changed_pages = []
+        for page in pages:
+            settings_hash = cls._get_settings_hash(page_url=page['page_url'],
+                                                   file_name_prefix=page['file_name_prefix'])
+            if not cls._get_unchanged_entry(page['path_to_html'], settings_hash):
+                changed_pages.append((page, settings_hash))
+        if not changed_pages:
+            return
+
+        parse_page = partial(_parse_page_in_worker, cls, cls._get_runtime_paths())
+        tasks = [(page['path_to_html'], page['file_name_prefix']) for page, _ in changed_pages]
+        chunk_size = max(1, len(tasks) // (workers * 4))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for (page, settings_hash), obj in zip(changed_pages,
+                                                  executor.map(parse_page, tasks, chunksize=chunk_size)):
+                if obj is None:
+                    continue
+                cls._write_page(obj, page_url=page['page_url'])
+                cls._update_manifest(page['path_to_html'], settings_hash, obj)
+
+    @classmethod
+    def _get_runtime_paths(cls) -> Dict[str, Path]:
+        """
+        Пути, которые вычисляются в рантайме и не переживают передачу класса в дочерний процесс
+        :return:
+        """
+        return {name: getattr(cls, name) for name in RUNTIME_PATHS_ATTRS}
 
     @classmethod
     def create_page(cls, path_to_html: Path, custom_css_patterns: Optional[List[str]] = None,
@@ -299,6 +474,12 @@ class AngularFormatParser:
         :param search_range: объект LineRange, если в файле нужно искать элементы в определенном промежутке строк
         :return:
         """
+        settings_hash = cls._get_settings_hash(custom_css_patterns=custom_css_patterns,
+                                               custom_patterns_by_attr=custom_patterns_by_attr, page_url=page_url,
+                                               file_name_prefix=file_name_prefix, search_range=search_range)
+        if cls._get_unchanged_entry(path_to_html, settings_hash):
+            return
+
         try:
             obj: PageHelper = cls._parse_html(path_to_html, custom_css_patterns, custom_patterns_by_attr,
                                               file_name_prefix=file_name_prefix, search_range=search_range, )
@@ -306,6 +487,17 @@ class AngularFormatParser:
             logger.warning('File %s is empty or have invalid syntax. Skip parsing', path_to_html)
             return
 
+        cls._write_page(obj, page_url=page_url)
+        cls._update_manifest(path_to_html, settings_hash, obj)
+
+    @classmethod
+    def _write_page(cls, obj: PageHelper, page_url: str = "") -> None:
+        """
+        Формирует модули основного и "сырого" классов страницы по результату парсинга и записывает их
+        :param obj: результат _parse_html
+        :param page_url: относительный url (без домена), чтобы открыть данную страницу в браузере
+        :return:
+        """
         additional_imports = [
             obj.base_page_import_path,
         ]
@@ -317,6 +509,7 @@ class AngularFormatParser:
             additional_imports='\n'.join(additional_imports),
             base_page_class=BasePage.__name__,
             page_url=page_url,
+            page_conf_name=cls.page_conf_name,
             app_name=cls.app_name,
             base_metaclass=BasePageMeta.__name__,
         )
@@ -353,7 +546,7 @@ class AngularFormatParser:
         :return:
         """
         obj: PageHelper = PageHelper()
-        obj.html_obj = Utils.get_html_from_file(path=path_to_html)
+        obj.html_obj = Utils.get_html_from_file(path=path_to_html, search_range=search_range)
         file_name = Path('_'.join(filter(lambda o: o, [file_name_prefix, path_to_html.name])))
 
         obj.class_name = Utils.get_class_name_from_file_name(file_name)
@@ -430,6 +623,15 @@ class AngularFormatParser:
         :param raw_page_custom_attr:
         :return:
         """
+        settings_hash = cls._get_settings_hash(custom_css_patterns=custom_css_patterns,
+                                               custom_patterns_by_attr=custom_patterns_by_attr,
+                                               file_name_prefix=file_name_prefix, search_range=search_range,
+                                               raw_page_custom_attr=raw_page_custom_attr)
+        entry = cls._get_unchanged_entry(path_to_html, settings_hash)
+        if entry:
+            cls.navigation_classes_import_list.append((entry['class_name'], Path(entry['init_file_path'])))
+            return
+
         obj: PageHelper = cls._parse_html(path_to_html, custom_css_patterns, custom_patterns_by_attr,
                                           is_nav_component=True, file_name_prefix=file_name_prefix,
                                           search_range=search_range, )
@@ -461,6 +663,7 @@ class AngularFormatParser:
 
         init_file_path: Path = cls._add_page_class_to_init_file(obj.path_to_write_page, obj.class_name)
         cls.navigation_classes_import_list.append((obj.class_name, init_file_path))
+        cls._update_manifest(path_to_html, settings_hash, obj)
 
     @classmethod
     def _get_navigations_for_page(cls, path_to_write_page: Path) -> Tuple[List[str], List[str]]:
@@ -495,15 +698,9 @@ class AngularFormatParser:
         :param rewrite: флаг, обозначающий перезаписывать ли файл
         :return:
         """
-        if not rewrite and path.exists():
-            logger.info('Path "%s" is already exists. It will not be rewritten', path)
-            return
-
-        with path.open('w') as f:
-            f.write(page_header)
-            if page_attrs:
-                for attr in page_attrs:
-                    f.write(attr)
+        content = ''.join([page_header, *(page_attrs or [])])
+        with cls.batch_writes() as writer:
+            writer.add_module(path, content, rewrite=rewrite)
 
     @classmethod
     def _add_page_class_to_init_file(cls, from_path: Path, class_name: str) -> Path:
@@ -521,12 +718,8 @@ class AngularFormatParser:
             class_names=[class_name]
         )
 
-        with init_path.open('r') as f:
-            data = f.read()
-            if import_path in data:
-                return init_path
-        with init_path.open('a') as f:
-            f.write(f'{import_path}\n')
+        with cls.batch_writes() as writer:
+            writer.add_import(init_path, import_path)
         return init_path
 
     @classmethod
@@ -547,36 +740,39 @@ class AngularFormatParser:
         if custom_patterns_by_attr:
             patterns_by_attr.extend(custom_patterns_by_attr)
 
+        index = TagsIndex(page, attr_names=[name.lower() for name in patterns_by_attr],
+                          css_classes=custom_css_patterns or [], search_range=search_range)
+
         if custom_css_patterns:
-            attrs.extend(cls._search_by_css_patterns(page, path_to_html, custom_css_patterns, search_range))
+            attrs.extend(cls._search_by_css_patterns(index, path_to_html, custom_css_patterns, search_range))
         if patterns_by_attr:
-            attrs.extend(cls._search_by_tag_attr_patterns(page, path_to_html, patterns_by_attr, search_range))
+            attrs.extend(cls._search_by_tag_attr_patterns(index, path_to_html, patterns_by_attr))
 
         return attrs
 
     @classmethod
-    def _search_by_css_patterns(cls, page: HtmlElement, path_to_html: Path, custom_css_patterns: List[str],
+    def _search_by_css_patterns(cls, index: TagsIndex, path_to_html: Path, custom_css_patterns: List[str],
                                 search_range: Optional[LineRange] = None) -> List[str]:
         """
         Функция реализующая поиск атрибутов по css-классу
-        :param page:
+        :param index: индекс элементов страницы
         :param path_to_html:
         :param custom_css_patterns:
-        :param search_range:
+        :param search_range: промежуток строк, по которому был построен индекс (для логов)
         :return: найденный атрибут, форматированный для записи в py-файл
         """
         res = []
         for pattern in custom_css_patterns:
-            el = page.find_class(pattern)
+            el = index.by_css[pattern]
             if not el:
-                logger.warning('Element not found by custom css pattern <%s>', pattern)
+                if search_range:
+                    logger.warning('Element not found by custom css pattern <%s> in search %s', pattern, search_range)
+                else:
+                    logger.warning('Element not found by custom css pattern <%s>', pattern)
                 continue
             if len(el) > 1:
                 raise ParserException('By custom css pattern <%s> found more then one elements: %s',
                                       pattern, el)
-            if search_range and el.sourceline not in search_range:
-                logger.warning('Element found by custom css pattern <%s> not in search %s', pattern, search_range)
-                continue
             res.append(cls._format_element_by_css(path_to_html=path_to_html, element=el[0], css_class=pattern))
         return res
 
@@ -594,26 +790,22 @@ class AngularFormatParser:
         return cls._print_element_in_py_repr(element, css_class, attribute_value, path_to_html, many=False)
 
     @classmethod
-    def _search_by_tag_attr_patterns(cls, page: HtmlElement, path_to_html: Path, custom_patterns_by_attr: List[str],
-                                     search_range: Optional[LineRange] = None) -> List[str]:
+    def _search_by_tag_attr_patterns(cls, index: TagsIndex, path_to_html: Path,
+                                     custom_patterns_by_attr: List[str]) -> List[str]:
         """
         Функция реализующая поиск атрибутов по их атрибутам
-        :param page:
+        :param index: индекс элементов страницы
         :param path_to_html:
         :param custom_patterns_by_attr:
-        :param search_range:
         :return: найденный атрибут, форматированный для записи в py-файл
         """
         res = []
         for attr_name in custom_patterns_by_attr:
             prepared_name = attr_name.lower()
-            search_mask = f'//*[@{prepared_name}]'
-            elements: List[HtmlElement] = page.xpath(search_mask)
+            elements: List[HtmlElement] = index.by_attr[prepared_name]
             if elements:
                 added_elements: Dict[str, List] = {}
                 for el in elements:
-                    if search_range and el.sourceline not in search_range:
-                        continue
                     attr_value = el.attrib[prepared_name]
                     if '{{' in attr_value:
                         # пропускаем элементы у которых атрибут формируется во время выполнения
@@ -679,3 +871,27 @@ class AngularFormatParser:
             'path_to_attribute': Utils.path_with_row_number(relative_path_to_html, element.sourceline),
         }
         return ATTRIBUTE_REPR.format(**kwargs)
+
+
+def _parse_page_in_worker(parser_class, runtime_paths: Dict[str, Path],
+                          task: Tuple[Path, str]) -> Optional[PageHelper]:
+    """
+    Парсит одну страницу в дочернем процессе (см. AngularFormatParser.parse_pages).
+    Реализовано вне класса, т.к. в пул процессов можно передать только функцию уровня модуля
+    :param parser_class: класс-парсер приложения
+    :param runtime_paths: пути, вычисленные в рантайме родительского процесса
+    :param task: путь до html и префикс имени модуля
+    :return: PageHelper без дерева html (оно не нужно для записи и не сериализуется) или None,
+    если файл пустой или невалидный
+    """
+    for name, value in runtime_paths.items():
+        setattr(parser_class, name, value)
+
+    path_to_html, file_name_prefix = task
+    try:
+        obj: PageHelper = parser_class._parse_html(path_to_html, file_name_prefix=file_name_prefix)
+    except XMLSyntaxError:
+        logger.warning('File %s is empty or have invalid syntax. Skip parsing', path_to_html)
+        return None
+    obj.html_obj = None
+    return obj
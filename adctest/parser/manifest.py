@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from adctest.parser.writer import write_file_atomic
+
+logger = logging.getLogger('e2e-test')
+
+
+class PagesManifest:
+    """
+    Манифест сгенерированных модулей: для каждого html-исходника хранит хэш его содержимого,
+    хэш настроек парсинга и пути до записанных модулей. Позволяет не перегенерировать страницы,
+    исходники которых не менялись с прошлого запуска парсера
+    """
+    version: int = 1
+    """версия формата файла, при её изменении сохраненный манифест игнорируется"""
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, Dict]] = None):
+        """
+        :param path: абсолютный путь до json-файла манифеста
+        :param entries: уже сохраненные записи манифеста
+        """
+        self.path = path
+        self._entries: Dict[str, Dict] = entries or {}
+        self._content_hashes: Dict[str, str] = {}
+        self._visited: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: Path) -> 'PagesManifest':
+        """
+        Загружает манифест из файла. Если файла нет или он невалидный, возвращает пустой манифест
+        :param path:
+        :return:
+        """
+        if not path.exists():
+            return cls(path)
+        try:
+            data = json.loads(path.read_text())
+        except ValueError:
+            logger.warning('Manifest %s has invalid format. All pages will be regenerated', path)
+            return cls(path)
+        if data.get('version') != cls.version:
+            return cls(path)
+        return cls(path, data.get('entries'))
+
+    @classmethod
+    def hash_settings(cls, settings: Dict) -> str:
+        """
+        Хэш настроек, с которыми генерировался модуль (паттерны поиска, url страницы и т.д.)
+        :param settings:
+        :return:
+        """
+        data = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def _hash_content(self, source: Path) -> str:
+        key = str(source)
+        if key not in self._content_hashes:
+            self._content_hashes[key] = hashlib.sha1(source.read_bytes()).hexdigest()
+        return self._content_hashes[key]
+
+    def get_unchanged(self, source: Path, settings_hash: str) -> Optional[Dict]:
+        """
+        Возвращает запись манифеста, если исходник и настройки не изменились, а модули на месте
+        :param source: абсолютный путь до html-исходника
+        :param settings_hash: хэш текущих настроек парсинга
+        :return:
+        """
+        entry = self._entries.get(str(source))
+        if not entry or entry['settings'] != settings_hash:
+            return None
+        if entry['content'] != self._hash_content(source):
+            return None
+        if not all(Path(p).exists() for p in entry['outputs']):
+            return None
+        self._visited.add(str(source))
+        return entry
+
+    def update(self, source: Path, settings_hash: str, outputs: List[Path], **extra) -> None:
+        """
+        Сохраняет (в памяти) информацию о сгенерированных из исходника модулях
+        :param source: абсолютный путь до html-исходника
+        :param settings_hash: хэш настроек парсинга
+        :param outputs: пути до записанных модулей
+        :param extra: дополнительные данные, которые понадобятся при пропуске исходника
+        :return:
+        """
+        entry = {
+            'content': self._hash_content(source),
+            'settings': settings_hash,
+            'outputs': [str(p) for p in outputs],
+        }
+        entry.update(extra)
+        self._entries[str(source)] = entry
+        self._visited.add(str(source))
+
+    def remove_unvisited(self) -> None:
+        """
+        Удаляет записи исходников, которые не были ни пропущены, ни сгенерированы в текущем запуске
+        (например, html-файл удален или перестал парситься)
+        :return:
+        """
+        self._entries = {key: entry for key, entry in self._entries.items() if key in self._visited}
+
+    def save(self) -> None:
+        data = {'version': self.version, 'entries': self._entries}
+        write_file_atomic(self.path, json.dumps(data, sort_keys=True, indent=2))
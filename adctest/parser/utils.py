@@ -1,16 +1,18 @@
 import logging
 import re
 import sys
+from functools import lru_cache
 
 from adctest.parser.exceptions import ParserException
-from lxml import html
+from lxml import etree, html
 from lxml.html import HtmlElement
 from pathlib import Path
-from typing import List
+from typing import List, Dict, Optional
 
 logger = logging.getLogger('e2e-test')
 
 PY_EXT = 'py'
+IMPORT_PATHS_CACHE_SIZE = 65536
 
 
 class LineRange:
@@ -41,24 +43,85 @@ class LineRange:
         return f'range from {self.start} to {self.end}'
 
 
+class TagsIndex:
+    """
+    Индекс элементов html-страницы по именам атрибутов и css-классам. Строится за один обход дерева,
+    вместо отдельного поиска по каждому паттерну
+    """
+    by_attr: Dict[str, List[HtmlElement]] = None
+    """элементы, у которых есть атрибут с таким именем (в порядке следования в документе)"""
+    by_css: Dict[str, List[HtmlElement]] = None
+    """элементы, у которых есть такой css-класс (в порядке следования в документе)"""
+
+    def __init__(self, page: HtmlElement, attr_names: List[str], css_classes: List[str],
+                 search_range: Optional[LineRange] = None):
+        """
+        :param page: объект html
+        :param attr_names: имена атрибутов в нижнем регистре
+        :param css_classes: css-классы
+        :param search_range: если передан, то индексируются только элементы из этого промежутка строк
+        """
+        self.by_attr = {name: [] for name in attr_names}
+        self.by_css = {name: [] for name in css_classes}
+        self._build(page, search_range)
+
+    def _build(self, page: HtmlElement, search_range: Optional[LineRange] = None) -> None:
+        by_attr = self.by_attr
+        by_css = self.by_css
+        # iter(etree.Element) пропускает комментарии и инструкции
+        for el in page.iter(etree.Element):
+            if search_range and (el.sourceline is None or el.sourceline not in search_range):
+                continue
+            attrib = el.attrib
+            for name, elements in by_attr.items():
+                if name in attrib:
+                    elements.append(el)
+            if by_css:
+                for css_class in set(attrib.get('class', '').split()):
+                    if css_class in by_css:
+                        by_css[css_class].append(el)
+
+
 class Utils:
     """
     Класс, собравший основную часть хелпер-функций
     """
     @classmethod
-    def get_html_from_file(cls, path: Path) -> HtmlElement:
+    def get_html_from_file(cls, path: Path, search_range: Optional[LineRange] = None) -> HtmlElement:
         """
         Возвращает объект lxml.html
         :param path:
+        :param search_range: если передан, то файл читается построчно и парсинг останавливается на последней строке
+        промежутка, т.е. элементы ниже неё в дерево не попадают (для больших файлов, в которых нужна небольшая часть)
         :return:
         """
         if not path.exists():
             raise ParserException(f'path "{path}" must be exist in project dir')
 
+        if search_range:
+            return cls._get_html_from_file_until_line(path, last_line=search_range.end)
+
         with path.open('r') as f:
             data = f.read()
             return html.fromstring(data)
 
+    @classmethod
+    def _get_html_from_file_until_line(cls, path: Path, last_line: int) -> HtmlElement:
+        """
+        Построчно скармливает файл инкрементальному парсеру lxml, пока не дойдет до строки last_line.
+        Номера строк (sourceline) у элементов совпадают с номерами строк в файле
+        :param path:
+        :param last_line: номер последней строки, которую нужно распарсить (нумерация с 1)
+        :return: корень распарсенного дерева (тэг html)
+        """
+        parser = html.HTMLParser()
+        with path.open('r') as f:
+            for number, line in enumerate(f, start=1):
+                parser.feed(line)
+                if number >= last_line:
+                    break
+        return parser.close()
+
     @classmethod
     def get_html_fragment_from_string(cls, data: str) -> HtmlElement:
         """
@@ -148,7 +211,9 @@ class Utils:
 class RelativeImportPath:
     """
     Класс хелпер, позволяющий построить относительный импорт классов одного модуля в другой
-    исходя из их абсолютный путей
+    исходя из их абсолютный путей.
+    Результаты кэшируются, т.к. при генерации страниц одни и те же импорты (базовые классы, навигация)
+    строятся для каждой страницы одной директории
     """
     @classmethod
     def get(cls, root: Path, to_path: Path, from_path: Path, class_names: List[str]) -> str:
@@ -160,22 +225,40 @@ class RelativeImportPath:
         :param class_names: имена классов, который нужно импортировать
         :return:
         """
+        import_path = cls._get_import_path(root, to_path.parent, from_path)
+
+        printed_class_names = ', '.join(class_names)
+
+        return f'from {import_path} import {printed_class_names}'
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        cls._get_import_path.cache_clear()
+        cls._count_dots_to_dir.cache_clear()
+
+    @classmethod
+    @lru_cache(maxsize=IMPORT_PATHS_CACHE_SIZE)
+    def _get_import_path(cls, root: Path, to_dir: Path, from_path: Path) -> str:
+        """
+        Относительный путь модуля from_path для импорта в модули директории to_dir.
+        Зависит только от директории, а не от конкретного модуля, поэтому кэшируется по ней
+        :param root: корень для обоих модулей
+        :param to_dir: абсолютный путь до директории модуля, в который нужен импорт
+        :param from_path: абсолютный путь до модуля, из которого импортируется класс
+        :return:
+        """
         if from_path.stem == '__init__':
             from_path = from_path.parent
         from_path_relative = from_path.relative_to(root)
-        to_path_relative = to_path.relative_to(root)
-        for from_part, to_part in zip(from_path_relative.parts, to_path_relative.parts):
+        to_dir_relative = to_dir.relative_to(root)
+        for from_part, to_part in zip(from_path_relative.parts, to_dir_relative.parts):
             if from_part != to_part:
                 break
             root = root.joinpath(from_part)
         from_path_relative = from_path.relative_to(root)
 
-        dots = cls._count_dots(root, to_path)
-        import_path = ''.join([dots * '.', cls._path_to_import_notation(from_path_relative)])
-
-        printed_class_names = ', '.join(class_names)
-
-        return f'from {import_path} import {printed_class_names}'
+        dots = cls._count_dots_to_dir(root, to_dir)
+        return ''.join([dots * '.', cls._path_to_import_notation(from_path_relative)])
 
     @classmethod
     def _count_dots(cls, root: Path, to_path: Path) -> int:
@@ -185,14 +268,25 @@ class RelativeImportPath:
         :param to_path:
         :return:
         """
+        return cls._count_dots_to_dir(root, to_path.parent)
+
+    @classmethod
+    @lru_cache(maxsize=IMPORT_PATHS_CACHE_SIZE)
+    def _count_dots_to_dir(cls, root: Path, to_dir: Path) -> int:
+        """
+        число точек одинаково для всех модулей одной директории, поэтому кэшируется по ней
+        :param root:
+        :param to_dir: директория модуля, в который нужен импорт
+        :return:
+        """
         base_folder = root.stem
         dots = 0
-        for parent in to_path.parents:
+        for parent in (to_dir, *to_dir.parents):
             dots += 1
             if parent.stem.endswith(base_folder):
                 break
         else:
-            raise ParserException('impossible to build relative import from %s to %s', to_path, root)
+            raise ParserException('impossible to build relative import from %s to %s', to_dir, root)
 
         return dots
 
@@ -0,0 +1,80 @@
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Set
+
+logger = logging.getLogger('e2e-test')
+
+
+def write_file_atomic(path: Path, data: str) -> None:
+    """
+    Записывает файл через временный файл в той же директории и переименование,
+    чтобы при прерывании генерации не оставалось недописанных модулей
+    :param path:
+    :param data:
+    :return:
+    """
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with tmp_path.open('w') as f:
+        f.write(data)
+    os.replace(str(tmp_path), str(path))
+
+
+class PagesWriter:
+    """
+    Накапливает в памяти сгенерированные модули и импорты классов в __init__.py,
+    после чего записывает каждый файл один раз (см. AngularFormatParser.batch_writes)
+    """
+
+    def __init__(self):
+        self._modules: Dict[Path, str] = {}
+        """модули, которые нужно записать: путь -> содержимое"""
+        self._init_data: Dict[Path, str] = {}
+        """содержимое __init__.py на момент первого обращения к нему"""
+        self._init_imports: Dict[Path, List[str]] = {}
+        """импорты, которые нужно дописать в __init__.py (в порядке добавления)"""
+        self._added_imports: Dict[Path, Set[str]] = {}
+
+    def add_module(self, path: Path, content: str, rewrite: bool = False) -> bool:
+        """
+        Добавляет модуль для записи
+        :param path: абсолютный путь файла, в который записывать
+        :param content: содержимое модуля
+        :param rewrite: флаг, обозначающий перезаписывать ли файл
+        :return: False, если модуль уже есть и не должен перезаписываться
+        """
+        if not rewrite and (path in self._modules or path.exists()):
+            logger.info('Path "%s" is already exists. It will not be rewritten', path)
+            return False
+        self._modules[path] = content
+        return True
+
+    def add_import(self, init_path: Path, import_path: str) -> None:
+        """
+        Добавляет импорт в __init__.py, если его там еще нет. Сам файл читается один раз
+        :param init_path: абсолютный путь до __init__.py
+        :param import_path: строка импорта
+        :return:
+        """
+        if init_path not in self._init_data:
+            self._init_data[init_path] = init_path.read_text() if init_path.exists() else ''
+            self._init_imports[init_path] = []
+            self._added_imports[init_path] = set()
+
+        if import_path in self._added_imports[init_path] or import_path in self._init_data[init_path]:
+            return
+        self._added_imports[init_path].add(import_path)
+        self._init_imports[init_path].append(import_path)
+
+    def flush(self) -> None:
+        """
+        Записывает все накопленные файлы и очищает состояние
+        :return:
+        """
+        for path, content in self._modules.items():
+            write_file_atomic(path, content)
+        for init_path, imports in self._init_imports.items():
+            if imports:
+                data = ''.join([self._init_data[init_path], *[f'{line}\n' for line in imports]])
+                write_file_atomic(init_path, data)
+        self.__init__()
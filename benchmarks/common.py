@@ -0,0 +1,73 @@
+"""
+Общие хелперы для бенчмарков: замер времени, вывод и сравнение результатов в json
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+def measure(func: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict[str, float]:
+    """
+    Вызывает func repeat раз и возвращает статистику по времени выполнения (в секундах)
+    :param func:
+    :param repeat:
+    :param setup: вызывается перед каждым замером, его время не учитывается
+    :return:
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+    }
+
+
+def make_report(name: str, params: Dict, results: Dict) -> Dict:
+    return {
+        'benchmark': name,
+        'python': platform.python_version(),
+        'params': params,
+        'results': results,
+    }
+
+
+def dump_report(report: Dict, output: Optional[str] = None) -> None:
+    data = json.dumps(report, indent=2, sort_keys=True)
+    if output:
+        Path(output).write_text(data)
+    else:
+        print(data)
+
+
+def compare_reports(report: Dict, baseline_path: str, key: str, tolerance: float) -> bool:
+    """
+    Сравнивает значение key каждого результата с сохраненным отчетом.
+    Печатает отношение текущего значения к сохраненному
+    :param report: текущий отчет
+    :param baseline_path: путь до сохраненного отчета
+    :param key: какое значение сравнивать (например, median)
+    :param tolerance: допустимое относительное ухудшение (0.2 - на 20%)
+    :return: False, если хотя бы один результат ухудшился больше допустимого
+    """
+    baseline = json.loads(Path(baseline_path).read_text())
+    ok = True
+    for name, result in sorted(report['results'].items()):
+        base_result = baseline['results'].get(name)
+        if not base_result or not base_result.get(key):
+            print(f'{name}: no baseline', file=sys.stderr)
+            continue
+        ratio = result[key] / base_result[key]
+        regressed = ratio > 1 + tolerance
+        ok = ok and not regressed
+        print(f'{name}: {ratio:.2f}x{" REGRESSION" if regressed else ""}', file=sys.stderr)
+    return ok
@@ -0,0 +1,197 @@
+"""
+Бенчмарк слоя страниц на драйвере-заглушке FakeWebDriver: для каждой операции замеряется время
+и число команд драйвера (каждая команда - это запрос к chromedriver, т.е. задержка сети в реальном прогоне).
+
+Запуск из корня репозитория:
+    python -m benchmarks.pages_bench --latency 0.002 --output pages.json
+    python -m benchmarks.pages_bench --compare benchmarks/pages_bench_baseline.json
+
+При сравнении с сохраненным отчетом бенчмарк завершается с ошибкой, если у какой-то операции выросло
+число команд драйвера (время сравнивается только с флагом --compare-time, т.к. сильно зависит от машины).
+Сохраненный отчет обновляется после изменений, которые намеренно меняют число запросов:
+    python -m benchmarks.pages_bench --output benchmarks/pages_bench_baseline.json
+"""
+import argparse
+import sys
+from datetime import date
+from typing import Callable, Dict
+
+from adctest.driver.driver import E2EDriver
+from adctest.driver.fake import FakeWebDriver
+from adctest.pages import BasePage, BasePageMeta, ElementDescriptor, PageConfig
+from adctest.pages.uicomponents import Column, Table, Select, DatePicker, Toast, ConfirmDialog
+from benchmarks.common import measure, make_report, dump_report, compare_reports
+from selenium.webdriver.common.by import By
+
+BASE_URL = 'http://bench.local'
+PAGE_URL = '/campaigns'
+STATUSES = ['Active', 'Paused', 'Archived', 'Draft']
+
+
+def generate_page(rows: int, columns: int) -> str:
+    """
+    Страница со всеми компонентами, которые замеряются
+    :param rows: число строк таблицы
+    :param columns: число колонок таблицы (первые две - # и Name)
+    :return:
+    """
+    header = ['#', 'Name'] + [f'Column {i}' for i in range(3, columns + 1)]
+    head = ''.join(f'<th>{name}</th>' for name in header)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td><span>{row}-{col}</span></td>' for col in range(1, columns + 1)) + '</tr>'
+        for row in range(1, rows + 1))
+    options = ''.join(f'<div class="ng-option">{status}</div>' for status in STATUSES)
+    return f"""
+<html><head><title>Campaigns</title></head><body>
+  <div class="page-loader" style="display: none"></div>
+  <h1 data-e2e="title">Campaigns</h1>
+  <input name="search" value="">
+  <ul><li class="item">first</li><li class="item">second</li><li class="item">third</li></ul>
+  <p-table data-e2e-table="campaigns"><table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table></p-table>
+  <ng-select name="status"><input type="text"><ng-dropdown-panel hidden>{options}</ng-dropdown-panel></ng-select>
+  <div class="period">
+    <input name="period" value="">
+    <ngx-daterangepicker-material>
+      <div class="md-drppicker" hidden><button>ok</button></div>
+    </ngx-daterangepicker-material>
+  </div>
+  <div id="toast-container"><div class="toast toast-success">
+    <div class="toast-title">Saved</div><div class="toast-message">Campaign saved</div>
+  </div></div>
+  <p-confirmdialog><div class="ui-dialog">
+    <span class="ui-dialog-title">Delete</span><div class="ui-dialog-content">Are you sure?</div>
+    <button ng-reflect-label="Yes">Yes</button><button ng-reflect-label="No">No</button>
+  </div></p-confirmdialog>
+</body></html>
+"""
+
+
+def show_hidden_child(tag: str) -> Callable:
+    def handler(driver: FakeWebDriver, node) -> None:
+        for child in node.iter(tag):
+            child.attrib.pop('hidden', None)
+    return handler
+
+
+def hide_parent(tag: str) -> Callable:
+    def handler(driver: FakeWebDriver, node) -> None:
+        for parent in node.iterancestors(tag):
+            parent.set('hidden', '')
+    return handler
+
+
+def make_driver(page_html: str, latency: float) -> FakeWebDriver:
+    driver = FakeWebDriver(pages={PAGE_URL: page_html}, latency=latency)
+    # поведение компонентов, которое в браузере реализует ангуляр
+    driver.on_click('//ng-select', show_hidden_child('ng-dropdown-panel'))
+    driver.on_click('//*[contains(@class, "ng-option")]', hide_parent('ng-dropdown-panel'))
+    driver.on_click('//input[@name="period"]', lambda d, node: show_hidden_child('div')(d, node.getnext()))
+    driver.on_click('//div[contains(@class, "md-drppicker")]//button', hide_parent('div'))
+    return driver
+
+
+class CampaignsTable(Table):
+    id = Column('#')
+    name = Column('Name')
+
+
+class CampaignsPage(BasePage, metaclass=BasePageMeta):
+    page_url = PAGE_URL
+    page_conf = PageConfig(base_url=BASE_URL, page_loader_css_class='page-loader', table_loader_css_class='',
+                           modal_visible_css_class='')
+    title = ElementDescriptor(By.CSS_SELECTOR, '[data-e2e="title"]')
+    search = ElementDescriptor(By.NAME, 'search')
+    items = ElementDescriptor(By.XPATH, '//li[@class="item"]', many=True)
+    campaigns = CampaignsTable('campaigns')
+    status = ElementDescriptor(By.XPATH, '//ng-select[@name="status"]')
+    period = ElementDescriptor(By.NAME, 'period')
+    toast = ElementDescriptor(By.ID, 'toast-container')
+    confirm_dialog = ElementDescriptor(By.TAG_NAME, 'p-confirmdialog')
+
+
+def read_descriptors(page: CampaignsPage) -> None:
+    assert page.title.text
+    page.search.get_attribute('value')
+    assert len(page.items) == 3
+
+
+def read_toast(page: CampaignsPage) -> None:
+    toast = Toast(page.toast)
+    assert toast.is_success
+    assert toast.title and toast.message
+
+
+def make_scenarios(args) -> Dict[str, Callable[[CampaignsPage], None]]:
+    return {
+        'open': lambda page: page.open(),
+        'descriptor_access': read_descriptors,
+        'table_column_values': lambda page: page.campaigns.get_column_values_by_index(2),
+        'select_by_visible_text': lambda page: Select(page.status).select_by_visible_text('Paused'),
+        'datepicker_set_date_and_apply': lambda page: DatePicker(page.period).set_date_and_apply(
+            date(2020, 1, 1), date(2020, 1, 31)),
+        'toast_read': read_toast,
+        'confirm_dialog_confirm': lambda page: ConfirmDialog(page.confirm_dialog).confirm(),
+    }
+
+
+def run_scenario(page: CampaignsPage, scenario: Callable[[CampaignsPage], None], repeat: int) -> Dict:
+    """
+    Каждый замер начинается на заново открытой странице (пустой кэш элементов), открытие в замер не входит.
+    Число команд одинаково в каждом замере, поэтому берется из последнего
+    :param page:
+    :param scenario:
+    :param repeat:
+    :return:
+    """
+    driver: FakeWebDriver = page.driver
+
+    def setup():
+        page.open()
+        driver.reset_counters()
+
+    result = measure(lambda: scenario(page), repeat, setup=setup)
+    result['round_trips'] = driver.round_trips
+    result['commands'] = dict(driver.commands)
+    return result
+
+
+def run(args) -> Dict:
+    page_html = generate_page(args.rows, args.columns)
+    E2EDriver.driver_factory = lambda: make_driver(page_html, args.latency)
+    try:
+        page = CampaignsPage()
+        results = {name: run_scenario(page, scenario, args.repeat)
+                   for name, scenario in make_scenarios(args).items()}
+    finally:
+        E2EDriver.quit()
+        E2EDriver.driver_factory = None
+
+    params = {name: value for name, value in vars(args).items()
+              if name not in ('output', 'compare', 'compare_time', 'tolerance')}
+    return make_report('pages', params, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк слоя страниц (время и число команд драйвера)')
+    parser.add_argument('--rows', type=int, default=50, help='число строк таблицы')
+    parser.add_argument('--columns', type=int, default=5, help='число колонок таблицы')
+    parser.add_argument('--latency', type=float, default=0.002, help='задержка каждой команды драйвера в секундах')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='файл для json-отчета (по умолчанию stdout)')
+    parser.add_argument('--compare', help='json-отчет, с которым сравнить число команд драйвера')
+    parser.add_argument('--compare-time', action='store_true', help='дополнительно сравнить время (median)')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='допустимое ухудшение времени при сравнении')
+    args = parser.parse_args()
+
+    report = run(args)
+    dump_report(report, args.output)
+    if args.compare:
+        ok = compare_reports(report, args.compare, key='round_trips', tolerance=0)
+        if args.compare_time:
+            ok = compare_reports(report, args.compare, key='median', tolerance=args.tolerance) and ok
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Бенчмарк AngularFormatParser на синтетическом наборе ангуляр-шаблонов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.parser_bench --files 500 --elements 80 --output parser.json
+    python -m benchmarks.parser_bench --compare parser.json
+
+Замеряются отдельно: parse_pages целиком, построение дерева lxml, _search_named_tags,
+RelativeImportPath.get и запись модулей. Генерируемые модули пишутся во временную папку рядом с пакетом adctest
+(относительные импорты строятся от общего корня), после замера папка удаляется
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import adctest
+from adctest.config import config
+from adctest.pages import BasePage, BasePageMeta, ElementDescriptor
+from adctest.parser.html_parser import AngularFormatParser, PageHelper
+from adctest.parser.utils import Utils, RelativeImportPath
+from benchmarks.common import measure, make_report, dump_report, compare_reports
+
+TAGS = ['div', 'input', 'button', 'span', 'a', 'ng-select', 'p-table', 'textarea']
+SEARCH_ATTRIBUTES = ['name', config.DATA_E2E_ATTRIBUTE]
+MODULES_COUNT = 10
+
+
+class BenchParser(AngularFormatParser):
+    app_name = 'bench'
+    use_manifest = False
+
+
+def generate_template(rnd: random.Random, elements: int, attr_density: float, duplicates: float,
+                      interpolations: float) -> str:
+    """
+    Генерирует шаблон компонента
+    :param rnd:
+    :param elements: число элементов в шаблоне
+    :param attr_density: доля элементов с атрибутом для поиска (name или data-e2e)
+    :param duplicates: доля атрибутов, значение которых повторяет уже использованное
+    :param interpolations: доля атрибутов и текстов вида {{ ... }}
+    :return:
+    """
+    lines = ['<div class="page">']
+    names: List[str] = []
+    for i in range(elements):
+        tag = rnd.choice(TAGS)
+        attrs = [f'class="cls-{rnd.randrange(20)}"']
+        if rnd.random() < attr_density:
+            if names and rnd.random() < duplicates:
+                value = rnd.choice(names)
+            elif rnd.random() < interpolations:
+                value = 'item_{{ item.id }}'
+            else:
+                value = f'{tag}_{i}'
+                names.append(value)
+            attrs.append(f'{rnd.choice(SEARCH_ATTRIBUTES)}="{value}"')
+        text = '{{ item.value }}' if rnd.random() < interpolations else f'text {i}'
+        lines.append(f'  <{tag} {" ".join(attrs)}>{text}</{tag}>')
+    lines.append('</div>\n')
+    return '\n'.join(lines)
+
+
+def generate_corpus(components_path: Path, files: int, elements: int, attr_density: float, duplicates: float,
+                    interpolations: float, seed: int) -> List[Path]:
+    rnd = random.Random(seed)
+    paths = []
+    for i in range(files):
+        module_path = components_path.joinpath(f'module-{i % MODULES_COUNT}', f'sub-{i % 3}')
+        module_path.mkdir(parents=True, exist_ok=True)
+        path = module_path.joinpath(f'page-{i}.component.html')
+        path.write_text(generate_template(rnd, elements, attr_density, duplicates, interpolations))
+        paths.append(path)
+    return paths
+
+
+def setup_parser(work_path: Path, package_root: Path, nav_classes: int) -> None:
+    BenchParser.backend_path = work_path
+    BenchParser.project_path = work_path.joinpath('js')
+    BenchParser.components_relative_path = Path('components')
+    BenchParser.e2e_path = package_root
+    BenchParser.pages_path = work_path.joinpath('pages', BenchParser.app_name)
+    BenchParser.raw_pages_path = work_path.joinpath('raw_pages', BenchParser.app_name)
+    nav_init_path = BenchParser.pages_path.joinpath('navigation', '__init__.py')
+    BenchParser.navigation_classes_import_list = [(f'NavComponent{i}', nav_init_path) for i in range(nav_classes)]
+
+
+def clean_output() -> None:
+    for path in (BenchParser.pages_path, BenchParser.raw_pages_path):
+        shutil.rmtree(path, ignore_errors=True)
+        Utils.create_module_dir(path)
+
+
+def collect_import_calls(helpers: List[PageHelper]) -> List[Dict]:
+    """
+    Вызовы RelativeImportPath.get, которые парсер делает для каждой страницы
+    :param helpers:
+    :return:
+    """
+    func = Utils.get_module_path_by_class
+    calls = []
+    for obj in helpers:
+        calls.extend([
+            dict(to_path=obj.path_to_write_raw_page, from_path=func(BasePage), class_names=[BasePage.__name__]),
+            dict(to_path=obj.path_to_write_page, from_path=func(BasePageMeta), class_names=[BasePageMeta.__name__]),
+            dict(to_path=obj.path_to_write_raw_page, from_path=func(ElementDescriptor),
+                 class_names=[ElementDescriptor.__name__]),
+            dict(to_path=obj.path_to_write_page, from_path=obj.path_to_write_raw_page,
+                 class_names=[obj.raw_class_name]),
+            dict(to_path=obj.path_to_write_page.parent.joinpath('__init__.py'), from_path=obj.path_to_write_page,
+                 class_names=[obj.class_name]),
+        ])
+        for class_name, init_path in BenchParser.navigation_classes_import_list:
+            calls.append(dict(to_path=obj.path_to_write_page, from_path=init_path, class_names=[class_name]))
+    return calls
+
+
+def run(args) -> Dict:
+    package_root = Path(adctest.__file__).parent.parent
+    with tempfile.TemporaryDirectory(prefix='.adctest_bench_', dir=str(package_root)) as tmp:
+        work_path = Path(tmp)
+        setup_parser(work_path, package_root, args.nav_classes)
+        html_paths = generate_corpus(BenchParser.project_path.joinpath(BenchParser.components_relative_path),
+                                     files=args.files, elements=args.elements, attr_density=args.attr_density,
+                                     duplicates=args.duplicates, interpolations=args.interpolations, seed=args.seed)
+        clean_output()
+
+        results = {
+            'parse_pages': measure(lambda: BenchParser.parse_pages({}), args.repeat, setup=clean_output),
+        }
+        if args.workers > 1:
+            results[f'parse_pages_{args.workers}_workers'] = measure(
+                lambda: BenchParser.parse_pages({}, workers=args.workers), args.repeat, setup=clean_output)
+
+        results['html_parsing'] = measure(lambda: [Utils.get_html_from_file(p) for p in html_paths], args.repeat)
+
+        pages = [(p, Utils.get_html_from_file(p)) for p in html_paths]
+        results['search_named_tags'] = measure(
+            lambda: [BenchParser._search_named_tags(page, path) for path, page in pages], args.repeat)
+
+        helpers = [BenchParser._parse_html(p) for p in html_paths]
+        calls = collect_import_calls(helpers)
+        results['relative_import_path'] = measure(
+            lambda: [RelativeImportPath.get(root=BenchParser.e2e_path, **call) for call in calls], args.repeat,
+            setup=RelativeImportPath.cache_clear)
+
+        results['file_emission'] = measure(lambda: [BenchParser._write_page(obj) for obj in helpers], args.repeat,
+                                           setup=clean_output)
+
+    params = {name: value for name, value in vars(args).items() if name not in ('output', 'compare', 'tolerance')}
+    return make_report('parser', params, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк AngularFormatParser')
+    parser.add_argument('--files', type=int, default=200, help='число html-шаблонов')
+    parser.add_argument('--elements', type=int, default=50, help='число элементов в шаблоне')
+    parser.add_argument('--attr-density', type=float, default=0.5, help='доля элементов с name/data-e2e')
+    parser.add_argument('--duplicates', type=float, default=0.1, help='доля повторяющихся значений атрибутов')
+    parser.add_argument('--interpolations', type=float, default=0.1, help='доля значений вида {{ ... }}')
+    parser.add_argument('--nav-classes', type=int, default=3, help='число классов навигации')
+    parser.add_argument('--workers', type=int, default=0, help='дополнительно замерить parse_pages в N процессах')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='файл для json-отчета (по умолчанию stdout)')
+    parser.add_argument('--compare', help='json-отчет, с которым сравнить результаты')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='допустимое ухудшение при сравнении')
+    args = parser.parse_args()
+
+    report = run(args)
+    dump_report(report, args.output)
+    if args.compare and not compare_reports(report, args.compare, key='median', tolerance=args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Микробенчмарк доступа к атрибутам WebElementProxy (без браузера, проксируемый объект - заглушка).
+
+Запуск из корня репозитория:
+    python -m benchmarks.proxy_bench --calls 200000 --output proxy.json
+    python -m benchmarks.proxy_bench --compare proxy.json
+
+Замеряется время на одно обращение: получение метода, вызов метода, чтение свойства
+проксируемого объекта и чтение собственного атрибута прокси
+"""
+import argparse
+import sys
+from typing import Dict
+
+from adctest.pages import WebElementProxy
+from benchmarks.common import measure, make_report, dump_report, compare_reports
+
+
+class StubElement:
+    """Заглушка WebElement, чтобы в замер не попадали запросы к драйверу"""
+    text = 'cell'
+
+    def get_attribute(self, name):
+        return name
+
+    def is_displayed(self):
+        return True
+
+
+def run(args) -> Dict:
+    proxy = WebElementProxy(page=None, by='xpath', value='//td', target_object=StubElement())
+    calls = range(args.calls)
+
+    def method_access():
+        for _ in calls:
+            proxy.get_attribute
+
+    def method_call():
+        for _ in calls:
+            proxy.get_attribute('class')
+
+    def property_access():
+        for _ in calls:
+            proxy.text
+
+    def own_attribute():
+        for _ in calls:
+            proxy.locator
+
+    results = {}
+    for name, func in [('method_access', method_access), ('method_call', method_call),
+                       ('property_access', property_access), ('own_attribute', own_attribute)]:
+        timings = measure(func, repeat=args.repeat)
+        # время на одно обращение в наносекундах
+        results[name] = {key: value / args.calls * 1e9 for key, value in timings.items()}
+
+    params = {'calls': args.calls, 'repeat': args.repeat}
+    return make_report('proxy', params, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк доступа к атрибутам WebElementProxy')
+    parser.add_argument('--calls', type=int, default=100000, help='число обращений в одном замере')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='файл для json-отчета (по умолчанию stdout)')
+    parser.add_argument('--compare', help='json-отчет, с которым сравнить результаты')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='допустимое ухудшение при сравнении')
+    args = parser.parse_args()
+
+    report = run(args)
+    dump_report(report, args.output)
+    if args.compare and not compare_reports(report, args.compare, key='median', tolerance=args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,7 +17,7 @@ setup(
         "License :: OSI Approved :: MIT License",
     ],
     keywords="web e2e test testing end-to-end",
-    packages=find_packages(exclude=["tests", "examples"]),
+    packages=find_packages(exclude=["tests", "examples", "benchmarks"]),
     zip_safe=False,
     platforms="any",
     install_requires=[
@@ -29,6 +29,7 @@ setup(
     tests_require=["pytest"],
     extras_require={
         "tests": "pytest",
+        "numpy": ["numpy"],
         ":python_version<'3.7'": ["dataclasses"],
     },
 )
@@ -0,0 +1,65 @@
+import zipfile
+from io import BytesIO
+
+from adctest.config import config
+from adctest.driver.cache import DriverCache
+from adctest.driver.loader import ChromeDriverLoader, CACHE_DIR_NAME
+
+
+class TestDriverCache:
+    def test_get_and_put(self, tmp_path):
+        cache = DriverCache(tmp_path, max_versions=2)
+        assert cache.get('80.0') is None
+
+        path = cache.put('80.0', b'driver 80')
+        assert b'driver 80' == path.read_bytes()
+        assert path == DriverCache(tmp_path, max_versions=2).get('80.0')
+
+    def test_get_corrupted(self, tmp_path):
+        cache = DriverCache(tmp_path, max_versions=2)
+        cache.put('80.0', b'driver 80').write_bytes(b'broken')
+
+        assert cache.get('80.0') is None
+        assert '80.0' not in cache._read_index()
+
+    def test_evict_least_recently_used(self, tmp_path, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr('adctest.driver.cache.time.time', lambda: now[0])
+        cache = DriverCache(tmp_path, max_versions=2)
+        cache.put('80.0', b'driver 80')
+        now[0] += 1
+        cache.put('81.0', b'driver 81')
+        now[0] += 1
+        assert cache.get('80.0')
+        now[0] += 1
+        cache.put('82.0', b'driver 82')
+
+        assert {'80.0', '82.0'} == set(cache._read_index())
+        assert not tmp_path.joinpath('81.0').exists()
+
+
+class TestChromeDriverLoaderCache:
+    def test_download_uses_cache(self, tmp_path, monkeypatch):
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr(ChromeDriverLoader.driver_name, b'driver 80')
+        downloads = []
+
+        def download(version):
+            downloads.append(version)
+            return archive.getvalue()
+
+        monkeypatch.setattr(config, 'RELOAD_DRIVER', True)
+        monkeypatch.setattr(config, 'CHROME_DRIVER_CACHE_SIZE', 2)
+        monkeypatch.setattr(config, 'CHROME_DRIVER_CACHE_PATH', '')
+        monkeypatch.setattr(ChromeDriverLoader, '_get_latest_version', classmethod(lambda cls: '80.0'))
+        monkeypatch.setattr(ChromeDriverLoader, '_download', classmethod(lambda cls, version: download(version)))
+        for name in ('driver_path', '_path_to_store', 'path_to_download'):
+            monkeypatch.setattr(ChromeDriverLoader, name, None)
+
+        for _ in range(2):
+            ChromeDriverLoader.download(tmp_path, tmp_path)
+            assert str(tmp_path.joinpath(CACHE_DIR_NAME, '80.0', 'chromedriver')) == ChromeDriverLoader.driver_path
+        assert ['80.0'] == downloads
+        # при включенном кэше бинарник записывается только в кэш
+        assert not tmp_path.joinpath(ChromeDriverLoader.driver_name).exists()
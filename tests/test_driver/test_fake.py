@@ -0,0 +1,96 @@
+import pytest
+from adctest.driver.driver import E2EDriver
+from adctest.driver.fake import FakeWebDriver
+from adctest.helpers.locators import css_to_xpath
+from adctest.pages import BasePage, BasePageMeta, ElementDescriptor, PageConfig
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+PAGE = """
+<html><head><title>Campaigns</title></head><body>
+  <div class="loader" style="display: none"></div>
+  <h1 data-e2e="title">Campaigns <span>list</span></h1>
+  <input name="search" value="abc">
+  <button class="btn btn-primary" data-e2e="create">Create</button>
+  <ul><li class="item">first</li><li class="item" hidden>second</li></ul>
+</body></html>
+"""
+
+
+class CampaignsPage(BasePage, metaclass=BasePageMeta):
+    page_url = '/campaigns'
+    page_conf = PageConfig(base_url='http://fake.local', page_loader_css_class='loader',
+                           table_loader_css_class='', modal_visible_css_class='')
+    title = ElementDescriptor(By.CSS_SELECTOR, '[data-e2e="title"]')
+    search = ElementDescriptor(By.NAME, 'search')
+    items = ElementDescriptor(By.XPATH, '//li[@class="item"]', many=True)
+
+
+@pytest.fixture
+def driver():
+    return FakeWebDriver(pages={'/campaigns': PAGE})
+
+
+@pytest.fixture
+def fake_session():
+    E2EDriver.driver_factory = lambda: FakeWebDriver(pages={'/campaigns': PAGE})
+    yield
+    E2EDriver.quit()
+    E2EDriver.driver_factory = None
+
+
+def test_css_to_xpath(driver):
+    driver.get('http://fake.local/campaigns')
+    body = driver.document
+    assert 1 == len(body.xpath(css_to_xpath('button.btn-primary[data-e2e="create"]')))
+    assert 2 == len(body.xpath(css_to_xpath('ul > li.item')))
+    assert 3 == len(body.xpath(css_to_xpath('h1 span, li')))
+
+
+def test_elements(driver):
+    driver.get('http://fake.local/campaigns?page=1')
+    assert 'Campaigns' == driver.title
+    title = driver.find_element_by_css_selector('[data-e2e="title"]')
+    assert 'Campaigns list' == title.text
+    assert '<span>list</span>' in title.get_attribute('outerHTML')
+    assert ['first', ''] == [el.text for el in driver.find_elements_by_class_name('item')]
+    assert title.find_element_by_tag_name('span').is_displayed()
+
+    search = driver.find_element_by_name('search')
+    search.send_keys('def', Keys.ENTER)
+    assert 'abcdef' == search.get_attribute('value')
+
+    with pytest.raises(NoSuchElementException):
+        driver.find_element_by_id('missing')
+    driver.refresh()
+    with pytest.raises(StaleElementReferenceException):
+        title.click()
+
+
+def test_commands_counting(driver):
+    driver.latency = 0.001
+    driver.get('http://fake.local/campaigns')
+    driver.find_element_by_tag_name('h1').text
+    driver.add_cookie({'name': 'token', 'value': '1'})
+    assert [{'name': 'token', 'value': '1'}] == driver.get_cookies()
+    assert 5 == driver.round_trips
+    assert 1 == driver.commands['findElement']
+    driver.reset_counters()
+    assert 0 == driver.round_trips
+
+
+def test_page_with_fake_session(fake_session):
+    page = CampaignsPage()
+    driver: FakeWebDriver = page.driver
+    assert isinstance(driver, FakeWebDriver)
+    assert 'http://fake.local/campaigns' == page.opened_url
+
+    driver.reset_counters()
+    page.prefetch('title', 'items')
+    assert 1 == driver.scripts['find_batch']
+    assert 'Campaigns list' == page.title.text
+    assert 2 == len(page.items)
+    assert 0 == driver.commands['findElement'] + driver.commands['findElements']
+    assert 'abc' == page.search.get_attribute('value')
+    assert 1 == driver.commands['findElement']
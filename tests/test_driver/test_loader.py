@@ -0,0 +1,110 @@
+import base64
+import hashlib
+import os
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+
+import pytest
+from adctest.driver.loader import ChromeDriverLoader, ChromeDriverLoaderException
+
+# несжимаемые данные, чтобы обрыв пришелся на середину архива, а не на первый кусок
+DRIVER_DATA = os.urandom(512 * 1024)
+
+
+def make_archive(member: str = ChromeDriverLoader.driver_name) -> bytes:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        zip_file.writestr(member, DRIVER_DATA)
+    return buffer.getvalue()
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    """
+    Отдает архив, поддерживает Range. Первый запрос без Range обрывается на середине (если выставлен interrupt)
+    """
+    archive: bytes = b''
+    interrupt: bool = False
+    range_mode: str = 'valid'
+    """'valid', 'ignore' - отвечать 200 на Range, 'wrong' - отдавать часть не с того байта"""
+    md5: bytes = None
+    ranges = []
+
+    def do_GET(self):
+        start = 0
+        range_header = self.headers.get('Range')
+        self.ranges.append(range_header)
+        if range_header and self.range_mode != 'ignore':
+            start = int(range_header[len('bytes='):].rstrip('-'))
+            if self.range_mode == 'wrong':
+                start //= 2
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(self.archive) - 1}/{len(self.archive)}')
+        else:
+            self.send_response(200)
+        body = self.archive[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('x-goog-hash', 'crc32c=AAAAAA==, md5=' + base64.b64encode(self.md5).decode())
+        self.end_headers()
+        if self.interrupt and not range_header:
+            ArchiveHandler.interrupt = False
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.connection.close()
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    ArchiveHandler.archive = make_archive()
+    ArchiveHandler.md5 = hashlib.md5(ArchiveHandler.archive).digest()
+    ArchiveHandler.interrupt = False
+    ArchiveHandler.range_mode = 'valid'
+    ArchiveHandler.ranges = []
+    httpd = HTTPServer(('127.0.0.1', 0), ArchiveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/driver.zip'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestChromeDriverLoader:
+    def test_stream_and_extract(self, server):
+        archive = ChromeDriverLoader._stream(server)
+        assert DRIVER_DATA == ChromeDriverLoader._extract_driver(archive)
+        assert [None] == ArchiveHandler.ranges
+
+    def test_stream_resumes_interrupted_download(self, server):
+        ArchiveHandler.interrupt = True
+        archive = ChromeDriverLoader._stream(server)
+        assert ArchiveHandler.archive == archive
+        assert 2 == len(ArchiveHandler.ranges)
+        assert ArchiveHandler.ranges[1].startswith('bytes=')
+
+    def test_stream_restarts_when_range_not_supported(self, server):
+        ArchiveHandler.interrupt = True
+        ArchiveHandler.range_mode = 'ignore'
+        assert ArchiveHandler.archive == ChromeDriverLoader._stream(server)
+        assert 2 == len(ArchiveHandler.ranges)
+
+    def test_stream_restarts_on_wrong_content_range(self, server):
+        ArchiveHandler.interrupt = True
+        ArchiveHandler.range_mode = 'wrong'
+        assert ArchiveHandler.archive == ChromeDriverLoader._stream(server)
+        assert 3 == len(ArchiveHandler.ranges)
+        assert ArchiveHandler.ranges[2] is None
+
+    def test_stream_wrong_checksum(self, server):
+        ArchiveHandler.md5 = hashlib.md5(b'other').digest()
+        with pytest.raises(ChromeDriverLoaderException):
+            ChromeDriverLoader._stream(server)
+
+    def test_extract_without_driver(self):
+        with pytest.raises(ChromeDriverLoaderException):
+            ChromeDriverLoader._extract_driver(make_archive('readme.txt'))
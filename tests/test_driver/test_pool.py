@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+from adctest.config import config
+from adctest.driver.driver import E2EDriver
+from adctest.driver.fake import FakeWebDriver
+from adctest.driver.pool import SessionPool
+from adctest.helpers.exceptions import DriverPoolException
+from adctest.page_helpers.scripts import SOFT_RESET_SCRIPT
+from selenium.common.exceptions import WebDriverException
+
+
+class StubDriver:
+    def __init__(self, number: int):
+        self.session_id = f'session-{number}'
+        self.alive = True
+        self.cookies_deleted = 0
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise WebDriverException('chrome not reachable')
+        return 'about:blank'
+
+    def delete_all_cookies(self):
+        self.cookies_deleted += 1
+
+    def execute_script(self, script, *args):
+        pass
+
+    def quit(self):
+        pass
+
+
+class StubSwitchTo:
+    def __init__(self, driver: 'StubTabsDriver'):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class StubTabsDriver(StubDriver):
+    def __init__(self, number: int):
+        super().__init__(number)
+        self.window_handles = ['tab-1', 'tab-2', 'tab-3']
+        self.current_handle = 'tab-3'
+        self.switch_to = StubSwitchTo(self)
+        self.scripts = []
+        self.opened = []
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(script)
+
+    def get(self, url):
+        self.opened.append(url)
+
+
+def make_pool(size: int, spares: int = 0) -> SessionPool:
+    counter = iter(range(100))
+    return SessionPool(lambda: StubDriver(next(counter)), size=size, spares=spares)
+
+
+class TestSessionPool:
+    def test_release_reuses_session(self):
+        pool = make_pool(size=1)
+        driver = pool.lease()
+        pool.release(driver)
+        assert driver is pool.lease()
+        assert 1 == driver.cookies_deleted
+
+    def test_unhealthy_session_replaced(self):
+        pool = make_pool(size=1)
+        driver = pool.lease()
+        pool.release(driver, reset=False)
+        driver.alive = False
+        new_driver = pool.lease()
+        assert new_driver is not driver
+        assert driver.session_id is None
+        assert 1 == pool.created
+
+    def test_lease_waits_for_release(self):
+        pool = make_pool(size=2)
+        first, second = pool.lease(), pool.lease()
+        with pytest.raises(DriverPoolException):
+            pool.lease(timeout=0.05)
+
+        threading.Timer(0.05, pool.release, args=(second,)).start()
+        assert second is pool.lease(timeout=5)
+
+        pool.discard(first)
+        assert 1 == pool.created
+        pool.close()
+        assert 0 == pool.created
+
+    def test_spare_used_after_discard(self):
+        pool = make_pool(size=1, spares=1)
+        driver = pool.lease()
+        for thread in list(pool._background):
+            thread.join()
+        spare = pool._spares[0]
+
+        pool.discard(driver, wait=False)
+        assert spare is pool.lease()
+        pool.close()
+        assert not pool._background
+        assert driver.session_id is None and spare.session_id is None
+
+    def test_soft_reset(self):
+        driver = StubTabsDriver(1)
+        SessionPool.soft_reset(driver)
+        assert ['tab-1'] == driver.window_handles
+        assert 'tab-1' == driver.current_handle
+        assert 1 == driver.cookies_deleted
+        assert ['window.localStorage.clear();', SOFT_RESET_SCRIPT] == driver.scripts
+        assert ['about:blank'] == driver.opened
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    monkeypatch.setattr(config, 'DRIVER_POOL_LEASE_TIMEOUT', 0)
+    monkeypatch.setattr(E2EDriver, 'driver_factory', FakeWebDriver)
+    yield
+    E2EDriver.quit()
+
+
+class TestE2EDriver:
+    def get_drivers_in_threads(self, count: int) -> list:
+        drivers = []
+        threads = [threading.Thread(target=lambda: drivers.append(E2EDriver.get_driver()), daemon=True)
+                   for _ in range(count)]
+        for thread in threads:
+            thread.start()
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+        return drivers
+
+    def test_single_session_shared_between_threads(self, fake_sessions, monkeypatch):
+        monkeypatch.setattr(config, 'DRIVER_POOL_SIZE', 1)
+        driver = E2EDriver.get_driver()
+        assert [driver, driver] == self.get_drivers_in_threads(2)
+
+    def test_session_per_thread(self, fake_sessions, monkeypatch):
+        monkeypatch.setattr(config, 'DRIVER_POOL_SIZE', 3)
+        driver = E2EDriver.get_driver()
+        first, second = self.get_drivers_in_threads(2)
+        assert 3 == len({driver, first, second})
@@ -0,0 +1,23 @@
+from adctest.helpers.locators import Locators, locator_to_xpath
+from adctest.pages import ListOfElementDescriptor
+from lxml import html
+from selenium.webdriver.common.by import By
+
+
+def test_format_interned_and_cached():
+    row = Locators.format('{}[{}]', '//tr', 3)
+    assert '//tr[3]' == row
+    assert row is Locators.format('{}[{}]', '//tr', 3)
+    assert Locators.compile(row) is Locators.xpath('{}[{}]', '//tr', 3)
+
+
+def test_evaluate():
+    doc = html.fromstring('<table><tr><td>1</td></tr><tr><td>2</td></tr></table>')
+    assert ['2'] == [td.text for td in Locators.evaluate(doc, Locators.format('.//tr[{}]/td', 2))]
+    assert ['1', '2'] == [td.text for td in Locators.evaluate(doc, locator_to_xpath(By.TAG_NAME, 'td'))]
+
+
+def test_list_of_elements_names():
+    descriptor = ListOfElementDescriptor(base_name_parts=['row_', 'cell'])
+    assert 'row_2_cell_5' == descriptor._make_attr_name((2, 5))
+    assert f'//*[@{descriptor.tag_attr_name}="row_2_cell_5"]' == descriptor._print_search_value('row_2_cell_5')
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from adctest.instrumentation import MemorySink, Recorder, instrument, instrument_driver, recorder
+
+
+class StubDriver:
+    def execute(self, driver_command, params=None):
+        return {'value': None}
+
+
+@pytest.fixture
+def sink():
+    sink = MemorySink()
+    recorder.enable(sink)
+    yield sink
+    recorder.disable()
+
+
+@instrument('open_page')
+def open_page(driver):
+    driver.execute('get')
+    find_element(driver)
+
+
+@instrument()
+def find_element(driver):
+    recorder.count_retry()
+    driver.execute('findElement')
+
+
+def test_disabled_recorder():
+    disabled = Recorder()
+    with disabled.operation('noop') as record:
+        assert record is None
+
+
+def test_nested_operations(sink, tmp_path):
+    driver = StubDriver()
+    instrument_driver(driver)
+    instrument_driver(driver)
+    recorder.context = 'test_case'
+    open_page(driver)
+    recorder.context = None
+
+    inner, outer = sink.records
+    assert ('find_element', 1, 1, 1) == (inner.name, inner.depth, inner.commands, inner.retries)
+    assert ('open_page', 0, 2, 1) == (outer.name, outer.depth, outer.commands, outer.retries)
+    assert {'get': 1, 'findElement': 1} == outer.command_names
+    assert [outer] == MemorySink.top(sink.by_context()['test_case'], 5)
+
+    trace_path = tmp_path.joinpath('trace.json')
+    sink.dump_chrome_trace(trace_path)
+    events = json.loads(trace_path.read_text())['traceEvents']
+    assert ['find_element', 'open_page'] == [event['name'] for event in events]
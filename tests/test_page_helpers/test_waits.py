@@ -0,0 +1,47 @@
+import pytest
+from adctest.page_helpers.waits import wait_for, wait_visibility_one_of, wait_angular_stable, wait_options_loaded, \
+    WaitKind
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+
+class StubDriver:
+    def __init__(self, result):
+        self.result = result
+        self.script_timeouts = []
+        self.calls = []
+
+    def set_script_timeout(self, timeout):
+        self.script_timeouts.append(timeout)
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(args)
+        return self.result
+
+
+def test_wait_for_sets_script_timeout_once():
+    driver = StubDriver({'ok': True, 'value': 1})
+    assert 'second' == wait_visibility_one_of(driver, ['first', 'second'], timeout=2)
+    wait_for(driver, WaitKind.class_absent, ['loader'], timeout=1)
+    assert [7] == driver.script_timeouts
+    assert (WaitKind.class_absent, ['loader'], 1000) == driver.calls[1]
+
+
+def test_wait_for_timeout():
+    with pytest.raises(TimeoutException):
+        wait_for(StubDriver({'ok': False, 'value': None}), WaitKind.class_absent, ['loader'], timeout=1)
+
+
+def test_wait_angular_stable():
+    assert not wait_angular_stable(StubDriver({'ok': False, 'angular': False}))
+    assert wait_angular_stable(StubDriver({'ok': True, 'angular': True}))
+    with pytest.raises(TimeoutException):
+        wait_angular_stable(StubDriver({'ok': False, 'angular': True}), timeout=1)
+
+
+def test_wait_options_loaded_by_locator():
+    driver = StubDriver({'ok': True, 'value': True})
+    wait_options_loaded(driver, 'container', By.XPATH, '//*[text()="Paused"]', timeout=1)
+    wait_options_loaded(driver, 'container', By.TAG_NAME, 'li', timeout=1)
+    assert ['container', '//*[text()="Paused"]'] == driver.calls[0][1]
+    assert ['container', './/li'] == driver.calls[1][1]
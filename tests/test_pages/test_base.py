@@ -0,0 +1,31 @@
+import pytest
+from adctest.driver.driver import E2EDriver
+from adctest.driver.fake import FakeWebDriver
+from adctest.helpers.exceptions import BasePageException
+from adctest.page_helpers.scripts import ANGULAR_STABLE_SCRIPT
+from adctest.pages import BasePage, BasePageMeta, PageConfig
+
+
+class AngularPage(BasePage, metaclass=BasePageMeta):
+    page_url = '/angular'
+    page_conf = PageConfig(base_url='http://fake.local', page_loader_css_class='', table_loader_css_class='',
+                           modal_visible_css_class='', use_angular_testability=True)
+
+
+def make_unstable_driver() -> FakeWebDriver:
+    driver = FakeWebDriver(pages={'/angular': '<html><body></body></html>'})
+    driver.register_script(ANGULAR_STABLE_SCRIPT, lambda d, timeout: {'ok': False, 'angular': True})
+    return driver
+
+
+@pytest.fixture
+def unstable_session():
+    E2EDriver.driver_factory = make_unstable_driver
+    yield
+    E2EDriver.quit()
+    E2EDriver.driver_factory = None
+
+
+def test_wait_page_loaded_angular_timeout(unstable_session):
+    with pytest.raises(BasePageException, match='Angular testability did not become stable'):
+        AngularPage()
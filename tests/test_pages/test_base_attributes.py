@@ -0,0 +1,103 @@
+import pytest
+from adctest.driver.driver import E2EDriver
+from adctest.driver.fake import FakeWebDriver
+from adctest.pages import WebElementProxy, BasePage, BasePageMeta, ElementDescriptor, ListOfElementDescriptor, \
+    PageConfig, read_elements
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+
+class StubElement:
+    def __init__(self, stale: bool = False):
+        self.stale = stale
+
+    def get_attribute(self, name):
+        """Returns attribute name"""
+        if self.stale:
+            raise StaleElementReferenceException('element is not attached to the page document')
+        return name
+
+
+class StubPage:
+    def __init__(self):
+        self._cached_attrs = {}
+        self.found = 0
+
+    def _find_element(self, by, value):
+        self.found += 1
+        return StubElement()
+
+
+class TestWebElementProxy:
+    def test_method_wrapper_cached(self):
+        proxy = WebElementProxy(page=StubPage(), by='xpath', value='//td', target_object=StubElement())
+        assert proxy.get_attribute is proxy.get_attribute
+        assert 'class' == proxy.get_attribute('class')
+        assert 'get_attribute' == proxy.get_attribute.__name__
+        assert StubElement.get_attribute.__doc__ == proxy.get_attribute.__doc__
+        assert WebElementProxy.click.__doc__ == proxy.click.__doc__
+
+    def test_stale_element_reloaded(self):
+        page = StubPage()
+        proxy = WebElementProxy(page=page, by='xpath', value='//td', target_object=StubElement(stale=True),
+                                attr_name='cell')
+        get_attribute = proxy.get_attribute
+        assert 'class' == get_attribute('class')
+        assert 1 == page.found
+        assert proxy is page._cached_attrs['cell']
+        assert not proxy._obj.stale
+
+
+PAGE = """
+<html><body>
+  <h1 data-e2e="title" class="header">Campaigns</h1>
+  <input data-e2e="search" value="abc" disabled>
+  <div data-e2e="row_1" class="row">first</div>
+  <div data-e2e="row_2" class="row" style="display: none">second</div>
+</body></html>
+"""
+
+
+class BulkReadPage(BasePage, metaclass=BasePageMeta):
+    page_url = '/bulk'
+    page_conf = PageConfig(base_url='http://fake.local', page_loader_css_class='', table_loader_css_class='',
+                           modal_visible_css_class='')
+    title = ElementDescriptor(By.XPATH, '//*[@data-e2e="title"]')
+    search = ElementDescriptor(By.XPATH, '//*[@data-e2e="search"]')
+    rows = ElementDescriptor(By.CLASS_NAME, 'row', many=True)
+    row = ListOfElementDescriptor(base_name_parts=['row'])
+
+
+@pytest.fixture
+def page():
+    E2EDriver.driver_factory = lambda: FakeWebDriver(pages={'/bulk': PAGE})
+    yield BulkReadPage()
+    E2EDriver.quit()
+    E2EDriver.driver_factory = None
+
+
+class TestBulkRead:
+    def test_element_read(self, page):
+        title, search = page.title, page.search
+        page.driver.reset_counters()
+        assert {'text': 'Campaigns', 'class': 'header', 'displayed': True} == title.read('text', 'class', 'displayed')
+        assert {'value': 'abc', 'enabled': False, 'tag_name': 'input'} == search.read('value', 'enabled', 'tag_name')
+        assert 2 == page.driver.round_trips
+        # булевы атрибуты читаются как в get_attribute
+        assert {'disabled': 'true', 'readonly': None} == search.read('disabled', 'readonly')
+        assert search.get_attribute('disabled') == search.read('disabled')['disabled']
+
+    def test_list_read(self, page):
+        rows = page.rows
+        page.driver.reset_counters()
+        assert [{'text': 'first', 'displayed': True}, {'text': '', 'displayed': False}] == \
+            read_elements(rows, 'text', 'displayed')
+        assert [{'text': 'first'}, None] == page.row.read([1, 3], 'text')
+        # плюс getCurrentUrl проверки страницы, элементы не ищутся отдельными командами
+        assert 3 == page.driver.round_trips
+        assert 2 == page.driver.scripts['read_properties']
+
+    def test_stale_list_reloaded(self, page):
+        rows = page.rows
+        page.driver.refresh()
+        assert ['first', 'second'] == [r['textContent'] for r in read_elements(rows, 'textContent')]
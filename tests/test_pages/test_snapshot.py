@@ -0,0 +1,56 @@
+import pytest
+from adctest.driver.driver import E2EDriver
+from adctest.driver.fake import FakeWebDriver
+from adctest.pages import BasePage, BasePageMeta, ElementDescriptor, ListOfElementDescriptor, PageConfig
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+PAGE = """
+<html><body>
+  <h1 data-e2e="title" class="header">Campaigns <span>list</span></h1>
+  <input name="search" value="abc" disabled>
+  <ul>
+    <li class="item" data-e2e="row_1">first</li>
+    <li class="item ng-hide" data-e2e="row_2">second</li>
+    <li class="item" data-e2e="row_3" style="display: none">third</li>
+  </ul>
+</body></html>
+"""
+
+
+class SnapshotPage(BasePage, metaclass=BasePageMeta):
+    page_url = '/snapshot'
+    page_conf = PageConfig(base_url='http://fake.local', page_loader_css_class='', table_loader_css_class='',
+                           modal_visible_css_class='')
+    title = ElementDescriptor(By.CSS_SELECTOR, 'h1.header')
+    search = ElementDescriptor(By.NAME, 'search')
+    items = ElementDescriptor(By.XPATH, '//li[contains(@class, "item")]', many=True)
+    missing = ElementDescriptor(By.ID, 'missing')
+    row = ListOfElementDescriptor(base_name_parts=['row'])
+
+
+@pytest.fixture
+def page():
+    E2EDriver.driver_factory = lambda: FakeWebDriver(pages={'/snapshot': PAGE})
+    yield SnapshotPage()
+    E2EDriver.quit()
+    E2EDriver.driver_factory = None
+
+
+def test_snapshot_resolves_descriptors(page):
+    page.driver.reset_counters()
+    snapshot = page.snapshot()
+    assert 2 == page.driver.round_trips
+
+    assert 'Campaigns list' == snapshot.title.text
+    assert 'list' == snapshot.title.find_element(By.TAG_NAME, 'span').text
+    assert {'value': 'abc', 'enabled': False} == snapshot.search.read('value', 'enabled')
+    assert ['first', '', ''] == [item.text for item in snapshot.items]
+    assert 'second' == snapshot.row[2].text_content
+    assert not snapshot.row.get(3).is_displayed()
+    assert 3 == snapshot.count(By.CLASS_NAME, 'item')
+    with pytest.raises(NoSuchElementException):
+        snapshot.missing
+    with pytest.raises(AttributeError):
+        snapshot.unknown
+    assert 2 == page.driver.round_trips
@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from adctest.pages.uicomponents.helpers.columns import NumberColumn, DateColumn, TextColumn, TypedColumns  # noqa
+
+
+def test_number_column():
+    assert 1234.5 == NumberColumn()('1 234.5')
+    assert 1234.5 == NumberColumn(decimal_separator=',')('1\xa0234,5')
+    assert 1234567.5 == NumberColumn(decimal_separator=',')('1.234.567,5')
+    assert 12.0 == NumberColumn()('12 %')
+    assert np.isnan(NumberColumn()('-'))
+
+
+def test_typed_columns():
+    columns = TypedColumns(
+        {
+            'amount': NumberColumn().to_array(['1,000', None, '2,500.5']),
+            'date': DateColumn().to_array(['01.02.2020', '03.02.2020', '']),
+            'name': TextColumn().to_array(['a', 'b', 'a']),
+        },
+        footer={'amount': 3500.5},
+    )
+    assert columns.is_sorted('amount')
+    assert columns.is_sorted('date', strict=True)
+    assert not columns.is_sorted('amount', descending=True)
+    assert columns.sum_equals_footer('amount')
+    assert [1, 3] == columns.rows_matching(lambda c: c['name'] == 'a').tolist()
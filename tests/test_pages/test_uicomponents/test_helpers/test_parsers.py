@@ -1,4 +1,5 @@
-from adctest.pages.uicomponents.helpers.parsers import parse_table_thead, parse_table_row
+from adctest.pages.uicomponents.helpers.parsers import parse_table_thead, parse_table_row, parse_table_body, \
+    parse_table_body_and_footer, parse_paginator
 
 test_data = """
 <tr>
@@ -38,3 +39,60 @@ def test_parse_table_row():
     res = parse_table_row(test_row)
     assert res[0] == '2'
     assert res[1] == 'test Compaign'
+
+
+test_table = """
+<p-table data-e2e-table="campaigns">
+    <table>
+        <thead>
+            <tr><th>#</th><th>Name</th></tr>
+        </thead>
+        <tbody>
+            <tr><td> 1</td><td> first</td></tr>
+            <tr><td> 2</td><td></td></tr>
+        </tbody>
+        <tfoot>
+            <tr><td>Total</td><td></td></tr>
+        </tfoot>
+    </table>
+</p-table>
+"""
+
+
+def test_parse_table_body():
+    res = parse_table_body(test_table)
+    assert [['1', 'first'], ['2', None]] == res
+    assert (res, [['Total', None]]) == parse_table_body_and_footer(test_table)
+
+
+def test_parse_table_body_with_row_headers():
+    table = """
+    <table>
+        <thead><tr><th>Name</th><th>Count</th></tr></thead>
+        <tbody><tr><th>first</th><td>1</td></tr></tbody>
+    </table>
+    """
+    rows = parse_table_body(table)
+    assert [['first', '1']] == rows
+    assert parse_table_row('<tr><th>first</th><td>1</td></tr>') == rows[0]
+
+
+test_paginator = """
+<p-table>
+    <p-paginator>
+        <a class="ui-paginator-prev ui-state-disabled"></a>
+        <span class="ui-paginator-pages">
+            <a class="ui-paginator-page ui-state-active"> 1 </a>
+            <a class="ui-paginator-page"> 2 </a>
+        </span>
+        <a class="ui-paginator-next"></a>
+    </p-paginator>
+</p-table>
+"""
+
+
+def test_parse_paginator():
+    css_classes = ('ui-paginator-next', 'ui-paginator-page', 'ui-state-active', 'ui-state-disabled')
+    assert (True, '1') == parse_paginator(test_paginator, *css_classes)
+    last_page = test_paginator.replace('"ui-paginator-next"', '"ui-paginator-next ui-state-disabled"')
+    assert (False, '1') == parse_paginator(last_page, *css_classes)
@@ -0,0 +1,111 @@
+import pytest
+from adctest.helpers.exceptions import TableRowNotFound, TableColumnNotFound
+from adctest.pages.uicomponents import Column, Table
+from adctest.pages.uicomponents.table import TableSnapshot
+
+
+class CampaignsTable(Table):
+    id = Column('#')
+    name = Column('Name')
+
+
+# колонки привязываются к одному экземпляру таблицы, как и при объявлении в классе страницы
+table = CampaignsTable('campaigns')
+
+
+@pytest.fixture
+def snapshot():
+    table.columns_indexes = {'text': {'#': 1, 'Name': 2}}
+    table.real_column_count = 2
+    return TableSnapshot(table, [['1', 'first'], ['2', None], ['3', 'first copy']])
+
+
+class TestTableSnapshot:
+    def test_columns(self, snapshot):
+        assert ['1', '2', '3'] == snapshot.get_column_values(CampaignsTable.id)
+        assert ['first', None, 'first copy'] == snapshot.get_column_values_by_index(2)
+        with pytest.raises(TableColumnNotFound):
+            snapshot.get_column_values_by_index(3)
+
+    def test_rows(self, snapshot):
+        assert ['2', None] == snapshot.get_row_values_by_index(2)
+        assert 'first copy' == snapshot.get_cell(3, CampaignsTable.name)
+        with pytest.raises(TableRowNotFound):
+            snapshot.get_row_values_by_index(4)
+
+    def test_search(self, snapshot):
+        assert [1, 3] == snapshot.find_rows(CampaignsTable.name, 'first')
+        assert [(3, 2)] == snapshot.search('copy')
+
+    def test_typed_columns(self, snapshot):
+        pytest.importorskip('numpy')
+        from adctest.pages.uicomponents.helpers.columns import NumberColumn
+
+        snapshot.footer = [['6', '']]
+        columns = snapshot.to_typed_columns({CampaignsTable.id: NumberColumn()})
+        assert columns.is_sorted(CampaignsTable.id, strict=True)
+        assert columns.sum_equals_footer(CampaignsTable.id)
+
+
+class TestTableIterRows:
+    pages = [[['1', 'a']], [['2', 'b'], ['3', 'c']], [['4', 'd']]]
+
+    @pytest.fixture
+    def paginated(self, monkeypatch):
+        actions = []
+        state = {'page': 0}
+
+        def load_page():
+            number = state['page']
+            return TableSnapshot(table, self.pages[number]), number < len(self.pages) - 1, str(number + 1)
+
+        def click_next_page():
+            actions.append('click')
+            state['page'] += 1
+
+        def wait_page_changed(previous, previous_page):
+            actions.append('wait')
+            return load_page()
+
+        monkeypatch.setattr(table, '_load_page', load_page)
+        monkeypatch.setattr(table, '_click_next_page', click_next_page)
+        monkeypatch.setattr(table, '_wait_page_changed', wait_page_changed)
+        return actions
+
+    def test_all_pages(self, paginated):
+        rows = table.iter_rows()
+        assert ['1', 'a'] == next(rows)
+        # следующая страница запрошена до обработки строк текущей
+        assert ['click'] == paginated
+        assert [['2', 'b'], ['3', 'c'], ['4', 'd']] == list(rows)
+        assert ['click', 'wait', 'click', 'wait'] == paginated
+
+    def test_max_pages(self, paginated):
+        assert [['1', 'a'], ['2', 'b'], ['3', 'c']] == list(table.iter_rows(max_pages=2, prefetch=False))
+        assert ['click', 'wait'] == paginated
+
+
+class TestTableWaitPageChanged:
+    class StubWait:
+        def until(self, method):
+            for _ in range(5):
+                value = method(None)
+                if value:
+                    return value
+            raise AssertionError('page not changed')
+
+    class StubPage:
+        def __init__(self):
+            self.wait = TestTableWaitPageChanged.StubWait()
+
+        def wait_tableloader_not_visible(self):
+            pass
+
+    def test_without_active_page(self, monkeypatch):
+        loads = iter([[['1', 'a']], [['1', 'a']], [['2', 'b']]])
+        monkeypatch.setattr(table, 'page', self.StubPage())
+        monkeypatch.setattr(table, '_load_page', lambda: (TableSnapshot(table, next(loads)), False, None))
+
+        previous = TableSnapshot(table, [['1', 'a']])
+        snapshot, _, _ = table._wait_page_changed(previous, None)
+        assert [['2', 'b']] == snapshot.rows
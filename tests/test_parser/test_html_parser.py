@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict
+
+import pytest
+from adctest.parser.const import MANIFEST_FILE_NAME
+from adctest.parser.html_parser import AngularFormatParser
+from adctest.parser.utils import Utils
+
+TEMPLATES = {
+    'campaigns/campaigns-list/list.component.html': """
+<div class="page">
+  <input name="search" value="">
+  <button data-e2e="create">Create</button>
+  <div *ngFor="let item of items" data-e2e="row_{{ item.id }}">{{ item.name }}</div>
+</div>
+""",
+    'campaigns/campaign-edit/edit.component.html': """
+<form>
+  <input name="name">
+  <textarea name="description"></textarea>
+  <button data-e2e="save">Save</button>
+</form>
+""",
+    'campaigns/campaign-view/view/list.component.html': """
+<div data-e2e="title">{{ campaign.name }}</div>
+""",
+    'offers/offers-list/offers.component.html': """
+<p-table data-e2e-table="offers"><table></table></p-table>
+<ng-select name="status"></ng-select>
+""",
+}
+ROUTES = {'list.component': '/campaigns', 'offers.component': '/offers'}
+
+
+class SampleParser(AngularFormatParser):
+    app_name = 'sample'
+    page_conf_name = 'SAMPLE_CONF'
+    root_path = Path('js')
+    components_relative_path = Path('components')
+    footer_relative_path = Path('footer.component.html')
+    navigation_classes_import_list = []
+
+    work_path: Path = None
+    workers: int = None
+
+    @classmethod
+    def _set_project_paths(cls) -> None:
+        cls.backend_path = cls.work_path
+        cls.project_path = cls.work_path.joinpath(cls.root_path)
+        # общий корень и для пакета adctest, и для сгенерированных модулей
+        cls.e2e_path = Path(cls.work_path.anchor)
+
+    @classmethod
+    def _set_pages_paths(cls) -> None:
+        cls.pages_path = cls.work_path.joinpath('pages', cls.app_name)
+        Utils.create_module_dir(module_path=cls.pages_path)
+        cls.raw_pages_path = cls.work_path.joinpath('raw_pages', cls.app_name)
+        Utils.create_module_dir(module_path=cls.raw_pages_path)
+
+    @classmethod
+    def create_navigation_components(cls) -> None:
+        cls.navigation_classes_import_list = []
+        cls.create_footer()
+
+    @classmethod
+    def custom_parse(cls) -> None:
+        cls.parse_pages(ROUTES, workers=cls.workers)
+
+
+def read_tree(path: Path) -> Dict[str, str]:
+    return {str(p.relative_to(path)): p.read_text() for p in sorted(path.rglob('*.py'))}
+
+
+@pytest.fixture
+def parser(tmp_path, monkeypatch):
+    project_path = tmp_path.joinpath('js')
+    for name, content in TEMPLATES.items():
+        path = project_path.joinpath('components', name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    project_path.joinpath('footer.component.html').write_text('<footer><a name="help">Help</a></footer>')
+
+    monkeypatch.setattr(SampleParser, 'work_path', tmp_path)
+    return SampleParser
+
+
+def test_parse_pages_in_pool_same_as_serial(parser, tmp_path, monkeypatch):
+    parser.parse()
+    serial = read_tree(tmp_path)
+
+    for name in ('pages', 'raw_pages'):
+        shutil.rmtree(str(tmp_path.joinpath(name)))
+    monkeypatch.setattr(parser, 'workers', 2)
+    parser.parse()
+
+    assert len(serial) == 14
+    assert "page_conf: PageConfig = 'SAMPLE_CONF'" in serial['raw_pages/sample/list_list_component.py']
+    assert serial == read_tree(tmp_path)
+
+
+def test_parse_skips_unchanged_templates(parser, tmp_path):
+    parser.parse()
+    generated = [p for p in tmp_path.rglob('*.py')]
+    for path in generated:
+        os.utime(str(path), (0, 0))
+
+    project_path = tmp_path.joinpath('js')
+    project_path.joinpath('components', 'offers/offers-list/offers.component.html').write_text(
+        '<ng-select name="type"></ng-select>')
+    project_path.joinpath('footer.component.html').write_text('<footer><a name="docs">Docs</a></footer>')
+    parser.parse()
+
+    rewritten = {str(p.relative_to(tmp_path)) for p in generated if p.stat().st_mtime != 0}
+    assert {'raw_pages/sample/offers_component.py', 'raw_pages/sample/navigation/footer_component.py'} == rewritten
+    assert '@name="type"' in tmp_path.joinpath('raw_pages/sample/offers_component.py').read_text()
+    assert '@name="docs"' in tmp_path.joinpath('raw_pages/sample/navigation/footer_component.py').read_text()
+
+
+def test_parse_after_page_conf_name_changed(parser, tmp_path, monkeypatch):
+    parser.parse()
+    monkeypatch.setattr(parser, 'page_conf_name', 'OTHER_CONF')
+    parser.parse()
+    assert "page_conf: PageConfig = 'OTHER_CONF'" in tmp_path.joinpath('raw_pages/sample/offers_component.py').read_text()
+
+
+def test_manifest_drops_removed_templates(parser, tmp_path):
+    parser.parse()
+    removed = tmp_path.joinpath('js', 'components', 'offers/offers-list/offers.component.html')
+    removed.unlink()
+    parser.parse()
+
+    manifest_path = tmp_path.joinpath('raw_pages', 'sample', MANIFEST_FILE_NAME)
+    entries = json.loads(manifest_path.read_text())['entries']
+    assert str(removed) not in entries
+    # остальные шаблоны страниц и footer
+    assert len(TEMPLATES) == len(entries)
+
+
+def test_parse_writes_nothing_on_error(parser, tmp_path, monkeypatch):
+    def fail(cls):
+        cls.create_footer()
+        raise RuntimeError('generation failed')
+
+    monkeypatch.setattr(parser, 'custom_parse', classmethod(fail))
+    with pytest.raises(RuntimeError):
+        parser.parse()
+
+    assert not tmp_path.joinpath('raw_pages', 'sample', 'navigation', 'footer_component.py').exists()
+    assert not tmp_path.joinpath('raw_pages', 'sample', MANIFEST_FILE_NAME).exists()
@@ -0,0 +1,30 @@
+from adctest.parser.manifest import PagesManifest
+
+
+class TestPagesManifest:
+    def test_get_unchanged(self, tmp_path):
+        source = tmp_path.joinpath('page.component.html')
+        source.write_text('<div name="test"></div>')
+        output = tmp_path.joinpath('page_component.py')
+        output.write_text('')
+        settings_hash = PagesManifest.hash_settings({'page_url': '/page'})
+
+        manifest = PagesManifest(tmp_path.joinpath('manifest.json'))
+        manifest.update(source, settings_hash, outputs=[output], class_name='PageComponent')
+        manifest.save()
+
+        loaded = PagesManifest.load(manifest.path)
+        assert loaded.get_unchanged(source, settings_hash)['class_name'] == 'PageComponent'
+        assert loaded.get_unchanged(source, PagesManifest.hash_settings({'page_url': '/other'})) is None
+
+    def test_get_unchanged_after_source_changed(self, tmp_path):
+        source = tmp_path.joinpath('page.component.html')
+        source.write_text('<div name="test"></div>')
+        settings_hash = PagesManifest.hash_settings({})
+
+        manifest = PagesManifest(tmp_path.joinpath('manifest.json'))
+        manifest.update(source, settings_hash, outputs=[])
+        manifest.save()
+        source.write_text('<div name="changed"></div>')
+
+        assert PagesManifest.load(manifest.path).get_unchanged(source, settings_hash) is None
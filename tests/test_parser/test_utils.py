@@ -1,10 +1,29 @@
 from pathlib import Path
 
-from adctest.parser.utils import Utils, RelativeImportPath
+from lxml import html
+
+from adctest.parser.utils import Utils, RelativeImportPath, TagsIndex, LineRange
+
+test_page = """<div>
+    <input name="login" class="form-control">
+    <!-- comment -->
+    <button data-e2e="submit" class="btn btn-primary">Ok</button>
+    <span name="status" class="btn"></span>
+</div>
+"""
 
 
 class TestUtils:
 
+    def test_get_html_from_file_in_search_range(self, tmp_path):
+        path = tmp_path.joinpath('layout.component.html')
+        path.write_text(test_page)
+
+        page = Utils.get_html_from_file(path, search_range=LineRange(2, 4))
+
+        assert ['input', 'button'] == [el.tag for el in page.xpath('//*[@class]')]
+        assert 4 == page.xpath('//button')[0].sourceline
+
     def test_get_class_name_from_file_name(self):
         file_name = Path('aside-nav.component.html')
         expected_name = 'AsideNavComponent'
@@ -12,6 +31,23 @@ class TestUtils:
         assert expected_name == Utils.get_class_name_from_file_name(file_name)
 
 
+class TestTagsIndex:
+
+    def test_index(self):
+        index = TagsIndex(html.fromstring(test_page), attr_names=['name', 'data-e2e'], css_classes=['btn'])
+
+        assert ['input', 'span'] == [el.tag for el in index.by_attr['name']]
+        assert ['button'] == [el.tag for el in index.by_attr['data-e2e']]
+        assert ['button', 'span'] == [el.tag for el in index.by_css['btn']]
+
+    def test_index_in_search_range(self):
+        index = TagsIndex(html.fromstring(test_page), attr_names=['name'], css_classes=['btn'],
+                          search_range=LineRange(1, 4))
+
+        assert ['input'] == [el.tag for el in index.by_attr['name']]
+        assert ['button'] == [el.tag for el in index.by_css['btn']]
+
+
 class TestRelativeImportPath:
     def test__path_to_import_notation(self):
         path = Path('test/path/path2/test.py')
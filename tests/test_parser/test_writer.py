@@ -0,0 +1,28 @@
+from adctest.parser.writer import PagesWriter
+
+
+class TestPagesWriter:
+    def test_add_import(self, tmp_path):
+        init_path = tmp_path.joinpath('__init__.py')
+        init_path.write_text('from .page import Page\n')
+
+        writer = PagesWriter()
+        writer.add_import(init_path, 'from .page import Page')
+        writer.add_import(init_path, 'from .other import Other')
+        writer.add_import(init_path, 'from .other import Other')
+        assert 'from .page import Page\n' == init_path.read_text()
+
+        writer.flush()
+        assert 'from .page import Page\nfrom .other import Other\n' == init_path.read_text()
+
+    def test_add_module_without_rewrite(self, tmp_path):
+        path = tmp_path.joinpath('page.py')
+
+        writer = PagesWriter()
+        assert writer.add_module(path, 'first')
+        assert not writer.add_module(path, 'second')
+        assert writer.add_module(path, 'third', rewrite=True)
+        writer.flush()
+
+        assert 'third' == path.read_text()
+        assert [path] == list(tmp_path.iterdir())